@@ -1,11 +1,28 @@
 from expression_visitor import ExpressionVisitor
+from token_type import TokenType
 
 class AstPrinter(ExpressionVisitor):
+    OPERATORS = {
+        TokenType.MINUS: '-',
+        TokenType.PLUS: '+',
+        TokenType.SLASH: '/',
+        TokenType.STAR: '*',
+        TokenType.BANG: '!',
+        TokenType.BANG_EQUAL: '!=',
+        TokenType.EQUAL_EQUAL: '==',
+        TokenType.GREATER: '>',
+        TokenType.GREATER_EQUAL: '>=',
+        TokenType.LESS: '<',
+        TokenType.LESS_EQUAL: '<=',
+        TokenType.AND: 'and',
+        TokenType.OR: 'or',
+    }
+
     def print(self, expr):
         return expr.accept(self)
     
     def visit_binary(self, expr):
-        return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
+        return self.parenthesize(self.OPERATORS[expr.operator], expr.left, expr.right)
 
     def visit_grouping(self, expr):
         return self.parenthesize('group', expr.expression)
@@ -16,7 +33,7 @@ class AstPrinter(ExpressionVisitor):
         return str(expr.value)
 
     def visit_unary(self, expr):
-        return self.parenthesize(expr.operator.lexeme, expr.right)
+        return self.parenthesize(self.OPERATORS[expr.operator], expr.right)
 
     def parenthesize(self, name, *exprs):
         expr_strings = [expr.accept(self) for expr in exprs]
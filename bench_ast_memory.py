@@ -0,0 +1,53 @@
+import argparse
+import gc
+import tracemalloc
+
+from lox import Lox
+from fast_scanner import FastScanner
+from parser import Parser
+from expression import Expression
+from statement import Statement
+from bench_scanner import make_source
+
+def fields(node):
+    if hasattr(node, '__dict__'):
+        return list(vars(node).values())
+
+    return [getattr(node, name) for klass in type(node).__mro__ for name in getattr(klass, '__slots__', ())]
+
+def count_nodes(statements):
+    count = 0
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (list, tuple)):
+            pending.extend(node)
+        elif isinstance(node, (Expression, Statement)):
+            count += 1
+            pending.extend(fields(node))
+
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes retained per AST node')
+    parser.add_argument('--size-mb', type=float, default=0.5)
+    args = parser.parse_args()
+
+    source = make_source(int(args.size_mb * 1024 * 1024))
+
+    gc.collect()
+    tracemalloc.start()
+    lox = Lox()
+    tokens = FastScanner(lox, source).scan_tokens()
+    statements = Parser(lox, tokens).parse()
+    del tokens
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = count_nodes(statements)
+    print(f'{nodes} nodes  {size / (1024 * 1024):8.2f} MB  {size / nodes:6.1f} bytes/node  '
+          f'{size / len(source):6.2f} bytes per source byte')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import contextlib
+import io
+import time
+
+from lox import Lox, ENGINES
+
+PROGRAMS = {
+    'fib': '''
+fun fib(n) {
+  if (n < 2) return n;
+  return fib(n - 1) + fib(n - 2);
+}
+print fib(%(n)d);
+''',
+    'loop': '''
+var total = 0;
+for (var i = 0; i < %(n)d; i = i + 1) {
+  var j = i * 2;
+  if (j > 10) total = total + j / 2; else total = total - 1;
+}
+print total;
+''',
+    'closure': '''
+fun counter() {
+  var count = 0;
+  fun increment() {
+    count = count + 1;
+    return count;
+  }
+  return increment;
+}
+var next = counter();
+var last = 0;
+while (last < %(n)d) last = next();
+print last;
+''',
+    'method': '''
+class Point {
+  init(x, y) { this.x = x; this.y = y; }
+  add(other) { return Point(this.x + other.x, this.y + other.y); }
+}
+var p = Point(0, 0);
+var step = Point(1, 2);
+for (var i = 0; i < %(n)d; i = i + 1) p = p.add(step);
+print p.x + p.y;
+''',
+}
+
+SIZES = {
+    'fib': 22,
+    'loop': 100000,
+    'closure': 100000,
+    'method': 30000,
+}
+
+def run(engine, source):
+    lox = Lox(engine=engine)
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        statements = lox.compile(source)
+        start = time.perf_counter()
+        lox.interpreter.interpret(statements)
+        elapsed = time.perf_counter() - start
+
+    return output.getvalue(), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare execution engines on call and loop heavy programs')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engines = args.engine or list(ENGINES)
+
+    for name, program in PROGRAMS.items():
+        size = SIZES[name]
+        if name != 'fib':
+            size = int(size * args.scale)
+        source = program % {'n': size}
+
+        baseline = None
+        expected = None
+        for engine in engines:
+            times = []
+            for _ in range(args.repeat):
+                output, elapsed = run(engine, source)
+                times.append(elapsed)
+
+            if expected is None:
+                expected = output
+            elif output != expected:
+                print(f'{name}: {engine} output differs: {output!r} != {expected!r}')
+
+            best = min(times)
+            if baseline is None:
+                baseline = best
+
+            print(f'{name:>8} {engine:>8}: {best:8.3f} s  {baseline / best:5.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import time
+
+from lox import Lox, SCANNERS, PARSERS
+from resolver import Resolver
+from source_generator import SHAPES, generate
+from bench_parser import count_nodes
+
+UNITS = {
+    'K': 1024,
+    'M': 1024 * 1024,
+}
+
+class CountingResolver(Resolver):
+    def __init__(self, lox, interpreter):
+        super().__init__(lox, interpreter)
+        self.references = 0
+
+    def resolve_local(self, expr, name):
+        self.references += 1
+        return super().resolve_local(expr, name)
+
+def parse_size(text):
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+
+    return int(text)
+
+def format_size(size):
+    if size >= UNITS['M']:
+        return f'{size / UNITS["M"]:.1f}M'
+
+    return f'{size / UNITS["K"]:.1f}K'
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+
+    return result, time.perf_counter() - start
+
+def measure(scanner_class, parser_class, source):
+    lox = Lox()
+
+    tokens, scan_elapsed = timed(lambda: scanner_class(lox, source).scan_tokens())
+    statements, parse_elapsed = timed(lambda: parser_class(lox, tokens).parse())
+    token_count = len(tokens)
+    del tokens
+
+    resolver = CountingResolver(lox, lox.interpreter)
+    _, resolve_elapsed = timed(resolver.resolve_statements, statements)
+
+    if lox.had_error:
+        raise SystemExit('generated source did not compile')
+
+    return {
+        'tokens': token_count,
+        'scan': scan_elapsed,
+        'nodes': count_nodes(statements),
+        'parse': parse_elapsed,
+        'references': resolver.references,
+        'resolve': resolve_elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how the scanner, parser and resolver scale with input size')
+    parser.add_argument('--shape', action='append', choices=SHAPES.keys())
+    parser.add_argument('--sizes', default='1K,10K,100K,1M', help='comma separated sizes, e.g. 1K,1M,100M')
+    parser.add_argument('--scanner', choices=SCANNERS.keys(), default='fast')
+    parser.add_argument('--parser', choices=PARSERS.keys(), default='recursive')
+    parser.add_argument('--parameter', type=int, help='nesting depth, functions per unit, expression width or hierarchy depth')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    shapes = args.shape or list(SHAPES)
+    sizes = sorted(parse_size(size) for size in args.sizes.split(','))
+    scanner_class = SCANNERS[args.scanner]
+    parser_class = PARSERS[args.parser]
+
+    print(f'{"shape":>11} {"size":>6} {"tokens":>10} {"tokens/s":>11} {"nodes":>10} {"nodes/s":>11} '
+          f'{"refs":>10} {"refs/s":>11} {"ns/byte":>8}')
+
+    for shape in shapes:
+        for size in sizes:
+            source = generate(shape, size, args.parameter)
+
+            best = None
+            for _ in range(args.repeat):
+                result = measure(scanner_class, parser_class, source)
+                if best is None:
+                    best = result
+                else:
+                    for phase in ('scan', 'parse', 'resolve'):
+                        best[phase] = min(best[phase], result[phase])
+
+            total = best['scan'] + best['parse'] + best['resolve']
+            print(f'{shape:>11} {format_size(len(source)):>6} '
+                  f'{best["tokens"]:>10} {best["tokens"] / best["scan"]:>11.0f} '
+                  f'{best["nodes"]:>10} {best["nodes"] / best["parse"]:>11.0f} '
+                  f'{best["references"]:>10} {best["references"] / best["resolve"]:>11.0f} '
+                  f'{1e9 * total / len(source):>8.0f}', flush=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+
+from lox import Lox, ENGINES
+
+BUILD = '''
+class Node {
+  init(value, next) {
+    this.value = value;
+    this.next = next;
+    this.weight = 2;
+  }
+}
+var head = nil;
+for (var i = 0; i < %(n)d; i = i + 1) head = Node(i, head);
+'''
+
+ACCESS = '''
+var total = 0;
+var node = head;
+while (node != nil) {
+  total = total + node.value * node.weight;
+  node.weight = 3;
+  node = node.next;
+}
+print total;
+'''
+
+def run(lox, source):
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        program = lox.compile(source)
+        start = time.perf_counter()
+        lox.interpreter.interpret(program)
+        elapsed = time.perf_counter() - start
+
+    return output.getvalue(), elapsed
+
+def measure_memory(engine, count):
+    lox = Lox(engine=engine)
+    program = lox.compile(BUILD % {'n': 0})
+    lox.interpreter.interpret(program)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    run(lox, BUILD % {'n': count})
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (after - before) / count
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure memory per instance and field access speed')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    args = parser.parse_args()
+
+    engines = args.engine or list(ENGINES)
+
+    expected = None
+    for engine in engines:
+        lox = Lox(engine=engine)
+        _, build = run(lox, BUILD % {'n': args.count})
+        output, access = run(lox, ACCESS)
+
+        if expected is None:
+            expected = output
+        elif output != expected:
+            print(f'{engine} output differs: {output!r} != {expected!r}')
+
+        line = f'{engine:>8}: build {build:8.3f} s  access {access:8.3f} s'
+        if not args.no_memory:
+            line += f'  {measure_memory(engine, args.count):7.1f} bytes/instance'
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import tracemalloc
+
+from lox import Lox, ENGINES
+from heap_stats import HeapStats
+
+SETUP = '''
+class Link {
+  init(item, next) {
+    this.item = item;
+    this.next = next;
+  }
+}
+class Point {
+  init(x, y) {
+    this.x = x;
+    this.y = y;
+  }
+  norm() { return this.x * this.x + this.y * this.y; }
+}
+fun adder(n) {
+  fun add(x) { return x + n; }
+  return add;
+}
+var tag = "value";
+var keep = nil;
+'''
+
+WORKLOADS = {
+    'instance': 'keep = Link(Point(i, i), keep);',
+    'closure': 'keep = Link(adder(i), keep);',
+    'bound_method': 'keep = Link(Point(i, i).norm, keep);',
+    'string': 'keep = Link(tag + "-item", keep);',
+}
+
+LOOP = 'for (var i = 0; i < %(n)d; i = i + 1) { %(body)s }'
+
+def run(lox, source):
+    with contextlib.redirect_stdout(io.StringIO()):
+        lox.run(source)
+
+def measure(engine, workload, count):
+    lox = Lox(engine=engine)
+    body = WORKLOADS[workload]
+    run(lox, SETUP + LOOP % {'n': 1, 'body': body})
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    run(lox, LOOP % {'n': count, 'body': body})
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    census = {label: (objects, size) for label, objects, size in HeapStats().census() if objects >= count}
+
+    return (after - before) / count, census
+
+def load(path):
+    with open(path, 'r') as f:
+        return {(result['workload'], result['engine']): result for result in json.load(f)['results']}
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure retained bytes per Lox runtime object')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--workload', action='append', choices=WORKLOADS.keys())
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--json', metavar='PATH', help='write bytes per object to PATH')
+    parser.add_argument('--baseline', metavar='PATH', help='compare with a file written by --json')
+    args = parser.parse_args()
+
+    engines = args.engine or list(ENGINES)
+    workloads = args.workload or list(WORKLOADS)
+    baseline = load(args.baseline) if args.baseline is not None else {}
+
+    results = []
+    for workload in workloads:
+        for engine in engines:
+            per_object, census = measure(engine, workload, args.count)
+            results.append({'workload': workload, 'engine': engine, 'bytes_per_object': per_object})
+
+            line = f'{workload:>13} {engine:>8}: {per_object:8.1f} bytes/object'
+            previous = baseline.get((workload, engine))
+            if previous is not None:
+                line += f'  {per_object - previous["bytes_per_object"]:+8.1f} vs baseline'
+            line += '  ' + ', '.join(f'{label} {size / objects:.0f}' for label, (objects, size) in census.items())
+            print(line)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'count': args.count, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
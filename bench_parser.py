@@ -0,0 +1,98 @@
+import argparse
+import time
+
+from lox import Lox, PARSERS
+from fast_scanner import FastScanner
+from expression import Expression
+from statement import Statement
+from bench_scanner import make_source
+
+def children(node):
+    for klass in type(node).__mro__:
+        for name in getattr(klass, '__slots__', ()):
+            value = getattr(node, name)
+            if isinstance(value, (list, tuple)):
+                yield from value
+            else:
+                yield value
+
+def count_nodes(statements):
+    count = 0
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (Expression, Statement)):
+            count += 1
+            pending.extend(children(node))
+
+    return count
+
+def same_tree(a, b):
+    pending = [(a, b)]
+    while pending:
+        left, right = pending.pop()
+        if isinstance(left, (list, tuple)) and isinstance(right, (list, tuple)):
+            if len(left) != len(right):
+                return False
+            pending.extend(zip(left, right))
+        elif type(left) != type(right):
+            return False
+        elif isinstance(left, (Expression, Statement)):
+            left_children = list(children(left))
+            right_children = list(children(right))
+            if len(left_children) != len(right_children):
+                return False
+            pending.extend(zip(left_children, right_children))
+        elif left != right:
+            return False
+
+    return True
+
+def parse(parser_class, tokens):
+    lox = Lox()
+    start = time.perf_counter()
+    statements = parser_class(lox, tokens).parse()
+    elapsed = time.perf_counter() - start
+
+    return statements, elapsed, lox.had_error
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare parser throughput')
+    parser.add_argument('--size-mb', type=float, default=0.5)
+    parser.add_argument('--depth', type=int, default=5000)
+    args = parser.parse_args()
+
+    source = make_source(int(args.size_mb * 1024 * 1024))
+    tokens = FastScanner(Lox(), source).scan_tokens()
+
+    trees = {}
+    for name, parser_class in PARSERS.items():
+        statements, elapsed, _ = parse(parser_class, tokens)
+        trees[name] = statements
+        nodes = count_nodes(statements)
+        print(f'{name:>10}: {elapsed:8.3f} s  {nodes / elapsed:12.0f} nodes/s  {nodes} nodes')
+
+    reference = trees['recursive']
+    for name, statements in trees.items():
+        if not same_tree(reference, statements):
+            print(f'{name} AST differs from recursive parser')
+
+    chains = {
+        'sum': 'print ' + ' + '.join(['1'] * args.depth) + ';',
+        'unary': 'print ' + '-' * args.depth + '1;',
+        'group': 'print ' + '(' * args.depth + '1' + ')' * args.depth + ';',
+        'assign': 'a' + ' = a' * args.depth + ';',
+    }
+    for chain, chain_source in chains.items():
+        chain_tokens = FastScanner(Lox(), chain_source).scan_tokens()
+        results = []
+        for name, parser_class in PARSERS.items():
+            try:
+                _, elapsed, _ = parse(parser_class, chain_tokens)
+                results.append(f'{name} {elapsed:.3f} s')
+            except RecursionError:
+                results.append(f'{name} RecursionError')
+        print(f'{chain:>10} x{args.depth}: ' + ', '.join(results))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import contextlib
+import io
+import time
+
+from lox import Lox, ENGINES
+from program import Program
+
+RULES = '''
+class Order {
+  init(amount, country) {
+    this.amount = amount;
+    this.country = country;
+  }
+
+  fee() {
+    if (this.country == "domestic") return this.amount * 0.01;
+    return this.amount * 0.025 + 1;
+  }
+}
+
+fun risk(order) {
+  var score = 0;
+  if (order.amount > 1000) score = score + 2;
+  if (order.country != "domestic") score = score + 1;
+  return score;
+}
+
+var order = Order(amount, country);
+var approved = risk(order) < 3;
+print approved;
+'''
+
+def evaluate_source(engine, inputs):
+    output = io.StringIO()
+    for amount, country in inputs:
+        lox = Lox(engine=engine)
+        source = f'var amount = {amount};\nvar country = "{country}";\n' + RULES
+        with contextlib.redirect_stdout(output):
+            lox.run(source)
+
+    return output.getvalue()
+
+def evaluate_program(engine, inputs):
+    context = Program(RULES, engine=engine).context()
+
+    return ''.join(context.run(amount=amount, country=country) for amount, country in inputs)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare compiling per evaluation with a compiled Program')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--count', type=int, default=2000)
+    args = parser.parse_args()
+
+    engines = args.engine or list(ENGINES)
+    inputs = [(i * 7 % 2000, 'domestic' if i % 3 else 'abroad') for i in range(args.count)]
+
+    for engine in engines:
+        start = time.perf_counter()
+        expected = evaluate_source(engine, inputs)
+        source_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = evaluate_program(engine, inputs)
+        program_elapsed = time.perf_counter() - start
+
+        if output != expected:
+            print(f'{engine}: program output differs from source runs')
+
+        print(f'{engine:>8}: source {1e6 * source_elapsed / args.count:8.1f} us/eval  '
+              f'program {1e6 * program_elapsed / args.count:8.1f} us/eval  '
+              f'{source_elapsed / program_elapsed:5.1f}x')
+
+if __name__ == '__main__':
+    main()
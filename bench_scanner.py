@@ -0,0 +1,83 @@
+import argparse
+import time
+
+from lox import Lox, SCANNERS
+
+SAMPLE = '''// Sample used to build synthetic scanner input.
+class Point {
+    init(x, y) {
+        this.x = x;
+        this.y = y;
+    }
+
+    add(other) {
+        return Point(this.x + other.x, this.y + other.y);
+    }
+}
+
+fun fib(n) {
+    if (n <= 1) return n;
+    return fib(n - 2) + fib(n - 1);
+}
+
+var total = 0;
+for (var i = 0; i < 100; i = i + 1) {
+    if (i != 3 and !(i >= 50) or i == 99) {
+        total = total + i * 2.5 / 1.25 - -1;
+    }
+}
+var greeting = "hello
+world";
+print greeting;
+print fib(10) > total;
+'''
+
+def make_source(size):
+    copies = max(1, size // len(SAMPLE))
+    return SAMPLE * copies
+
+def token_key(token):
+    return (token.token_type, token.lexeme, token.literal, token.line)
+
+def time_scanner(scanner_class, source, repeat):
+    best = None
+    tokens = None
+    for _ in range(repeat):
+        lox = Lox()
+        start = time.perf_counter()
+        tokens = scanner_class(lox, source).scan_tokens()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, tokens
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare scanner throughput')
+    parser.add_argument('--size-mb', type=float, default=4.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('path', nargs='?', default=None)
+    args = parser.parse_args()
+
+    if args.path is not None:
+        with open(args.path, 'r') as f:
+            source = f.read()
+    else:
+        source = make_source(int(args.size_mb * 1024 * 1024))
+
+    megabytes = len(source.encode('utf-8')) / (1024 * 1024)
+    print(f'Input: {megabytes:.2f} MB')
+
+    results = {}
+    for name, scanner_class in SCANNERS.items():
+        elapsed, tokens = time_scanner(scanner_class, source, args.repeat)
+        results[name] = tokens
+        print(f'{name:>10}: {elapsed:8.3f} s  {megabytes / elapsed:8.2f} MB/s  {len(tokens)} tokens')
+
+    reference = [token_key(token) for token in results['classic']]
+    for name, tokens in results.items():
+        if [token_key(token) for token in tokens] != reference:
+            print(f'{name} token stream differs from classic scanner')
+
+if __name__ == '__main__':
+    main()
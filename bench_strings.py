@@ -0,0 +1,88 @@
+import argparse
+import contextlib
+import io
+import time
+
+from lox import Lox, ENGINES
+
+PROGRAMS = {
+    'concat': '''
+var out = "";
+for (var i = 0; i < %(n)d; i = i + 1) {
+  out = out + "line " + "of output" + "\\n";
+}
+print out == out + "";
+''',
+    'equality': '''
+var names = "alpha";
+var hits = 0;
+for (var i = 0; i < %(n)d; i = i + 1) {
+  var word = "alpha";
+  if (i / 2 > 100) word = "beta";
+  if (word == names) hits = hits + 1;
+  if (word == "beta") hits = hits - 1;
+}
+print hits;
+''',
+    'builder': '''
+fun repeat(text, count) {
+  var result = "";
+  while (count > 0) {
+    result = result + text;
+    count = count - 1;
+  }
+  return result;
+}
+var a = repeat("xyz", %(n)d);
+var b = repeat("xy", %(n)d) + repeat("z", 0);
+print a == b;
+print repeat("ab", 3);
+''',
+}
+
+SIZES = {
+    'concat': 20000,
+    'equality': 50000,
+    'builder': 20000,
+}
+
+def run(engine, source):
+    lox = Lox(engine=engine)
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        program = lox.compile(source)
+        start = time.perf_counter()
+        lox.interpreter.interpret(program)
+        elapsed = time.perf_counter() - start
+
+    return output.getvalue(), elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure string concatenation and equality heavy programs')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engines = args.engine or list(ENGINES)
+
+    for name, program in PROGRAMS.items():
+        source = program % {'n': int(SIZES[name] * args.scale)}
+
+        expected = None
+        for engine in engines:
+            times = []
+            for _ in range(args.repeat):
+                output, elapsed = run(engine, source)
+                times.append(elapsed)
+
+            if expected is None:
+                expected = output
+            elif output != expected:
+                print(f'{name}: {engine} output differs: {output!r} != {expected!r}')
+
+            print(f'{name:>8} {engine:>8}: {min(times):8.3f} s')
+
+if __name__ == '__main__':
+    main()
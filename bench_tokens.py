@@ -0,0 +1,43 @@
+import argparse
+import time
+import tracemalloc
+
+from lox import Lox
+from fast_scanner import FastScanner
+from parser import Parser
+from bench_scanner import make_source
+
+def measure(scan, source):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = scan(FastScanner(Lox(), source))
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return tokens, size, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare token list and token buffer memory')
+    parser.add_argument('--size-mb', type=float, default=1.0)
+    args = parser.parse_args()
+
+    source = make_source(int(args.size_mb * 1024 * 1024))
+
+    scans = [
+        ('list', lambda scanner: scanner.scan_tokens()),
+        ('buffer', lambda scanner: scanner.scan_buffer()),
+    ]
+    for name, scan in scans:
+        tokens, size, elapsed = measure(scan, source)
+        count = len(tokens)
+
+        start = time.perf_counter()
+        Parser(Lox(), tokens).parse()
+        parse_elapsed = time.perf_counter() - start
+
+        print(f'{name:>8}: {count} tokens  {size / (1024 * 1024):8.2f} MB  {size / count:6.1f} bytes/token  '
+              f'scan {elapsed:6.3f} s  parse {parse_elapsed:6.3f} s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import math
+from array import array
+
+class Chunk():
+    def __init__(self):
+        self.code = array('H')
+        self.constants = []
+        self.lines = array('I')
+
+        self.constant_indices = {}
+
+    def write(self, unit, line):
+        self.code.append(unit)
+
+        lines = self.lines
+        if lines and lines[-2] == line:
+            lines[-1] += 1
+        else:
+            lines.append(line)
+            lines.append(1)
+
+    def add_constant(self, value):
+        key = (type(value), value)
+        if type(value) is float:
+            key = (float, value, math.copysign(1.0, value))
+        try:
+            return self.constant_indices[key]
+        except KeyError:
+            pass
+
+        index = len(self.constants)
+        self.constants.append(value)
+        self.constant_indices[key] = index
+
+        return index
+
+    def line_at(self, offset):
+        lines = self.lines
+        for i in range(0, len(lines), 2):
+            offset -= lines[i + 1]
+            if offset < 0:
+                return lines[i]
+
+        return lines[-2]
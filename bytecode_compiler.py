@@ -0,0 +1,381 @@
+from expression import Get, This
+from expression_visitor import ExpressionVisitor
+from statement_visitor import StatementVisitor
+from token_type import TokenType
+from function_type import FunctionType
+from vm_objects import ObjFunction
+from op_code import *
+
+UNIT_MAX = 0xffff
+
+BINARY_OPCODES = {
+    TokenType.PLUS: ADD,
+    TokenType.MINUS: SUBTRACT,
+    TokenType.STAR: MULTIPLY,
+    TokenType.SLASH: DIVIDE,
+    TokenType.LESS: LESS,
+    TokenType.LESS_EQUAL: LESS_EQUAL,
+    TokenType.GREATER: GREATER,
+    TokenType.GREATER_EQUAL: GREATER_EQUAL,
+    TokenType.EQUAL_EQUAL: EQUAL,
+    TokenType.BANG_EQUAL: NOT_EQUAL,
+}
+
+class Scope():
+    __slots__ = ('compiler', 'base')
+
+    def __init__(self, compiler, base):
+        self.compiler = compiler
+        self.base = base
+
+
+class FunctionCompiler():
+    def __init__(self, enclosing, function, function_type):
+        self.enclosing = enclosing
+        self.function = function
+        self.function_type = function_type
+
+        self.local_count = 1 + function.arity
+        self.captured = set()
+        self.upvalues = []
+
+    def add_upvalue(self, is_local, index):
+        upvalue = (is_local, index)
+        try:
+            return self.upvalues.index(upvalue)
+        except ValueError:
+            pass
+
+        self.upvalues.append(upvalue)
+
+        return len(self.upvalues) - 1
+
+
+class BytecodeCompiler(ExpressionVisitor, StatementVisitor):
+    def __init__(self, lox):
+        self.lox = lox
+
+        self.current = None
+        self.scopes = []
+        self.line = 0
+
+    def compile(self, statements):
+        self.current = FunctionCompiler(None, ObjFunction('script', 0), FunctionType.NONE)
+
+        for statement in statements:
+            statement.accept(self)
+
+        self.emit_return()
+
+        if self.lox.had_error:
+            return None
+
+        return self.current.function
+
+    def emit(self, *units, line=None):
+        if line is None:
+            line = self.line
+        else:
+            self.line = line
+
+        chunk = self.current.function.chunk
+        for unit in units:
+            chunk.write(unit, line)
+
+    def emit_constant(self, value):
+        self.emit(CONSTANT, self.make_constant(value))
+
+    def make_constant(self, value):
+        index = self.current.function.chunk.add_constant(value)
+        if index > UNIT_MAX:
+            self.lox.error(self.line, "Too many constants in one chunk")
+            return 0
+
+        return index
+
+    def emit_jump(self, op, line=None):
+        self.emit(op, UNIT_MAX, line=line)
+
+        return len(self.current.function.chunk.code) - 1
+
+    def patch_jump(self, offset):
+        code = self.current.function.chunk.code
+        jump = len(code) - offset - 1
+        if jump > UNIT_MAX:
+            self.lox.error(self.line, "Too much code to jump over")
+            return
+
+        code[offset] = jump
+
+    def emit_loop(self, start):
+        offset = len(self.current.function.chunk.code) - start + 1
+        if offset > UNIT_MAX:
+            self.lox.error(self.line, "Loop body too large")
+            return
+
+        self.emit(LOOP, offset)
+
+    def emit_return(self):
+        if self.current.function_type == FunctionType.INITIALIZER:
+            self.emit(GET_LOCAL, 0)
+        else:
+            self.emit(NIL)
+
+        self.emit(RETURN)
+
+    def begin_scope(self):
+        self.scopes.append(Scope(self.current, self.current.local_count))
+
+    def end_scope(self):
+        scope = self.scopes.pop()
+        compiler = self.current
+
+        for index in range(compiler.local_count - 1, scope.base - 1, -1):
+            if index in compiler.captured:
+                compiler.captured.discard(index)
+                self.emit(CLOSE_UPVALUE)
+            else:
+                self.emit(POP)
+
+        compiler.local_count = scope.base
+
+    def resolve_upvalue(self, compiler, target, index):
+        if compiler.enclosing is target:
+            target.captured.add(index)
+            return compiler.add_upvalue(1, index)
+
+        upvalue = self.resolve_upvalue(compiler.enclosing, target, index)
+
+        return compiler.add_upvalue(0, upvalue)
+
+    def emit_variable(self, get, depth, slot, line):
+        if depth is None:
+            self.emit(GET_GLOBAL if get else SET_GLOBAL, slot, line=line)
+            return
+
+        scope = self.scopes[-1 - depth]
+        index = scope.base + slot
+        if scope.compiler is self.current:
+            self.emit(GET_LOCAL if get else SET_LOCAL, index, line=line)
+        else:
+            upvalue = self.resolve_upvalue(self.current, scope.compiler, index)
+            self.emit(GET_UPVALUE if get else SET_UPVALUE, upvalue, line=line)
+
+    def define(self, stmt):
+        if self.scopes:
+            self.current.local_count += 1
+        else:
+            self.emit(DEFINE_GLOBAL, stmt.slot, line=stmt.line)
+
+    def compile_function(self, stmt, function_type):
+        function = ObjFunction(stmt.name, len(stmt.parameters))
+        enclosing = self.current
+        self.current = FunctionCompiler(enclosing, function, function_type)
+
+        if function_type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            self.scopes.append(Scope(self.current, 0))
+        self.scopes.append(Scope(self.current, 1))
+
+        for statement in stmt.body:
+            statement.accept(self)
+        self.emit_return()
+
+        self.scopes.pop()
+        if function_type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            self.scopes.pop()
+
+        compiler = self.current
+        self.current = enclosing
+
+        function.upvalue_count = len(compiler.upvalues)
+        self.emit(CLOSURE, self.make_constant(function), line=stmt.line)
+        for is_local, index in compiler.upvalues:
+            self.emit(is_local, index)
+
+    def visit_binary(self, expr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+        self.emit(BINARY_OPCODES[expr.operator], line=expr.line)
+
+    def visit_grouping(self, expr):
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr):
+        value = expr.value
+        if value is None:
+            self.emit(NIL)
+        elif value is True:
+            self.emit(TRUE)
+        elif value is False:
+            self.emit(FALSE)
+        else:
+            self.emit_constant(value)
+
+    def visit_unary(self, expr):
+        expr.right.accept(self)
+
+        if expr.operator == TokenType.MINUS:
+            self.emit(NEGATE, line=expr.line)
+        else:
+            self.emit(NOT, line=expr.line)
+
+    def visit_variable(self, expr):
+        self.emit_variable(True, expr.depth, expr.slot, expr.line)
+
+    def visit_assign(self, expr):
+        expr.value.accept(self)
+
+        self.emit_variable(False, expr.depth, expr.slot, expr.line)
+
+    def visit_logical(self, expr):
+        expr.left.accept(self)
+
+        if expr.operator == TokenType.OR:
+            jump = self.emit_jump(JUMP_IF_TRUE, line=expr.line)
+        else:
+            jump = self.emit_jump(JUMP_IF_FALSE, line=expr.line)
+
+        self.emit(POP)
+        expr.right.accept(self)
+        self.patch_jump(jump)
+
+    def visit_call(self, expr):
+        callee = expr.callee
+        if isinstance(callee, Get):
+            callee.obj.accept(self)
+            self.emit(GET_METHOD, self.make_constant(callee.name), line=callee.line)
+        else:
+            callee.accept(self)
+
+        for argument in expr.arguments:
+            argument.accept(self)
+
+        if len(expr.arguments) > 255:
+            self.lox.error(expr.line, "Cannot have more than 255 arguments")
+
+        if isinstance(callee, Get):
+            self.emit(CALL_METHOD, len(expr.arguments), line=expr.line)
+        else:
+            self.emit(CALL, len(expr.arguments), line=expr.line)
+
+    def visit_get(self, expr):
+        expr.obj.accept(self)
+
+        self.emit(GET_PROPERTY, self.make_constant(expr.name), line=expr.line)
+
+    def visit_set(self, expr):
+        expr.obj.accept(self)
+        if not isinstance(expr.obj, This):
+            self.emit(CHECK_INSTANCE, line=expr.line)
+
+        expr.value.accept(self)
+
+        self.emit(SET_PROPERTY, self.make_constant(expr.name), line=expr.line)
+
+    def visit_this(self, expr):
+        self.emit_variable(True, expr.depth, 0, expr.line)
+
+    def visit_super(self, expr):
+        self.emit_variable(True, expr.depth - 1, 0, expr.line)
+        self.emit_variable(True, expr.depth, 0, expr.line)
+
+        self.emit(GET_SUPER, self.make_constant(expr.method), line=expr.line)
+
+    def visit_expression_statement(self, stmt):
+        stmt.expression.accept(self)
+
+        self.emit(POP)
+
+    def visit_if_statement(self, stmt):
+        stmt.condition.accept(self)
+
+        then_jump = self.emit_jump(POP_JUMP_IF_FALSE)
+        stmt.then_branch.accept(self)
+
+        if stmt.else_branch is None:
+            self.patch_jump(then_jump)
+            return
+
+        else_jump = self.emit_jump(JUMP)
+        self.patch_jump(then_jump)
+        stmt.else_branch.accept(self)
+        self.patch_jump(else_jump)
+
+    def visit_print_statement(self, stmt):
+        stmt.expression.accept(self)
+
+        self.emit(PRINT)
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is None:
+            self.emit_return()
+            return
+
+        stmt.value.accept(self)
+
+        self.emit(RETURN, line=stmt.line)
+
+    def visit_while_statement(self, stmt):
+        start = len(self.current.function.chunk.code)
+        stmt.condition.accept(self)
+
+        exit_jump = self.emit_jump(POP_JUMP_IF_FALSE)
+        stmt.body.accept(self)
+        self.emit_loop(start)
+
+        self.patch_jump(exit_jump)
+
+    def visit_var_statement(self, stmt):
+        if stmt.initializer is None:
+            self.emit(NIL, line=stmt.line)
+        else:
+            stmt.initializer.accept(self)
+
+        self.define(stmt)
+
+    def visit_block_statement(self, stmt):
+        self.begin_scope()
+
+        for statement in stmt.statements:
+            statement.accept(self)
+
+        self.end_scope()
+
+    def visit_class_statement(self, stmt):
+        self.emit(CLASS, self.make_constant(stmt.name), line=stmt.line)
+        self.define(stmt)
+
+        if self.scopes:
+            load = (GET_LOCAL, self.scopes[-1].base + stmt.slot)
+        else:
+            load = (GET_GLOBAL, stmt.slot)
+
+        if stmt.superclass is not None:
+            stmt.superclass.accept(self)
+
+            self.begin_scope()
+            self.current.local_count += 1
+
+            self.emit(*load)
+            self.emit(INHERIT, line=stmt.superclass.line)
+
+        self.emit(*load)
+
+        for method in stmt.methods:
+            function_type = FunctionType.METHOD
+            if method.name == 'init':
+                function_type = FunctionType.INITIALIZER
+
+            self.compile_function(method, function_type)
+            self.emit(METHOD, self.make_constant(method.name), line=method.line)
+
+        self.emit(POP)
+
+        if stmt.superclass is not None:
+            self.end_scope()
+
+    def visit_function_statement(self, stmt):
+        self.compile_function(stmt, FunctionType.FUNCTION)
+
+        self.define(stmt)
@@ -0,0 +1,411 @@
+import operator
+
+from expression_visitor import ExpressionVisitor
+from statement_visitor import StatementVisitor
+from token_type import TokenType
+from slot_environment import SlotEnvironment
+from global_table import UNDEFINED
+from run_time_error import RunTimeError
+from lox_callable import LoxCallable
+from lox_class import LoxClass
+from lox_instance import LoxInstance
+from compiled_function import CompiledFunction
+from rope import is_string, concatenate
+
+NUMBER_OPERATIONS = {
+    TokenType.MINUS: operator.sub,
+    TokenType.SLASH: operator.truediv,
+    TokenType.STAR: operator.mul,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+class ClosureCompiler(ExpressionVisitor, StatementVisitor):
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.globals = interpreter.globals
+
+    def compile_expression(self, expr):
+        return expr.accept(self)
+
+    def compile_statement(self, stmt):
+        return stmt.accept(self)
+
+    def compile_statements(self, statements):
+        compiled = tuple(self.compile_statement(statement) for statement in statements)
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def sequence(env):
+            for statement in compiled:
+                result = statement(env)
+                if result is not None:
+                    return result
+
+        return sequence
+
+    def visit_binary(self, expr):
+        left = self.compile_expression(expr.left)
+        right = self.compile_expression(expr.right)
+        line = expr.line
+
+        operator_type = expr.operator
+        if operator_type == TokenType.PLUS:
+            def add(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a + b
+
+                if is_string(a) and is_string(b):
+                    return concatenate(a, b)
+
+                raise RunTimeError(line, "Operands must be two numbers or two strings")
+
+            return add
+        elif operator_type in NUMBER_OPERATIONS:
+            operation = NUMBER_OPERATIONS[operator_type]
+
+            def number_operation(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return operation(a, b)
+
+                raise RunTimeError(line, "Operands must be numbers")
+
+            return number_operation
+        elif operator_type == TokenType.BANG_EQUAL:
+            is_equal = self.interpreter.is_equal
+            return lambda env: not is_equal(left(env), right(env))
+        elif operator_type == TokenType.EQUAL_EQUAL:
+            is_equal = self.interpreter.is_equal
+            return lambda env: is_equal(left(env), right(env))
+
+        raise Exception("Bad binary operator")
+
+    def visit_grouping(self, expr):
+        return self.compile_expression(expr.expression)
+
+    def visit_literal(self, expr):
+        value = expr.value
+
+        return lambda env: value
+
+    def visit_unary(self, expr):
+        right = self.compile_expression(expr.right)
+        line = expr.line
+
+        if expr.operator == TokenType.MINUS:
+            def negate(env):
+                value = right(env)
+                if type(value) is float:
+                    return -value
+
+                raise RunTimeError(line, "Operand must be a number")
+
+            return negate
+        elif expr.operator == TokenType.BANG:
+            def not_(env):
+                value = right(env)
+                return value is None or value is False
+
+            return not_
+
+        raise Exception("Bad unary operator")
+
+    def visit_variable(self, expr):
+        slot = expr.slot
+        depth = expr.depth
+
+        if depth is None:
+            values = self.globals.values
+            name = expr.name
+            line = expr.line
+
+            def global_variable(env):
+                value = values[slot]
+                if value is UNDEFINED:
+                    raise RunTimeError(line, f"Undefined variable '{name}'")
+
+                return value
+
+            return global_variable
+
+        if depth == 0:
+            return lambda env: env.values[slot]
+
+        if depth == 1:
+            return lambda env: env.enclosing.values[slot]
+
+        return lambda env: env.get_at(depth, slot)
+
+    def visit_assign(self, expr):
+        value = self.compile_expression(expr.value)
+        slot = expr.slot
+        depth = expr.depth
+
+        if depth is None:
+            values = self.globals.values
+            name = expr.name
+            line = expr.line
+
+            def assign_global(env):
+                result = value(env)
+                if values[slot] is UNDEFINED:
+                    raise RunTimeError(line, f"Undefined variable '{name}'")
+
+                values[slot] = result
+                return result
+
+            return assign_global
+
+        if depth == 0:
+            def assign_local(env):
+                result = value(env)
+                env.values[slot] = result
+                return result
+
+            return assign_local
+
+        def assign(env):
+            result = value(env)
+            env.assign_at(depth, slot, result)
+            return result
+
+        return assign
+
+    def visit_logical(self, expr):
+        left = self.compile_expression(expr.left)
+        right = self.compile_expression(expr.right)
+
+        if expr.operator == TokenType.OR:
+            def or_(env):
+                value = left(env)
+                if value is not None and value is not False:
+                    return value
+
+                return right(env)
+
+            return or_
+        elif expr.operator == TokenType.AND:
+            def and_(env):
+                value = left(env)
+                if value is None or value is False:
+                    return value
+
+                return right(env)
+
+            return and_
+
+        raise Exception("Bad logical operator")
+
+    def visit_call(self, expr):
+        callee = self.compile_expression(expr.callee)
+        arguments = tuple(self.compile_expression(argument) for argument in expr.arguments)
+        count = len(arguments)
+        line = expr.line
+        interpreter = self.interpreter
+
+        def call(env):
+            function = callee(env)
+            values = [argument(env) for argument in arguments]
+
+            if not isinstance(function, LoxCallable):
+                raise RunTimeError(line, "can only call functions and methods")
+
+            if count != function.arity():
+                raise RunTimeError(line, f"Expected {function.arity()} arguments but got {count}")
+
+            return function.call(interpreter, values)
+
+        return call
+
+    def visit_get(self, expr):
+        obj = self.compile_expression(expr.obj)
+        name = expr.name
+        line = expr.line
+
+        def get(env):
+            instance = obj(env)
+            if isinstance(instance, LoxInstance):
+                return instance.get(name, line)
+
+            raise RunTimeError(line, "Only instances have properties")
+
+        return get
+
+    def visit_set(self, expr):
+        obj = self.compile_expression(expr.obj)
+        value = self.compile_expression(expr.value)
+        name = expr.name
+        line = expr.line
+
+        def set_(env):
+            instance = obj(env)
+            if not isinstance(instance, LoxInstance):
+                raise RunTimeError(line, "Only instances have fields")
+
+            result = value(env)
+            instance.set_field(name, result)
+            return result
+
+        return set_
+
+    def visit_this(self, expr):
+        depth = expr.depth
+
+        if depth == 0:
+            return lambda env: env.values[0]
+
+        return lambda env: env.get_at(depth, 0)
+
+    def visit_super(self, expr):
+        depth = expr.depth
+        name = expr.method
+        line = expr.line
+
+        def super_(env):
+            superclass = env.get_at(depth, 0)
+            obj = env.get_at(depth - 1, 0)
+
+            method = superclass.find_method(obj, name)
+            if method is None:
+                raise RunTimeError(line, f"Undefined property '{name}'")
+
+            return method
+
+        return super_
+
+    def visit_expression_statement(self, stmt):
+        expression = self.compile_expression(stmt.expression)
+
+        def expression_statement(env):
+            expression(env)
+
+        return expression_statement
+
+    def visit_if_statement(self, stmt):
+        condition = self.compile_expression(stmt.condition)
+        then_branch = self.compile_statement(stmt.then_branch)
+
+        if stmt.else_branch is None:
+            def if_(env):
+                value = condition(env)
+                if value is not None and value is not False:
+                    return then_branch(env)
+
+            return if_
+
+        else_branch = self.compile_statement(stmt.else_branch)
+
+        def if_else(env):
+            value = condition(env)
+            if value is not None and value is not False:
+                return then_branch(env)
+
+            return else_branch(env)
+
+        return if_else
+
+    def visit_print_statement(self, stmt):
+        expression = self.compile_expression(stmt.expression)
+        interpreter = self.interpreter
+        stringify = interpreter.stringify
+
+        def print_(env):
+            print(stringify(expression(env)), file=interpreter.out)
+
+        return print_
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is None:
+            return lambda env: (None,)
+
+        value = self.compile_expression(stmt.value)
+
+        return lambda env: (value(env),)
+
+    def visit_while_statement(self, stmt):
+        condition = self.compile_expression(stmt.condition)
+        body = self.compile_statement(stmt.body)
+
+        def while_(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return None
+
+                result = body(env)
+                if result is not None:
+                    return result
+
+        return while_
+
+    def visit_var_statement(self, stmt):
+        slot = stmt.slot
+
+        if stmt.initializer is None:
+            def declare(env):
+                env.values[slot] = None
+
+            return declare
+
+        initializer = self.compile_expression(stmt.initializer)
+
+        def declare_initialized(env):
+            env.values[slot] = initializer(env)
+
+        return declare_initialized
+
+    def visit_block_statement(self, stmt):
+        body = self.compile_statements(stmt.statements)
+        size = stmt.slot_count
+
+        def block(env):
+            return body(SlotEnvironment(env, [None] * size))
+
+        return block
+
+    def visit_class_statement(self, stmt):
+        superclass = None
+        if stmt.superclass is not None:
+            superclass = self.compile_expression(stmt.superclass)
+            superclass_line = stmt.superclass.line
+
+        methods = [(method, self.compile_statements(method.body)) for method in stmt.methods]
+        name = stmt.name
+        slot = stmt.slot
+
+        def declare_class(env):
+            parent = None
+            closure = env
+            if superclass is not None:
+                parent = superclass(env)
+                if not isinstance(parent, LoxClass):
+                    raise RunTimeError(superclass_line, "Superclass must be a class")
+
+                closure = SlotEnvironment(env, [parent])
+
+            env.values[slot] = None
+
+            functions = {}
+            for method, body in methods:
+                is_initializer = (method.name == 'init')
+                functions[method.name] = CompiledFunction(method, body, closure, is_initializer)
+
+            env.values[slot] = LoxClass(name, parent, functions)
+
+        return declare_class
+
+    def visit_function_statement(self, stmt):
+        body = self.compile_statements(stmt.body)
+        slot = stmt.slot
+
+        def declare_function(env):
+            env.values[slot] = CompiledFunction(stmt, body, env, False)
+
+        return declare_function
@@ -0,0 +1,18 @@
+from interpreter import Interpreter
+from closure_compiler import ClosureCompiler
+from run_time_error import RunTimeError
+
+class ClosureInterpreter(Interpreter):
+    def __init__(self, lox):
+        super().__init__(lox)
+
+        self.compiler = ClosureCompiler(self)
+
+    def link(self, statements):
+        return self.compiler.compile_statements(statements)
+
+    def execute_program(self, program):
+        try:
+            program(self.globals)
+        except RunTimeError as e:
+            self.lox.runtime_error(e)
@@ -0,0 +1,46 @@
+from lox_callable import LoxCallable
+from slot_environment import SlotEnvironment
+
+class CompiledFunction(LoxCallable):
+    __slots__ = ('declaration', 'body', 'closure', 'is_initializer', 'padding')
+
+    def __init__(self, declaration, body, closure, is_initializer):
+        self.declaration = declaration
+        self.body = body
+        self.closure = closure
+        self.is_initializer = is_initializer
+
+        self.padding = [None] * (declaration.slot_count - len(declaration.parameters))
+
+    def arity(self):
+        return len(self.declaration.parameters)
+
+    def call(self, interpreter, arguments):
+        result = self.body(SlotEnvironment(self.closure, arguments + self.padding))
+
+        if self.is_initializer:
+            return self.closure.values[0]
+
+        if result is None:
+            return None
+
+        return result[0]
+
+    def invoke(self, interpreter, instance, arguments):
+        result = self.body(SlotEnvironment(SlotEnvironment(self.closure, [instance]), arguments + self.padding))
+
+        if self.is_initializer:
+            return instance
+
+        if result is None:
+            return None
+
+        return result[0]
+
+    def bind(self, instance):
+        environment = SlotEnvironment(self.closure, [instance])
+
+        return CompiledFunction(self.declaration, self.body, environment, self.is_initializer)
+
+    def __str__(self):
+        return f"<fn {self.declaration.name}>"
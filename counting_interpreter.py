@@ -0,0 +1,156 @@
+from collections import Counter
+
+from interpreter import Interpreter
+from lox_function import TailCall
+
+class CountingInterpreter(Interpreter):
+    def __init__(self, lox):
+        super().__init__(lox)
+
+        self.counters = Counter()
+
+    def execute_block(self, statements, environment):
+        self.counters['environments'] += 1
+
+        return super().execute_block(statements, environment)
+
+    def visit_call(self, expr):
+        self.counters['nodes'] += 1
+        callee, receiver, arguments = self.evaluate_call(expr)
+
+        return self.call(callee, receiver, arguments)
+
+    def call(self, callee, receiver, arguments):
+        self.counters['calls'] += 1
+        if receiver is not None:
+            self.counters['environments'] += 1
+
+        return super().call(callee, receiver, arguments)
+
+    def tail_call(self, function, receiver, arguments):
+        self.counters['nodes'] += 1
+        self.counters['calls'] += 1
+
+        result = super().tail_call(function, receiver, arguments)
+
+        if type(result) is TailCall:
+            self.counters['tail_calls'] += 1
+            if receiver is not None:
+                self.counters['environments'] += 1
+
+        return result
+
+    def visit_binary(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_binary(expr)
+
+    def visit_generic_binary(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_generic_binary(expr)
+
+    def visit_number_binary(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_number_binary(expr)
+
+    def visit_string_binary(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_string_binary(expr)
+
+    def visit_grouping(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_grouping(expr)
+
+    def visit_literal(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_literal(expr)
+
+    def visit_unary(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_unary(expr)
+
+    def visit_variable(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_variable(expr)
+
+    def visit_assign(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_assign(expr)
+
+    def visit_logical(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_logical(expr)
+
+    def visit_get(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_get(expr)
+
+    def visit_this(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_this(expr)
+
+    def visit_set(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_set(expr)
+
+    def visit_super(self, expr):
+        self.counters['nodes'] += 1
+
+        return super().visit_super(expr)
+
+    def visit_expression_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_expression_statement(stmt)
+
+    def visit_if_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_if_statement(stmt)
+
+    def visit_print_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_print_statement(stmt)
+
+    def visit_return_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_return_statement(stmt)
+
+    def visit_while_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_while_statement(stmt)
+
+    def visit_var_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_var_statement(stmt)
+
+    def visit_block_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_block_statement(stmt)
+
+    def visit_class_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_class_statement(stmt)
+
+    def visit_function_statement(self, stmt):
+        self.counters['nodes'] += 1
+
+        return super().visit_function_statement(stmt)
@@ -1,17 +1,44 @@
 class Expression():
+    __slots__ = ()
+
     def accept(self, visitor):
         raise NotImplemented
 
 class Binary(Expression):
-    def __init__(self, left, operator, right):
+    __slots__ = ('left', 'operator', 'right', 'line', 'site')
+
+    def __init__(self, left, operator, right, line):
         self.left = left
         self.operator = operator
         self.right = right
+        self.line = line
+
+        self.site = None
 
     def accept(self, visitor):
         return visitor.visit_binary(self)
 
+class NumberBinary(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_binary(self)
+
+class StringBinary(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_string_binary(self)
+
+class GenericBinary(Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_generic_binary(self)
+
 class Grouping(Expression):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -19,6 +46,8 @@ class Grouping(Expression):
         return visitor.visit_grouping(self)
 
 class Literal(Expression):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -26,74 +55,119 @@ class Literal(Expression):
         return visitor.visit_literal(self)
 
 class Unary(Expression):
-    def __init__(self, operator, right):
+    __slots__ = ('operator', 'right', 'line')
+
+    def __init__(self, operator, right, line):
         self.operator = operator
         self.right = right
+        self.line = line
 
     def accept(self, visitor):
         return visitor.visit_unary(self)
 
 class Variable(Expression):
-    def __init__(self, name):
+    __slots__ = ('name', 'line', 'depth', 'slot')
+
+    def __init__(self, name, line):
         self.name = name
+        self.line = line
+
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_variable(self)
 
 class Assign(Expression):
-    def __init__(self, name, value):
+    __slots__ = ('name', 'value', 'line', 'depth', 'slot')
+
+    def __init__(self, name, value, line):
         self.name = name
         self.value = value
+        self.line = line
+
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_assign(self)
 
 class Logical(Expression):
-    def __init__(self, left, operator, right):
+    __slots__ = ('left', 'operator', 'right', 'line')
+
+    def __init__(self, left, operator, right, line):
         self.left = left
         self.operator = operator
         self.right = right
+        self.line = line
 
     def accept(self, visitor):
         return visitor.visit_logical(self)
 
 class Call(Expression):
-    def __init__(self, callee, paren, arguments):
+    __slots__ = ('callee', 'arguments', 'line', 'cached_class', 'cached_method', 'method_cache')
+
+    def __init__(self, callee, arguments, line):
         self.callee = callee
-        self.paren = paren
         self.arguments = arguments
+        self.line = line
+
+        self.cached_class = None
+        self.cached_method = None
+        self.method_cache = None
 
     def accept(self, visitor):
         return visitor.visit_call(self)
 
 class Get(Expression):
-    def __init__(self, obj, name):
+    __slots__ = ('obj', 'name', 'line', 'cached_shape', 'cached_index')
+
+    def __init__(self, obj, name, line):
         self.obj = obj
         self.name = name
+        self.line = line
+
+        self.cached_shape = None
+        self.cached_index = None
 
     def accept(self, visitor):
         return visitor.visit_get(self)
 
 class Set(Expression):
-    def __init__(self, obj, name, value):
+    __slots__ = ('obj', 'name', 'value', 'line', 'cached_shape', 'cached_index', 'cached_transition')
+
+    def __init__(self, obj, name, value, line):
         self.obj = obj
         self.name = name
         self.value = value
+        self.line = line
+
+        self.cached_shape = None
+        self.cached_index = None
+        self.cached_transition = None
 
     def accept(self, visitor):
         return visitor.visit_set(self)
 
 class This(Expression):
-    def __init__(self, keyword):
-        self.keyword = keyword
+    __slots__ = ('line', 'depth')
+
+    def __init__(self, line):
+        self.line = line
+
+        self.depth = None
 
     def accept(self, visitor):
         return visitor.visit_this(self)
 
 class Super(Expression):
-    def __init__(self, keyword, method):
-        self.keyword = keyword
+    __slots__ = ('method', 'line', 'depth')
+
+    def __init__(self, method, line):
         self.method = method
+        self.line = line
+
+        self.depth = None
 
     def accept(self, visitor):
         return visitor.visit_super(self)
@@ -5,6 +5,15 @@ class ExpressionVisitor():
     def visit_binary(self, expr):
         raise NotImplemented
 
+    def visit_number_binary(self, expr):
+        return self.visit_binary(expr)
+
+    def visit_string_binary(self, expr):
+        return self.visit_binary(expr)
+
+    def visit_generic_binary(self, expr):
+        return self.visit_binary(expr)
+
     def visit_grouping(self, expr):
         raise NotImplemented
 
@@ -0,0 +1,142 @@
+import re
+
+from token_type import TokenType
+from lox_token import Token
+from scanner import Scanner
+from token_buffer import TokenBuffer
+
+SKIP = 1
+NUMBER = 2
+IDENTIFIER = 3
+STRING = 4
+PUNCTUATION = 5
+OTHER = 6
+
+class FastScanner():
+    KEYWORDS = Scanner.KEYWORDS
+
+    PUNCTUATION = {
+        '(': TokenType.LEFT_PAREN,
+        ')': TokenType.RIGHT_PAREN,
+        '{': TokenType.LEFT_BRACE,
+        '}': TokenType.RIGHT_BRACE,
+        ',': TokenType.COMMA,
+        '.': TokenType.DOT,
+        '-': TokenType.MINUS,
+        '+': TokenType.PLUS,
+        ';': TokenType.SEMICOLON,
+        '*': TokenType.STAR,
+        '/': TokenType.SLASH,
+        '!': TokenType.BANG,
+        '!=': TokenType.BANG_EQUAL,
+        '=': TokenType.EQUAL,
+        '==': TokenType.EQUAL_EQUAL,
+        '<': TokenType.LESS,
+        '<=': TokenType.LESS_EQUAL,
+        '>': TokenType.GREATER,
+        '>=': TokenType.GREATER_EQUAL,
+    }
+
+    # Group order must match the constants above, see match.lastindex.
+    PATTERN = re.compile(r'''
+        [ \t\r]*(?:
+            (\n[ \t\r\n]*|//[^\n]*)
+            |([0-9]+(?:\.[0-9]+)?)
+            |([A-Za-z_][A-Za-z0-9_]*)
+            |("[^"]*"?)
+            |([!=<>]=?|[(){},.\-+;*/])
+            |([^ \t\r])
+        )
+    ''', re.VERBOSE | re.DOTALL)
+
+    def __init__(self, lox, source: str):
+        self.lox = lox
+        self.source = source
+
+        self.tokens = []
+
+        self.line = 1
+
+    def scan_tokens(self):
+        self.tokens = list(self.scan_buffer())
+
+        return self.tokens
+
+    def scan_buffer(self):
+        source = self.source
+        buffer = TokenBuffer(source)
+
+        _, self.line = self.scan_into(buffer, source, 0, 1, True)
+        buffer.append(TokenType.EOF, len(source), 0, self.line)
+
+        return buffer
+
+    def scan_into(self, buffer, source, current, line, at_end):
+        types = buffer.types.append
+        starts = buffer.starts.append
+        lengths = buffer.lengths.append
+        lines = buffer.lines.append
+        match = self.PATTERN.match
+        keywords = self.KEYWORDS
+        punctuation = self.PUNCTUATION
+
+        end = len(source)
+
+        while current < end:
+            m = match(source, current)
+            if m is None:
+                break
+
+            kind = m.lastindex
+            current = m.end()
+            start = m.start(kind)
+
+            if kind == IDENTIFIER:
+                if current < end and source[current] > '\x7f':
+                    current = self.identifier_end(source, current)
+                token_type = keywords.get(source[start:current], TokenType.IDENTIFIER)
+            elif kind == PUNCTUATION:
+                token_type = punctuation[m.group(kind)]
+            elif kind == SKIP:
+                line += m.group(kind).count('\n')
+                continue
+            elif kind == NUMBER:
+                token_type = TokenType.NUMBER
+            elif kind == STRING:
+                if (current - start < 2) or (source[current - 1] != '"'):
+                    if not at_end:
+                        return start, line
+                    line += source.count('\n', start, current)
+                    self.lox.error(line, "Unterminated string")
+                    continue
+                line += source.count('\n', start, current)
+                token_type = TokenType.STRING
+            elif m.group(kind).isalpha():
+                current = self.identifier_end(source, current)
+                token_type = keywords.get(source[start:current], TokenType.IDENTIFIER)
+            else:
+                self.lox.error(line, f'Invalid character: {m.group(kind)}')
+                continue
+
+            types(token_type.value)
+            starts(start)
+            lengths(current - start)
+            lines(line)
+
+        return end, line
+
+    def identifier_end(self, source, current):
+        end = len(source)
+
+        while current < end:
+            c = source[current]
+            if not (c.isalpha() or (c == '_') or ('0' <= c <= '9')):
+                break
+            current += 1
+
+        return current
+
+
+class CompactScanner(FastScanner):
+    def scan_tokens(self):
+        return self.scan_buffer()
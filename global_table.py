@@ -0,0 +1,45 @@
+from run_time_error import RunTimeError
+
+UNDEFINED = object()
+
+class GlobalTable():
+    def __init__(self):
+        self.indices = {}
+        self.names = []
+        self.values = []
+
+    def index(self, name):
+        try:
+            return self.indices[name]
+        except KeyError:
+            pass
+
+        index = len(self.names)
+        self.indices[name] = index
+        self.names.append(name)
+        self.values.append(UNDEFINED)
+
+        return index
+
+    def adopt(self, names):
+        for index, name in enumerate(names):
+            if self.index(name) != index:
+                return False
+
+        return True
+
+    def define(self, name, value):
+        self.values[self.index(name)] = value
+
+    def get(self, index, line):
+        value = self.values[index]
+        if value is UNDEFINED:
+            raise RunTimeError(line, f"Undefined variable '{self.names[index]}'")
+
+        return value
+
+    def assign(self, index, value, line):
+        if self.values[index] is UNDEFINED:
+            raise RunTimeError(line, f"Undefined variable '{self.names[index]}'")
+
+        self.values[index] = value
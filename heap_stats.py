@@ -0,0 +1,117 @@
+import gc
+import os
+import sys
+import tracemalloc
+from collections import Counter
+
+from expression import Expression
+from statement import Statement
+from global_table import GlobalTable
+from slot_environment import SlotEnvironment
+from lox_instance import LoxInstance
+from lox_function import LoxFunction
+from lox_class import LoxClass
+from compiled_function import CompiledFunction
+from vm_objects import ObjClosure, ObjBoundMethod, ObjClass, ObjInstance, Upvalue
+from python_runtime import LoxObject
+from rope import Rope
+from shape import Shape
+
+TOP_FILES = 10
+
+class HeapStats():
+    def __init__(self):
+        self.counts = Counter()
+        self.sizes = Counter()
+        self.strings = {}
+
+    def start(self):
+        tracemalloc.start()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def add(self, label, size, values=()):
+        self.counts[label] += 1
+        self.sizes[label] += size
+
+        for value in values:
+            if type(value) is str:
+                self.strings[id(value)] = value
+
+    def census(self):
+        self.counts = Counter()
+        self.sizes = Counter()
+        self.strings = {}
+
+        gc.collect()
+        for obj in gc.get_objects():
+            self.visit(obj)
+
+        strings = self.strings.values()
+        self.strings = {}
+        for value in strings:
+            self.add('string', sys.getsizeof(value))
+
+        return sorted(((label, self.counts[label], self.sizes[label]) for label in self.counts),
+                      key=lambda row: row[2], reverse=True)
+
+    def visit(self, obj):
+        kind = type(obj)
+        size = sys.getsizeof
+
+        if kind is LoxInstance:
+            self.add(f'instance {obj.klass.name}', size(obj) + size(obj.values), obj.values)
+        elif kind is ObjInstance:
+            self.add(f'instance {obj.klass.name}', size(obj) + size(obj.fields), obj.fields.values())
+        elif isinstance(obj, LoxObject):
+            fields = vars(obj)
+            self.add(f'instance {kind.lox_name}', size(obj) + size(fields), fields.values())
+        elif kind is SlotEnvironment:
+            self.add('environment', size(obj) + size(obj.values), obj.values)
+        elif kind is GlobalTable:
+            self.add('globals', size(obj) + size(obj.values), obj.values)
+        elif kind is Upvalue:
+            self.add('upvalue', size(obj))
+        elif kind is LoxFunction:
+            self.add(f'function {obj.declaration.name}', size(obj) + size(vars(obj)))
+        elif kind is CompiledFunction:
+            self.add(f'function {obj.declaration.name}', size(obj))
+        elif kind is ObjClosure:
+            self.add(f'function {obj.function.name}', size(obj) + size(obj.upvalues))
+        elif kind is ObjBoundMethod:
+            self.add(f'bound method {obj.method.function.name}', size(obj))
+        elif kind is LoxClass or kind is ObjClass:
+            self.add('class', size(obj))
+        elif kind is Rope:
+            self.add('rope', size(obj))
+        elif kind is Shape:
+            self.add('shape', size(obj) + size(obj.indices) + size(obj.transitions))
+        elif isinstance(obj, (Expression, Statement)):
+            self.add('ast node', size(obj))
+
+    def report(self):
+        lines = []
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(f'traced {current / (1024 * 1024):.2f} MB, peak {peak / (1024 * 1024):.2f} MB')
+            lines.append('')
+
+        lines.append(f'{"count":>10} {"bytes":>12} {"avg":>7}  type')
+        for label, count, size in self.census():
+            lines.append(f'{count:>10} {size:>12} {size / count:>7.1f}  {label}')
+
+        if tracemalloc.is_tracing():
+            lines.append('')
+            lines.append(f'{"blocks":>10} {"bytes":>12}  allocated in')
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ])
+            statistics = snapshot.statistics('filename')
+            for stat in statistics[:TOP_FILES]:
+                filename = os.path.basename(stat.traceback[0].filename)
+                lines.append(f'{stat.count:>10} {stat.size:>12}  {filename}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,84 @@
+import json
+from collections import Counter
+from time import perf_counter
+
+from lox import Lox
+from counting_interpreter import CountingInterpreter
+
+COUNTING_ENGINES = {
+    'tree': CountingInterpreter,
+}
+
+class InstrumentedLox(Lox):
+    def __init__(self, *args, **kwargs):
+        self.phases = Counter()
+        self.events = Counter()
+
+        super().__init__(*args, **kwargs)
+
+    def interpreter_class(self, engine, profile):
+        if not profile and engine in COUNTING_ENGINES:
+            return COUNTING_ENGINES[engine]
+
+        return super().interpreter_class(engine, profile)
+
+    def timed(self, phase, function, *arguments):
+        start = perf_counter()
+        try:
+            return function(*arguments)
+        finally:
+            self.phases[phase] += perf_counter() - start
+
+    def compile(self, source):
+        self.events['compiles'] += 1
+
+        return self.timed('compile', super().compile, source)
+
+    def load_cached(self, source):
+        program = self.timed('cache_load', super().load_cached, source)
+        if self.cache is not None:
+            self.events['cache_hits' if program is not None else 'cache_misses'] += 1
+
+        return program
+
+    def store_cached(self, source, program):
+        self.timed('cache_store', super().store_cached, source, program)
+
+    def scan(self, source):
+        return self.timed('scan', super().scan, source)
+
+    def parse(self, tokens):
+        return self.timed('parse', super().parse, tokens)
+
+    def resolve(self, statements):
+        self.timed('resolve', super().resolve, statements)
+
+    def optimize(self, statements):
+        return self.timed('optimize', super().optimize, statements)
+
+    def prepare(self, statements):
+        return self.timed('prepare', super().prepare, statements)
+
+    def execute(self, program):
+        self.events['runs'] += 1
+        self.timed('execute', super().execute, program)
+
+    def runtime_error(self, e):
+        self.events['runtime_errors'] += 1
+        super().runtime_error(e)
+
+    def metrics(self):
+        counters = dict(self.events)
+        counters.update(getattr(self.interpreter, 'counters', {}))
+        if self.memoize:
+            counters['memo_hits'] = sum(hits for _, hits, _, _ in self.interpreter.memo_stats())
+
+        return {
+            'engine': self.engine,
+            'phases': {phase: round(seconds, 6) for phase, seconds in self.phases.items()},
+            'counters': counters,
+        }
+
+    def dump_metrics(self, file):
+        json.dump(self.metrics(), file, indent=2, sort_keys=True)
+        file.write('\n')
@@ -1,37 +1,98 @@
+import operator
+
+from expression import Binary, NumberBinary, StringBinary, GenericBinary, Call, Get
 from expression_visitor import ExpressionVisitor
 from statement_visitor import StatementVisitor
 from token_type import TokenType
-from environment import Environment
+from global_table import GlobalTable, UNDEFINED
+from slot_environment import SlotEnvironment
 from run_time_error import RunTimeError
 from lox_callable import LoxCallable
 from lox_builtins import *
-from lox_function import LoxFunction, Return
+from lox_function import LoxFunction, Return, TailCall, memo_key
 from lox_class import LoxClass
 from lox_instance import LoxInstance
+from rope import is_string, concatenate
+from lru_cache import LruCache, MISSING
+
+QUICKEN_LIMIT = 4
+
+POLYMORPHIC_LIMIT = 4
+
+NUMBER_OPERATIONS = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.SLASH: operator.truediv,
+    TokenType.STAR: operator.mul,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+class BinarySite():
+    __slots__ = ('hits', 'misses')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
 
 class Interpreter(ExpressionVisitor, StatementVisitor):
     def __init__(self, lox):
         self.lox = lox
 
-        self.globals = Environment()
+        self.out = None
+        self.globals = GlobalTable()
         self.environment = self.globals
+        self.binary_sites = []
+        self.memo_size = lox.memoize
+        self.memoized = []
 
         self.globals.define("clock", Clock())
 
-        self.locals = {}
+    def prepare(self, statements):
+        return statements
+
+    def freeze(self, program):
+        return (program, list(self.globals.names))
+
+    def thaw(self, payload):
+        statements, global_names = payload
+        if not self.globals.adopt(global_names):
+            return None
+
+        return statements
+
+    def link(self, program):
+        return program
 
-    def interpret(self, statements):
+    def interpret(self, program):
+        self.execute_program(self.link(program))
+
+    def execute_program(self, statements):
         try:
             for statement in statements:
                 self.execute(statement)
         except RunTimeError as e:
             self.lox.runtime_error(e)
 
-    def execute(self, statement):
-        statement.accept(self)
+    def save_globals(self):
+        return list(self.globals.values)
+
+    def restore_globals(self, values):
+        current = self.globals.values
+        current[:] = values
+        current.extend([UNDEFINED] * (len(self.globals.names) - len(values)))
+
+    def define_global(self, name, value):
+        self.globals.define(name, value)
+
+    def global_value(self, name):
+        return self.globals.get(self.globals.index(name), None)
 
-    def resolve(self, expr, depth):
-        self.locals[expr] = depth
+    def execute(self, statement):
+        return statement.accept(self)
 
     def execute_block(self, statements, environment):
         previous = self.environment
@@ -39,53 +100,123 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         try:
             self.environment = environment
             for statement in statements:
-                self.execute(statement)
+                result = statement.accept(self)
+                if result is not None:
+                    return result
         finally:
             self.environment = previous
 
     def evaluate(self, expr):
         return expr.accept(self)
 
-    def lookup_variable(self, name, expr):
-        try:
-            distance = self.locals[expr]
-            return self.environment.get_at(distance, name.lexeme)
-        except KeyError:
-            return self.globals.get(name)
+    def define(self, stmt, value):
+        self.environment.values[stmt.slot] = value
 
     def visit_binary(self, expr):
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
 
-        operator_type = expr.operator.token_type
+        self.quicken(expr, left, right)
+
+        return self.binary(expr, left, right)
+
+    def visit_generic_binary(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+
+        return self.binary(expr, left, right)
+
+    def visit_number_binary(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+
+        if type(left) is float and type(right) is float:
+            expr.site.hits += 1
+            return NUMBER_OPERATIONS[expr.operator](left, right)
+
+        return self.deoptimize(expr, left, right)
+
+    def visit_string_binary(self, expr):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+
+        if is_string(left) and is_string(right):
+            expr.site.hits += 1
+            return concatenate(left, right)
+
+        return self.deoptimize(expr, left, right)
+
+    def quicken(self, expr, left, right):
+        if type(left) is float and type(right) is float and expr.operator in NUMBER_OPERATIONS:
+            specialized = NumberBinary
+        elif expr.operator == TokenType.PLUS and is_string(left) and is_string(right):
+            specialized = StringBinary
+        else:
+            expr.__class__ = GenericBinary
+            return
+
+        if expr.site is None:
+            expr.site = BinarySite()
+            self.binary_sites.append(expr)
+
+        expr.__class__ = specialized
+
+    def binary_site_stats(self):
+        stats = []
+        for expr in self.binary_sites:
+            site = expr.site
+            stats.append((expr.line, expr.operator.name, type(expr).__name__, site.hits, site.misses))
+
+        return stats
+
+    def memo_stats(self):
+        stats = []
+        for function in self.memoized:
+            memo = function.memo
+            stats.append((function.declaration.name, memo.hits, memo.misses, len(memo.entries)))
+
+        return stats
+
+    def deoptimize(self, expr, left, right):
+        site = expr.site
+        site.misses += 1
+        if site.misses < QUICKEN_LIMIT:
+            expr.__class__ = Binary
+        else:
+            expr.__class__ = GenericBinary
+
+        return self.binary(expr, left, right)
+
+    def binary(self, expr, left, right):
+        operator_type = expr.operator
         if operator_type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left - right
         elif operator_type == TokenType.PLUS:
-            both_numbers = (isinstance(left, float) and isinstance(right, float))
-            both_strings = (isinstance(left, str) and isinstance(right, str))
-            
-            if both_numbers or both_strings:
+            if isinstance(left, float) and isinstance(right, float):
                 return left + right
+
+            if is_string(left) and is_string(right):
+                return concatenate(left, right)
             
-            raise RunTimeError(expr.operator, "Operands must be two numbers or two strings")
+            raise RunTimeError(expr.line, "Operands must be two numbers or two strings")
         elif operator_type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left / right
         elif operator_type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left * right
         elif operator_type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left > right
         elif operator_type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left >= right
         elif operator_type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left < right
         elif operator_type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
+            self.check_number_operands(expr.line, left, right)
             return left <= right
         elif operator_type == TokenType.BANG_EQUAL:
             return not self.is_equal(left, right)
@@ -103,35 +234,37 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
     def visit_unary(self, expr):
         right = self.evaluate(expr.right)
 
-        if expr.operator.token_type == TokenType.MINUS:
-            self.check_number_operand(expr.operator, right)
+        if expr.operator == TokenType.MINUS:
+            self.check_number_operand(expr.line, right)
             return -right
-        elif expr.operator.token_type == TokenType.BANG:
+        elif expr.operator == TokenType.BANG:
             return not self.is_truthy(right)
 
         raise Exception("Bad unary operator")
 
     def visit_variable(self, expr):
-        return self.lookup_variable(expr.name, expr)
+        if expr.depth is None:
+            return self.globals.get(expr.slot, expr.line)
+
+        return self.environment.get_at(expr.depth, expr.slot)
 
     def visit_assign(self, expr):
         value = self.evaluate(expr.value)
 
-        try:
-            distance = self.locals[expr]
-            self.environment.assign_at(distance, expr.name, value)
-        except KeyError:
-            self.globals.assign(expr.name, value)
+        if expr.depth is None:
+            self.globals.assign(expr.slot, value, expr.line)
+        else:
+            self.environment.assign_at(expr.depth, expr.slot, value)
 
         return value
 
     def visit_logical(self, expr):
         left = self.evaluate(expr.left)
 
-        if expr.operator.token_type == TokenType.OR:
+        if expr.operator == TokenType.OR:
             if self.is_truthy(left):
                 return left
-        elif expr.operator.token_type == TokenType.AND:
+        elif expr.operator == TokenType.AND:
             if not self.is_truthy(left):
                 return left
         else:
@@ -140,47 +273,147 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         return self.evaluate(expr.right)
 
     def visit_call(self, expr):
-        callee = self.evaluate(expr.callee)
+        callee, receiver, arguments = self.evaluate_call(expr)
+
+        if receiver is None:
+            return callee.call(self, arguments)
+
+        return callee.invoke(self, receiver, arguments)
+
+    def call(self, callee, receiver, arguments):
+        if receiver is None:
+            return callee.call(self, arguments)
+
+        return callee.invoke(self, receiver, arguments)
+
+    def tail_call(self, function, receiver, arguments):
+        if receiver is not None:
+            return TailCall(function, SlotEnvironment(function.closure, [receiver]), arguments)
+
+        if function.memo is not None:
+            result = function.memo.get(memo_key(arguments))
+            if result is not MISSING:
+                return Return(result)
+
+        return TailCall(function, function.closure, arguments)
+
+    def evaluate_call(self, expr):
+        receiver = None
+
+        if type(expr.callee) is Get:
+            get = expr.callee
+            obj = self.evaluate(get.obj)
+            if not isinstance(obj, LoxInstance):
+                raise RunTimeError(get.line, "Only instances have properties")
+
+            index = obj.shape.indices.get(get.name)
+            if index is not None:
+                callee = obj.values[index]
+            else:
+                callee = self.cached_method(expr, obj.klass)
+                if callee is None:
+                    raise RunTimeError(get.line, f"Undefined property '{get.name}'")
+                receiver = obj
+        else:
+            callee = self.evaluate(expr.callee)
 
         arguments = []
         for argument in expr.arguments:
             arguments.append(self.evaluate(argument))
 
         if not isinstance(callee, LoxCallable):
-            raise RunTimeError(expr.paren, "can only call functions and methods")
+            raise RunTimeError(expr.line, "can only call functions and methods")
         
         if len(arguments) != callee.arity():
-            raise RunTimeError(expr.paren, f"Expected {callee.arity()} arguments but got {len(arguments)}")
+            raise RunTimeError(expr.line, f"Expected {callee.arity()} arguments but got {len(arguments)}")
 
-        return callee.call(self, arguments)
+        return callee, receiver, arguments
+
+    def cached_method(self, expr, klass):
+        if expr.cached_class is klass:
+            return expr.cached_method
+
+        cache = expr.method_cache
+        if cache is not None:
+            method = cache.get(klass)
+            if method is not None:
+                return method
+
+        method = klass.lookup_method(expr.callee.name)
+        if method is None:
+            return None
+
+        if expr.cached_class is None:
+            expr.cached_class = klass
+            expr.cached_method = method
+        elif cache is None:
+            expr.method_cache = {klass: method}
+        elif len(cache) < POLYMORPHIC_LIMIT:
+            cache[klass] = method
+
+        return method
 
     def visit_get(self, expr):
         obj = self.evaluate(expr.obj)
-        if isinstance(obj, LoxInstance):
-            return obj.get(expr.name)
+        if not isinstance(obj, LoxInstance):
+            raise RunTimeError(expr.line, "Only instances have properties")
+
+        shape = obj.shape
+        if shape is expr.cached_shape:
+            return obj.values[expr.cached_index]
+
+        index = shape.indices.get(expr.name)
+        if index is None:
+            return obj.get(expr.name, expr.line)
 
-        raise RunTimeError("Only instance have properties")
+        expr.cached_shape = shape
+        expr.cached_index = index
+
+        return obj.values[index]
 
     def visit_this(self, expr):
-        return self.lookup_variable(expr.keyword, expr)
+        return self.environment.get_at(expr.depth, 0)
 
     def visit_set(self, expr):
         obj = self.evaluate(expr.obj)
         if not isinstance(obj, LoxInstance):
-            raise RunTimeError("Only instances have fields")
+            raise RunTimeError(expr.line, "Only instances have fields")
 
         value = self.evaluate(expr.value)
-        obj.set_field(expr.name, value)
+
+        shape = obj.shape
+        if shape is expr.cached_shape:
+            if expr.cached_transition is None:
+                obj.values[expr.cached_index] = value
+            else:
+                obj.shape = expr.cached_transition
+                obj.values.append(value)
+            return value
+
+        index = shape.indices.get(expr.name)
+        if index is None:
+            obj.shape = shape.add(expr.name)
+            obj.values.append(value)
+        else:
+            obj.values[index] = value
+
+        expr.cached_shape = shape
+        expr.cached_index = index
+        expr.cached_transition = None
+        if index is None:
+            expr.cached_transition = obj.shape
+
+        return value
 
     def visit_super(self, expr):
-        distance = self.locals[expr]
-        superclass = self.environment.get_at(distance, 'super')
+        distance = expr.depth
+        superclass = self.environment.get_at(distance, 0)
 
-        obj = self.environment.get_at(distance - 1, 'this')
-        method = superclass.find_method(obj, expr.method.lexeme)
+        obj = self.environment.get_at(distance - 1, 0)
+        method = superclass.find_method(obj, expr.method)
 
         if method is None:
-            raise RunTimeError(expr.method, f"Undefined property '{expr.method}'")
+            raise RunTimeError(expr.line, f"Undefined property '{expr.method}'")
 
         return method
 
@@ -191,26 +424,35 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
 
     def visit_if_statement(self, stmt):
         if self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.then_branch)
+            return stmt.then_branch.accept(self)
         elif stmt.else_branch is not None:
-            self.execute(stmt.else_branch)
+            return stmt.else_branch.accept(self)
 
     def visit_print_statement(self, stmt):
         value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        print(self.stringify(value), file=self.out)
 
         return None
 
     def visit_return_statement(self, stmt):
-        value = None
-        if stmt.value is not None:
-            value = self.evaluate(stmt.value)
+        value = stmt.value
+        if value is None:
+            return Return(None)
+
+        if type(value) is Call:
+            callee, receiver, arguments = self.evaluate_call(value)
+            if type(callee) is LoxFunction:
+                return self.tail_call(callee, receiver, arguments)
 
-        raise Return(value)
+            return Return(self.call(callee, receiver, arguments))
+
+        return Return(self.evaluate(value))
     
     def visit_while_statement(self, stmt):
         while self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+            result = stmt.body.accept(self)
+            if result is not None:
+                return result
         
         return None
 
@@ -219,42 +461,46 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
         
-        self.environment.define(stmt.name.lexeme, value)
+        self.define(stmt, value)
 
         return None
 
     def visit_block_statement(self, stmt):
-        self.execute_block(stmt.statements, Environment(self.environment))
+        environment = SlotEnvironment(self.environment, [None] * stmt.slot_count)
+        return self.execute_block(stmt.statements, environment)
 
     def visit_class_statement(self, stmt):
         superclass = None
         if stmt.superclass is not None:
             superclass = self.evaluate(stmt.superclass)
             if not isinstance(superclass, LoxClass):
-                raise RunTimeError("Superclass must be a class")
+                raise RunTimeError(stmt.superclass.line, "Superclass must be a class")
 
-        self.environment.define(stmt.name.lexeme, None)
+        self.define(stmt, None)
 
         if stmt.superclass is not None:
-            self.environment = Environment(self.environment)
-            self.environment.define('super', superclass)
+            self.environment = SlotEnvironment(self.environment, [superclass])
         
         methods = {}
         for method in stmt.methods:
-            is_initializer = (method.name.lexeme == 'init')
+            is_initializer = (method.name == 'init')
             function = LoxFunction(method, self.environment, is_initializer)
-            methods[method.name.lexeme] = function
+            methods[method.name] = function
         
-        klass = LoxClass(stmt.name.lexeme, superclass, methods)
+        klass = LoxClass(stmt.name, superclass, methods)
 
         if superclass is not None:
             self.environment = self.environment.enclosing
         
-        self.environment.assign(stmt.name, klass)
+        self.define(stmt, klass)
 
     def visit_function_statement(self, stmt):
         func = LoxFunction(stmt, self.environment, False)
-        self.environment.define(stmt.name.lexeme, func)
+        if stmt.pure and self.memo_size > 0:
+            func.memo = LruCache(self.memo_size)
+            self.memoized.append(func)
+
+        self.define(stmt, func)
 
         return None
 
@@ -269,17 +515,17 @@ class Interpreter(ExpressionVisitor, StatementVisitor):
     def is_equal(self, a, b):
         return a == b
 
-    def check_number_operand(self, operator, operand):
+    def check_number_operand(self, line, operand):
         if isinstance(operand, float):
             return
         
-        raise RunTimeError(operator, "Operand must be a number")
+        raise RunTimeError(line, "Operand must be a number")
 
-    def check_number_operands(self, operator, left, right):
+    def check_number_operands(self, line, left, right):
         if isinstance(left, float) and isinstance(right, float):
             return
         
-        raise RunTimeError(operator, "Operands must be numbers")
+        raise RunTimeError(line, "Operands must be numbers")
 
     def stringify(self, obj):
         if obj is None:
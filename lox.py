@@ -1,26 +1,73 @@
 import sys
 
 from scanner import Scanner
+from fast_scanner import FastScanner, CompactScanner
+from stream_scanner import StreamScanner
+from token_stream import TokenStream
 from parser import Parser
+from pratt_parser import PrattParser
 from ast_printer import AstPrinter
 from token_type import TokenType
 from interpreter import Interpreter
+from closure_interpreter import ClosureInterpreter
+from vm import VM
+from python_interpreter import PythonInterpreter
+from profiling_interpreter import ProfilingInterpreter
 from resolver import Resolver
+from optimizer import Optimizer
+from purity_analyzer import PurityAnalyzer
+from run_time_error import RunTimeError
 
 DEBUG = False
 
+SCANNERS = {
+    'classic': Scanner,
+    'fast': FastScanner,
+    'compact': CompactScanner,
+}
+
+PARSERS = {
+    'recursive': Parser,
+    'pratt': PrattParser,
+}
+
+ENGINES = {
+    'tree': Interpreter,
+    'closure': ClosureInterpreter,
+    'vm': VM,
+    'python': PythonInterpreter,
+}
+
+PROFILING_ENGINES = {
+    'tree': ProfilingInterpreter,
+}
+
 class Lox():
-    def __init__(self):
-        self.interpreter = Interpreter(self)
+    def __init__(self, scanner='classic', parser='recursive', cache=None, engine='tree', memoize=0, profile=False):
+        self.memoize = memoize
+        self.interpreter = self.interpreter_class(engine, profile)(self)
+        self.engine = engine
+        self.scanner_class = SCANNERS[scanner]
+        self.parser_class = PARSERS[parser]
+        self.cache = cache
         
         self.had_error = False
         self.had_runtime_error = False
 
-    def run_file(self, path: str):
-        with open(path, 'r') as f:
-            source = f.read();
+    def interpreter_class(self, engine, profile):
+        if profile:
+            return PROFILING_ENGINES[engine]
+
+        return ENGINES[engine]
 
-        self.run(source)
+    def run_file(self, path: str, stream=False):
+        if stream:
+            self.run_stream_file(path)
+        else:
+            with open(path, 'r') as f:
+                source = f.read();
+
+            self.run(source)
         
         if self.had_error:
             sys.exit(65)
@@ -36,25 +83,124 @@ class Lox():
             self.had_error = False
 
     def run(self, source: str):
-        scanner = Scanner(self, source)
-        tokens = scanner.scan_tokens()
+        program = self.compile(source)
+
+        if program is None:
+            return
+
+        self.execute(program)
+
+    def compile(self, source: str):
+        program = self.load_cached(source)
+        if program is not None:
+            return program
+
+        tokens = self.scan(source)
         
         if DEBUG:
             print(tokens)
 
-        parser = Parser(self, tokens)
-        statements = parser.parse()
+        statements = self.parse(tokens)
 
         if self.had_error:
-            return
+            return None
 
-        resolver = Resolver(self, self.interpreter)
-        resolver.resolve_statements(statements)
+        try:
+            self.resolve(statements)
+
+            if self.had_error:
+                return None
+
+            statements = self.optimize(statements)
+            program = self.prepare(statements)
+        except RecursionError:
+            self.too_deep()
+            return None
 
         if self.had_error:
-            return
+            return None
+
+        self.store_cached(source, program)
+
+        return program
+
+    def load_cached(self, source):
+        if self.cache is None:
+            return None
+
+        payload = self.cache.load(source, self.engine)
+        if payload is None:
+            return None
+
+        return self.interpreter.thaw(payload)
+
+    def store_cached(self, source, program):
+        if self.cache is not None:
+            self.cache.store(source, self.interpreter.freeze(program), self.engine)
+
+    def scan(self, source):
+        return self.scanner_class(self, source).scan_tokens()
+
+    def parse(self, tokens):
+        return self.parser_class(self, tokens).parse()
+
+    def resolve(self, statements):
+        Resolver(self, self.interpreter).resolve_statements(statements)
+
+    def optimize(self, statements):
+        statements = Optimizer(self.interpreter).optimize_statements(statements)
+        PurityAnalyzer().analyze(statements)
+
+        return statements
+
+    def prepare(self, statements):
+        return self.interpreter.prepare(statements)
+
+    def execute(self, program):
+        try:
+            self.interpreter.interpret(program)
+        except RecursionError:
+            self.runtime_error(RunTimeError(0, "Stack overflow"))
+
+    def run_stream_file(self, path: str):
+        if path == '-':
+            self.run_stream(sys.stdin)
+        else:
+            with open(path, 'r') as f:
+                self.run_stream(f)
+
+    def run_stream(self, file):
+        scanner = StreamScanner(self, file)
+        parser = self.parser_class(self, TokenStream(scanner.scan_tokens()))
+        resolver = Resolver(self, self.interpreter)
+        optimizer = Optimizer(self.interpreter)
+
+        for statement in parser.declarations():
+            if self.had_error:
+                continue
+
+            try:
+                resolver.resolve_statement(statement)
+
+                if self.had_error:
+                    continue
+
+                statements = optimizer.optimize_statements([statement])
+                program = self.prepare(statements)
+            except RecursionError:
+                self.too_deep()
+                continue
+
+            if self.had_error:
+                continue
+
+            self.execute(program)
+
+            if self.had_runtime_error:
+                return
 
-        self.interpreter.interpret(statements)
+    def too_deep(self):
+        self.error(0, "Cannot compile program: expression nesting is too deep")
 
     def error(self, line: int, message: str):
         self.report(line, "", message)
@@ -71,5 +217,5 @@ class Lox():
 
     def runtime_error(self, e):
         message = str(e)
-        print(f"[{e.token.line}] RunTimeError: {message}")
+        print(f"[{e.line}] RunTimeError: {message}")
         self.had_runtime_error = True
\ No newline at end of file
@@ -7,34 +7,36 @@ class LoxClass(LoxCallable):
         self.superclass = superclass
         self.methods = methods
 
+        self.method_table = {}
+        if superclass is not None:
+            self.method_table.update(superclass.method_table)
+        self.method_table.update(methods)
+
+        self.initializer = self.method_table.get('init')
+
     def call(self, interpreter, arguments):
         instance = LoxInstance(self)
 
-        try:
-            initializer = self.methods['init']
-            initializer.bind(instance).call(interpreter, arguments)
-        except KeyError:
-            pass
+        if self.initializer is not None:
+            self.initializer.invoke(interpreter, instance, arguments)
 
         return instance
 
     def arity(self):
-        try:
-            initializer = self.methods['init']
-            return initializer.arity()
-        except KeyError:
-            return 0;
+        if self.initializer is None:
+            return 0
 
-    def find_method(self, instance, name):
-        try:
-            return self.methods[name].bind(instance)
-        except KeyError:
-            pass
+        return self.initializer.arity()
 
-        if self.superclass is not None:
-            return self.superclass.find_method(instance, name)
+    def lookup_method(self, name):
+        return self.method_table.get(name)
+
+    def find_method(self, instance, name):
+        method = self.lookup_method(name)
+        if method is None:
+            return None
 
-        return None
+        return method.bind(instance)
 
     def __str__(self):
         return f"<Class {self.name}>"
\ No newline at end of file
@@ -1,5 +1,8 @@
+import math
+
 from lox_callable import LoxCallable
-from environment import Environment
+from slot_environment import SlotEnvironment
+from lru_cache import MISSING
 
 class LoxFunction(LoxCallable):
     def __init__(self, declaration, closure, is_initializer):
@@ -7,39 +10,80 @@ class LoxFunction(LoxCallable):
         self.closure = closure
         self.is_initializer = is_initializer
 
+        self.memo = None
+
     def arity(self):
         return len(self.declaration.parameters)
 
     def call(self, interpreter, arguments):
-        environment = Environment(self.closure)
+        if self.memo is None:
+            return self.run(interpreter, self.closure, arguments)
+
+        key = memo_key(arguments)
+        value = self.memo.get(key)
+        if value is MISSING:
+            value = self.run(interpreter, self.closure, arguments)
+            self.memo.put(key, value)
+
+        return value
+
+    def invoke(self, interpreter, instance, arguments):
+        return self.run(interpreter, SlotEnvironment(self.closure, [instance]), arguments)
+
+    def run(self, interpreter, closure, arguments):
+        function = self
+
+        while True:
+            declaration = function.declaration
+            environment = SlotEnvironment(closure, arguments + [None] * (declaration.slot_count - len(arguments)))
+
+            result = interpreter.execute_block(declaration.body, environment)
+
+            if type(result) is TailCall:
+                function = result.function
+                closure = result.closure
+                arguments = result.arguments
+                continue
 
-        for i in range(0, len(self.declaration.parameters)):
-            environment.define(self.declaration.parameters[i].lexeme, arguments[i])
-        
-        try:
-            interpreter.execute_block(self.declaration.body, environment)
-        except Return as e:
-            if self.is_initializer:
-                return self.closure.get_at(0, 'this')
-            return e.value
+            if function.is_initializer:
+                return closure.values[0]
 
-        if self.is_initializer:
-            return self.closure.get_at(0, 'this')
+            if result is None:
+                return None
 
-        return None
+            return result.value
 
     def bind(self, instance):
-        environment = Environment(self.closure)
-        environment.define('this', instance)
+        environment = SlotEnvironment(self.closure, [instance])
 
         return LoxFunction(self.declaration, environment, self.is_initializer)
 
     def __str__(self):
-        return f"<fn {self.declaration.name.lexeme}>"
+        return f"<fn {self.declaration.name}>"
 
 
-class Return(Exception):
+def memo_key(arguments):
+    return (*arguments, *map(argument_kind, arguments))
+
+
+def argument_kind(value):
+    if type(value) is float and value == 0:
+        return math.copysign(1.0, value)
+
+    return type(value)
+
+
+class Return():
+    __slots__ = ('value',)
+
     def __init__(self, value):
-        super().__init__(self)
+        self.value = value
+
 
-        self.value = value
\ No newline at end of file
+class TailCall():
+    __slots__ = ('function', 'closure', 'arguments')
+
+    def __init__(self, function, closure, arguments):
+        self.function = function
+        self.closure = closure
+        self.arguments = arguments
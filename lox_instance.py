@@ -1,25 +1,34 @@
 from run_time_error import RunTimeError
+from shape import EMPTY_SHAPE
 
 class LoxInstance():
+    __slots__ = ('klass', 'shape', 'values')
+
     def __init__(self, klass):
         self.klass = klass
 
-        self.fields = {}
+        self.shape = EMPTY_SHAPE
+        self.values = []
 
-    def get(self, name):
-        try:
-            return self.fields[name.lexeme]
-        except KeyError:
-            pass
+    def get(self, name, line):
+        index = self.shape.indices.get(name)
+        if index is not None:
+            return self.values[index]
 
-        method = self.klass.find_method(self, name.lexeme)
+        method = self.klass.find_method(self, name)
         if method is not None:
             return method
 
-        raise RunTimeError(name, f"Undefined property '{name.lexeme}'")
+        raise RunTimeError(line, f"Undefined property '{name}'")
 
     def set_field(self, name, value):
-        self.fields[name.lexeme] = value
+        index = self.shape.indices.get(name)
+        if index is not None:
+            self.values[index] = value
+            return
+
+        self.shape = self.shape.add(name)
+        self.values.append(value)
 
     def __str__(self):
-        return f"<{self.klass.name} instance>"
\ No newline at end of file
+        return f"<{self.klass.name} instance>"
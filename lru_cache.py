@@ -0,0 +1,31 @@
+from collections import OrderedDict
+
+MISSING = object()
+
+class LruCache():
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entries = self.entries
+        try:
+            value = entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+
+        entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def put(self, key, value):
+        entries = self.entries
+        entries[key] = value
+
+        if len(entries) > self.size:
+            entries.popitem(last=False)
@@ -1,17 +1,18 @@
 from expression import *
-from token import Token
 from token_type import TokenType
 from ast_printer import AstPrinter
 
 expr = Binary(
     Unary(
-        Token(TokenType.MINUS, '-', None, 1),
-        Literal(123)
+        TokenType.MINUS,
+        Literal(123),
+        1
     ),
-    Token(TokenType.STAR, '*', None, 1),
+    TokenType.STAR,
     Grouping(
         Literal(45.67)
-    )
+    ),
+    1
 )
 
 ast_printer = AstPrinter()
@@ -0,0 +1,45 @@
+GET_LOCAL = 0
+SET_LOCAL = 1
+GET_GLOBAL = 2
+SET_GLOBAL = 3
+DEFINE_GLOBAL = 4
+GET_UPVALUE = 5
+SET_UPVALUE = 6
+CONSTANT = 7
+NIL = 8
+TRUE = 9
+FALSE = 10
+POP = 11
+ADD = 12
+SUBTRACT = 13
+MULTIPLY = 14
+DIVIDE = 15
+LESS = 16
+LESS_EQUAL = 17
+GREATER = 18
+GREATER_EQUAL = 19
+EQUAL = 20
+NOT_EQUAL = 21
+NOT = 22
+NEGATE = 23
+JUMP = 24
+JUMP_IF_FALSE = 25
+JUMP_IF_TRUE = 26
+POP_JUMP_IF_FALSE = 27
+LOOP = 28
+CALL = 29
+RETURN = 30
+GET_PROPERTY = 31
+SET_PROPERTY = 32
+CHECK_INSTANCE = 33
+GET_METHOD = 34
+CALL_METHOD = 35
+GET_SUPER = 36
+CLOSURE = 37
+CLOSE_UPVALUE = 38
+CLASS = 39
+INHERIT = 40
+METHOD = 41
+PRINT = 42
+
+NAMES = {value: name for name, value in list(globals().items()) if name.isupper()}
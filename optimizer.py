@@ -0,0 +1,224 @@
+import operator
+
+from expression import Literal
+from statement import BlockStatement, IfStatement, ReturnStatement
+from expression_visitor import ExpressionVisitor
+from statement_visitor import StatementVisitor
+from token_type import TokenType
+
+NUMBER_OPERATIONS = {
+    TokenType.MINUS: operator.sub,
+    TokenType.SLASH: operator.truediv,
+    TokenType.STAR: operator.mul,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+class Optimizer(ExpressionVisitor, StatementVisitor):
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+
+    def optimize_statements(self, statements):
+        optimized = []
+
+        for statement in statements:
+            statement = self.optimize_statement(statement)
+            if statement is None:
+                continue
+
+            optimized.append(statement)
+            if self.terminates(statement):
+                break
+
+        return optimized
+
+    def optimize_statement(self, stmt):
+        return stmt.accept(self)
+
+    def optimize_expression(self, expr):
+        return expr.accept(self)
+
+    def optimize_branch(self, stmt):
+        stmt = self.optimize_statement(stmt)
+        if stmt is None:
+            return BlockStatement([])
+
+        return stmt
+
+    def terminates(self, stmt):
+        if isinstance(stmt, ReturnStatement):
+            return True
+
+        if isinstance(stmt, BlockStatement):
+            return len(stmt.statements) > 0 and self.terminates(stmt.statements[-1])
+
+        if isinstance(stmt, IfStatement):
+            return (stmt.else_branch is not None
+                and self.terminates(stmt.then_branch)
+                and self.terminates(stmt.else_branch))
+
+        return False
+
+    def is_truthy(self, value):
+        return value is not None and value is not False
+
+    def visit_binary(self, expr):
+        expr.left = self.optimize_expression(expr.left)
+        expr.right = self.optimize_expression(expr.right)
+
+        if not isinstance(expr.left, Literal) or not isinstance(expr.right, Literal):
+            return expr
+
+        a = expr.left.value
+        b = expr.right.value
+
+        operator_type = expr.operator
+        if operator_type == TokenType.PLUS:
+            if (type(a) is float and type(b) is float) or (type(a) is str and type(b) is str):
+                return Literal(a + b)
+        elif operator_type in NUMBER_OPERATIONS:
+            if type(a) is float and type(b) is float:
+                if operator_type == TokenType.SLASH and b == 0:
+                    return expr
+
+                return Literal(NUMBER_OPERATIONS[operator_type](a, b))
+        elif operator_type == TokenType.BANG_EQUAL:
+            return Literal(not self.interpreter.is_equal(a, b))
+        elif operator_type == TokenType.EQUAL_EQUAL:
+            return Literal(self.interpreter.is_equal(a, b))
+
+        return expr
+
+    def visit_grouping(self, expr):
+        return self.optimize_expression(expr.expression)
+
+    def visit_literal(self, expr):
+        return expr
+
+    def visit_unary(self, expr):
+        expr.right = self.optimize_expression(expr.right)
+
+        if not isinstance(expr.right, Literal):
+            return expr
+
+        value = expr.right.value
+        if expr.operator == TokenType.MINUS:
+            if type(value) is float:
+                return Literal(-value)
+        elif expr.operator == TokenType.BANG:
+            return Literal(not self.is_truthy(value))
+
+        return expr
+
+    def visit_variable(self, expr):
+        return expr
+
+    def visit_assign(self, expr):
+        expr.value = self.optimize_expression(expr.value)
+
+        return expr
+
+    def visit_logical(self, expr):
+        expr.left = self.optimize_expression(expr.left)
+        expr.right = self.optimize_expression(expr.right)
+
+        if not isinstance(expr.left, Literal):
+            return expr
+
+        truthy = self.is_truthy(expr.left.value)
+        if expr.operator == TokenType.OR:
+            return expr.left if truthy else expr.right
+
+        return expr.right if truthy else expr.left
+
+    def visit_call(self, expr):
+        expr.callee = self.optimize_expression(expr.callee)
+        expr.arguments = [self.optimize_expression(argument) for argument in expr.arguments]
+
+        return expr
+
+    def visit_get(self, expr):
+        expr.obj = self.optimize_expression(expr.obj)
+
+        return expr
+
+    def visit_set(self, expr):
+        expr.obj = self.optimize_expression(expr.obj)
+        expr.value = self.optimize_expression(expr.value)
+
+        return expr
+
+    def visit_this(self, expr):
+        return expr
+
+    def visit_super(self, expr):
+        return expr
+
+    def visit_expression_statement(self, stmt):
+        stmt.expression = self.optimize_expression(stmt.expression)
+
+        if isinstance(stmt.expression, Literal):
+            return None
+
+        return stmt
+
+    def visit_print_statement(self, stmt):
+        stmt.expression = self.optimize_expression(stmt.expression)
+
+        return stmt
+
+    def visit_var_statement(self, stmt):
+        if stmt.initializer is not None:
+            stmt.initializer = self.optimize_expression(stmt.initializer)
+
+        return stmt
+
+    def visit_block_statement(self, stmt):
+        stmt.statements = self.optimize_statements(stmt.statements)
+
+        return stmt
+
+    def visit_if_statement(self, stmt):
+        stmt.condition = self.optimize_expression(stmt.condition)
+
+        if isinstance(stmt.condition, Literal):
+            if self.is_truthy(stmt.condition.value):
+                return self.optimize_statement(stmt.then_branch)
+            if stmt.else_branch is not None:
+                return self.optimize_statement(stmt.else_branch)
+            return None
+
+        stmt.then_branch = self.optimize_branch(stmt.then_branch)
+        if stmt.else_branch is not None:
+            stmt.else_branch = self.optimize_statement(stmt.else_branch)
+
+        return stmt
+
+    def visit_while_statement(self, stmt):
+        stmt.condition = self.optimize_expression(stmt.condition)
+
+        if isinstance(stmt.condition, Literal) and not self.is_truthy(stmt.condition.value):
+            return None
+
+        stmt.body = self.optimize_branch(stmt.body)
+
+        return stmt
+
+    def visit_function_statement(self, stmt):
+        stmt.body = self.optimize_statements(stmt.body)
+
+        return stmt
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is not None:
+            stmt.value = self.optimize_expression(stmt.value)
+
+        return stmt
+
+    def visit_class_statement(self, stmt):
+        for method in stmt.methods:
+            self.visit_function_statement(method)
+
+        return stmt
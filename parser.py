@@ -1,12 +1,19 @@
 from token_type import TokenType
+from token_buffer import TokenBuffer
+from token_stream import TokenStream
 from expression import *
 from statement import *
 
+MAX_ARGUMENTS = 255
+
 class Parser():
     def __init__(self, lox, tokens):
         self.lox = lox
         self.tokens = tokens
 
+        if isinstance(tokens, (TokenBuffer, TokenStream)):
+            self.token_type_at = tokens.token_type_at
+
         self.current = 0
 
     def parse(self):
@@ -16,10 +23,14 @@ class Parser():
 
         return statements
 
+    def declarations(self):
+        while not self.is_at_end():
+            yield self.declaration()
+
     def match(self, *token_types):
         for token_type in token_types:
             if self.check(token_type):
-                self.advance()
+                self.current += 1
                 return True
 
         return False
@@ -28,7 +39,7 @@ class Parser():
         if self.is_at_end():
             return False
 
-        return (self.peek().token_type == token_type)
+        return (self.token_type_at(self.current) == token_type)
 
     def advance(self):
         if not self.is_at_end():
@@ -37,7 +48,10 @@ class Parser():
         return self.previous()
 
     def is_at_end(self):
-        return self.peek().token_type == TokenType.EOF
+        return self.token_type_at(self.current) == TokenType.EOF
+
+    def token_type_at(self, index):
+        return self.tokens[index].token_type
 
     def peek(self):
         return self.tokens[self.current]
@@ -60,7 +74,7 @@ class Parser():
         self.advance()
 
         while not self.is_at_end():
-            if self.previous().token_type == TokenType.SEMICOLON:
+            if self.token_type_at(self.current - 1) == TokenType.SEMICOLON:
                 return
             
             statement_starts = [
@@ -73,10 +87,10 @@ class Parser():
                 TokenType.PRINT,
                 TokenType.RETURN,
             ]
-            if self.peek().token_type in statement_starts:
+            if self.token_type_at(self.current) in statement_starts:
                 return
             
-        self.advance()
+            self.advance()
 
     def declaration(self):
         try:
@@ -100,8 +114,8 @@ class Parser():
 
         superclass = None
         if self.match(TokenType.LESS):
-            self.consume(TokenType.IDENTIFIER, "Expect superclass name")
-            superclass = Variable(self.previous())
+            superclass_name = self.consume(TokenType.IDENTIFIER, "Expect superclass name")
+            superclass = Variable(superclass_name.lexeme, superclass_name.line)
 
         self.consume(TokenType.LEFT_BRACE, "Expect '{' before class body")
 
@@ -111,7 +125,7 @@ class Parser():
 
         self.consume(TokenType.RIGHT_BRACE, "Expect '}' after class body")
 
-        return ClassStatement(name, superclass, methods)
+        return ClassStatement(name.lexeme, superclass, tuple(methods), name.line)
 
     def statement(self):
         if self.match(TokenType.FOR):
@@ -157,20 +171,20 @@ class Parser():
         body = self.statement()
 
         if increment is not None:
-            body = BlockStatement([
+            body = BlockStatement((
                 body,
                 ExpressionStatement(increment)
-            ])
+            ))
 
         if condition is None:
             condition = Literal(True)
         body = WhileStatement(condition, body)
 
         if initializer is not None:
-            body = BlockStatement([
+            body = BlockStatement((
                 initializer,
                 body
-            ])
+            ))
 
         return body
 
@@ -201,7 +215,7 @@ class Parser():
 
         self.consume(TokenType.SEMICOLON, "Expect ';' after return value")
 
-        return ReturnStatement(keyword, value)
+        return ReturnStatement(value, keyword.line)
 
     def while_statement(self):
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'")
@@ -224,16 +238,18 @@ class Parser():
 
         parameters = []
         if not self.check(TokenType.RIGHT_PAREN):
-            parameters.append(self.consume(TokenType.IDENTIFIER, "Expect parameter name"))
+            parameters.append(self.consume(TokenType.IDENTIFIER, "Expect parameter name").lexeme)
             while self.match(TokenType.COMMA):
-                parameters.append(self.consume(TokenType.IDENTIFIER, "Expect parameter name"))
+                if len(parameters) >= MAX_ARGUMENTS:
+                    self.error(self.peek(), f"Cannot have more than {MAX_ARGUMENTS} parameters")
+                parameters.append(self.consume(TokenType.IDENTIFIER, "Expect parameter name").lexeme)
 
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after parameters")
 
         self.consume(TokenType.LEFT_BRACE, "Expect '{' after " + kind + " name")
         body = self.block()
 
-        return FunctionStatement(name, parameters, body)        
+        return FunctionStatement(name.lexeme, tuple(parameters), body, name.line)
 
     def block(self):
         statements = []
@@ -242,7 +258,7 @@ class Parser():
 
         self.consume(TokenType.RIGHT_BRACE, "Expect '}' after block")
 
-        return statements
+        return tuple(statements)
 
     def var_declaration(self):
         name = self.consume(TokenType.IDENTIFIER, "Expect variable name")
@@ -253,7 +269,7 @@ class Parser():
 
         self.consume(TokenType.SEMICOLON, "Expect ';' after variable declaration")
 
-        return VarStatement(name, initializer)
+        return VarStatement(name.lexeme, initializer, name.line)
 
     def expression(self):
         return self.assignment()
@@ -266,10 +282,9 @@ class Parser():
             value = self.assignment()
 
             if isinstance(expr, Variable):
-                name = expr.name
-                return Assign(name, value)
+                return Assign(expr.name, value, expr.line)
             elif isinstance(expr, Get):
-                return Set(expr.obj, expr.name, value)
+                return Set(expr.obj, expr.name, value, expr.line)
 
             self.error(equals, "Invalid assignment target")
 
@@ -281,7 +296,7 @@ class Parser():
         while self.match(TokenType.OR):
             operator = self.previous()
             right = self.and_expression()
-            expr = Logical(expr, operator, right)
+            expr = Logical(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -291,7 +306,7 @@ class Parser():
         while self.match(TokenType.AND):
             operator = self.previous()
             right = self.equality()
-            expr = Logical(expr, operator, right)
+            expr = Logical(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -301,7 +316,7 @@ class Parser():
         while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
             operator = self.previous()
             right = self.comparison()
-            expr = Binary(expr, operator, right)
+            expr = Binary(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -311,7 +326,7 @@ class Parser():
         while self.match(TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL):
             operator = self.previous()
             right = self.addition()
-            expr = Binary(expr, operator, right)
+            expr = Binary(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -321,7 +336,7 @@ class Parser():
         while self.match(TokenType.MINUS, TokenType.PLUS):
             operator = self.previous()
             right = self.multiplication()
-            expr = Binary(expr, operator, right)
+            expr = Binary(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -331,7 +346,7 @@ class Parser():
         while self.match(TokenType.SLASH, TokenType.STAR):
             operator = self.previous()
             right = self.unary()
-            expr = Binary(expr, operator, right)
+            expr = Binary(expr, operator.token_type, right, operator.line)
 
         return expr
 
@@ -340,7 +355,7 @@ class Parser():
             operator = self.previous()
             right = self.unary()
 
-            return Unary(operator, right)
+            return Unary(operator.token_type, right, operator.line)
 
         return self.call()
 
@@ -352,7 +367,7 @@ class Parser():
                 expr = self.finish_call(expr)
             elif self.match(TokenType.DOT):
                 name = self.consume(TokenType.IDENTIFIER, "Expect property name after '.'")
-                expr = Get(expr, name)
+                expr = Get(expr, name.lexeme, name.line)
             else:
                 break
 
@@ -363,11 +378,13 @@ class Parser():
         if not self.check(TokenType.RIGHT_PAREN):
             arguments.append(self.expression())
             while self.match(TokenType.COMMA):
+                if len(arguments) >= MAX_ARGUMENTS:
+                    self.error(self.peek(), f"Cannot have more than {MAX_ARGUMENTS} arguments")
                 arguments.append(self.expression())
         
         paren = self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments")
 
-        return Call(callee, paren, arguments)
+        return Call(callee, tuple(arguments), paren.line)
 
     def primary(self):
         if self.match(TokenType.FALSE):
@@ -387,13 +404,14 @@ class Parser():
             self.consume(TokenType.DOT, "Expect '.' after 'super'")
             method = self.consume(TokenType.IDENTIFIER, "Expect superclass method name")
             
-            return Super(keyword, method)
+            return Super(method.lexeme, keyword.line)
 
         if self.match(TokenType.THIS):
-            return This(self.previous())
+            return This(self.previous().line)
 
         if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous())
+            name = self.previous()
+            return Variable(name.lexeme, name.line)
 
         if self.match(TokenType.LEFT_PAREN):
             expr = self.expression()
@@ -0,0 +1,145 @@
+from token_type import TokenType
+from expression import *
+from parser import Parser, MAX_ARGUMENTS
+
+ASSIGNMENT = 1
+OR = 2
+AND = 3
+EQUALITY = 4
+COMPARISON = 5
+TERM = 6
+FACTOR = 7
+UNARY = 8
+
+BINARY_OPERATORS = {
+    TokenType.OR: (OR, Logical),
+    TokenType.AND: (AND, Logical),
+    TokenType.BANG_EQUAL: (EQUALITY, Binary),
+    TokenType.EQUAL_EQUAL: (EQUALITY, Binary),
+    TokenType.GREATER: (COMPARISON, Binary),
+    TokenType.GREATER_EQUAL: (COMPARISON, Binary),
+    TokenType.LESS: (COMPARISON, Binary),
+    TokenType.LESS_EQUAL: (COMPARISON, Binary),
+    TokenType.MINUS: (TERM, Binary),
+    TokenType.PLUS: (TERM, Binary),
+    TokenType.SLASH: (FACTOR, Binary),
+    TokenType.STAR: (FACTOR, Binary),
+}
+
+PREFIX_OPERATORS = {
+    TokenType.BANG,
+    TokenType.MINUS,
+}
+
+GROUP = object()
+
+class Frame():
+    __slots__ = ('callee', 'arguments', 'operators', 'operands')
+
+    def __init__(self, callee=None):
+        self.callee = callee
+        self.arguments = []
+
+        self.operators = []
+        self.operands = []
+
+
+class PrattParser(Parser):
+    def expression(self):
+        token_type_at = self.token_type_at
+
+        frame = Frame()
+        frames = []
+
+        while True:
+            token_type = token_type_at(self.current)
+            while (token_type in PREFIX_OPERATORS) or (token_type == TokenType.LEFT_PAREN):
+                self.current += 1
+                if token_type == TokenType.LEFT_PAREN:
+                    frames.append(frame)
+                    frame = Frame(GROUP)
+                else:
+                    frame.operators.append((UNARY, self.previous(), Unary))
+                token_type = token_type_at(self.current)
+
+            operands = frame.operands
+            operands.append(self.primary())
+
+            while True:
+                token_type = token_type_at(self.current)
+
+                if token_type in BINARY_OPERATORS:
+                    precedence, node_class = BINARY_OPERATORS[token_type]
+                    self.reduce(frame, precedence)
+                    self.current += 1
+                    frame.operators.append((precedence, self.previous(), node_class))
+                    break
+
+                if token_type == TokenType.DOT:
+                    self.current += 1
+                    name = self.consume(TokenType.IDENTIFIER, "Expect property name after '.'")
+                    operands[-1] = Get(operands[-1], name.lexeme, name.line)
+                    continue
+
+                if token_type == TokenType.LEFT_PAREN:
+                    self.current += 1
+                    if token_type_at(self.current) == TokenType.RIGHT_PAREN:
+                        self.current += 1
+                        operands[-1] = Call(operands[-1], (), self.previous().line)
+                        continue
+
+                    frames.append(frame)
+                    frame = Frame(operands.pop())
+                    break
+
+                if token_type == TokenType.EQUAL:
+                    self.reduce(frame, ASSIGNMENT + 1)
+                    self.current += 1
+                    frame.operators.append((ASSIGNMENT, self.previous(), None))
+                    break
+
+                self.reduce(frame, ASSIGNMENT)
+                expr = frame.operands.pop()
+
+                if frame.callee is None:
+                    return expr
+
+                if frame.callee is GROUP:
+                    self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression")
+                    expr = Grouping(expr)
+                else:
+                    frame.arguments.append(expr)
+                    if self.match(TokenType.COMMA):
+                        if len(frame.arguments) >= MAX_ARGUMENTS:
+                            self.error(self.peek(), f"Cannot have more than {MAX_ARGUMENTS} arguments")
+                        break
+
+                    paren = self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments")
+                    expr = Call(frame.callee, tuple(frame.arguments), paren.line)
+
+                frame = frames.pop()
+                operands = frame.operands
+                operands.append(expr)
+
+    def reduce(self, frame, minimum):
+        operators = frame.operators
+        operands = frame.operands
+
+        while operators and (operators[-1][0] >= minimum):
+            precedence, operator, node_class = operators.pop()
+
+            if node_class is Unary:
+                operands[-1] = Unary(operator.token_type, operands[-1], operator.line)
+                continue
+
+            right = operands.pop()
+            left = operands[-1]
+
+            if node_class is not None:
+                operands[-1] = node_class(left, operator.token_type, right, operator.line)
+            elif isinstance(left, Variable):
+                operands[-1] = Assign(left.name, right, left.line)
+            elif isinstance(left, Get):
+                operands[-1] = Set(left.obj, left.name, right, left.line)
+            else:
+                self.error(operator, "Invalid assignment target")
@@ -0,0 +1,144 @@
+from time import perf_counter_ns
+
+from lox_function import LoxFunction
+from lox_class import LoxClass
+
+ROOT = '<script>'
+
+class Profiler():
+    def __init__(self):
+        self.stack = []
+        self.labels = {ROOT: ROOT}
+        self.stats = {ROOT: [0, 0, 0]}
+        self.active = {ROOT: 0}
+        self.edges = {}
+
+        self.names = [ROOT]
+        self.parents = [None]
+        self.children = [{}]
+        self.times = [0]
+
+    def identify(self, callee):
+        if type(callee) is LoxFunction:
+            key = callee.declaration
+            if key not in self.labels:
+                self.labels[key] = f'{key.name}:{key.line}'
+            return key
+
+        if callee not in self.labels:
+            if isinstance(callee, LoxClass):
+                self.labels[callee] = str(callee)
+            else:
+                self.labels[callee] = f'<native {type(callee).__name__}>'
+
+        return callee
+
+    def node(self, parent, key):
+        children = self.children[parent]
+        try:
+            return children[key]
+        except KeyError:
+            pass
+
+        node = len(self.names)
+        children[key] = node
+        self.names.append(self.labels[key])
+        self.parents.append(parent)
+        self.children.append({})
+        self.times.append(0)
+
+        return node
+
+    def start(self):
+        self.active[ROOT] += 1
+        self.stats[ROOT][0] += 1
+        self.stack.append([ROOT, 0, None, perf_counter_ns(), 0])
+
+    def stop(self):
+        self.exit()
+
+    def enter(self, callee, caller=None):
+        key = self.identify(callee)
+        parent = self.stack[-1]
+        if caller is None:
+            caller = parent[0]
+
+        try:
+            self.stats[key][0] += 1
+            self.active[key] += 1
+        except KeyError:
+            self.stats[key] = [1, 0, 0]
+            self.active[key] = 1
+
+        edge = (caller, key)
+        try:
+            counters = self.edges[edge]
+            counters[0] += 1
+            counters[2] += 1
+        except KeyError:
+            self.edges[edge] = [1, 0, 1]
+
+        self.stack.append([key, self.node(parent[1], key), edge, perf_counter_ns(), 0])
+
+    def exit(self):
+        now = perf_counter_ns()
+        key, node, edge, start, children = self.stack.pop()
+
+        elapsed = now - start
+        exclusive = elapsed - children
+
+        stats = self.stats[key]
+        stats[2] += exclusive
+        self.active[key] -= 1
+        if self.active[key] == 0:
+            stats[1] += elapsed
+
+        self.times[node] += exclusive
+        if edge is not None:
+            counters = self.edges[edge]
+            counters[2] -= 1
+            if counters[2] == 0:
+                counters[1] += elapsed
+
+        if self.stack:
+            self.stack[-1][4] += elapsed
+
+    def replace(self, callee):
+        caller = self.stack[-1][0]
+        self.exit()
+        self.enter(callee, caller)
+
+    def report(self):
+        total = self.stats[ROOT][1] or 1
+        lines = [f'{"calls":>10} {"inclusive ms":>13} {"exclusive ms":>13} {"excl %":>7}  function']
+
+        ordered = sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)
+        for key, (calls, inclusive, exclusive) in ordered:
+            lines.append(f'{calls:>10} {inclusive / 1e6:>13.3f} {exclusive / 1e6:>13.3f} '
+                         f'{100 * exclusive / total:>6.1f}%  {self.labels[key]}')
+
+        lines.append('')
+        lines.append(f'{"calls":>10} {"inclusive ms":>13}  caller -> callee')
+
+        ordered = sorted(self.edges.items(), key=lambda item: item[1][1], reverse=True)
+        for (caller, callee), (calls, inclusive, _) in ordered:
+            lines.append(f'{calls:>10} {inclusive / 1e6:>13.3f}  {self.labels[caller]} -> {self.labels[callee]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def collapsed(self):
+        lines = []
+
+        for node, elapsed in enumerate(self.times):
+            micros = elapsed // 1000
+            if micros == 0:
+                continue
+
+            path = []
+            while node is not None:
+                path.append(self.names[node])
+                node = self.parents[node]
+
+            lines.append(f"{';'.join(reversed(path))} {micros}")
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,40 @@
+from interpreter import Interpreter
+from lox_function import TailCall
+from profiler import Profiler
+
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, lox):
+        super().__init__(lox)
+
+        self.profiler = Profiler()
+
+    def execute_program(self, statements):
+        self.profiler.start()
+        try:
+            super().execute_program(statements)
+        finally:
+            self.profiler.stop()
+
+    def visit_call(self, expr):
+        callee, receiver, arguments = self.evaluate_call(expr)
+
+        return self.call(callee, receiver, arguments)
+
+    def call(self, callee, receiver, arguments):
+        profiler = self.profiler
+        profiler.enter(callee)
+        try:
+            return super().call(callee, receiver, arguments)
+        finally:
+            profiler.exit()
+
+    def tail_call(self, function, receiver, arguments):
+        result = super().tail_call(function, receiver, arguments)
+
+        if type(result) is TailCall:
+            self.profiler.replace(function)
+        else:
+            self.profiler.enter(function)
+            self.profiler.exit()
+
+        return result
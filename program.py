@@ -0,0 +1,85 @@
+import io
+import pickle
+
+from lox import Lox
+
+class CompileError(Exception):
+    def __init__(self, errors):
+        super().__init__('\n'.join(errors))
+
+        self.errors = errors
+
+
+class EmbeddedLox(Lox):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.errors = []
+        self.failure = None
+
+    def report(self, line, where, message):
+        self.errors.append(f'[{line}] Error{where}: {message}')
+        self.had_error = True
+
+    def runtime_error(self, e):
+        self.failure = e
+        self.had_runtime_error = True
+
+
+class Program():
+    def __init__(self, source, engine='tree', scanner='classic', parser='recursive'):
+        lox = EmbeddedLox(scanner=scanner, parser=parser, engine=engine)
+        program = lox.compile(source)
+        if lox.had_error:
+            raise CompileError(lox.errors)
+
+        self.engine = engine
+        self.payload = pickle.dumps(lox.interpreter.freeze(program), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def context(self):
+        return Context(self)
+
+    def run(self, **inputs):
+        return self.context().run(**inputs)
+
+
+class Context():
+    def __init__(self, program):
+        self.lox = EmbeddedLox(engine=program.engine)
+        self.interpreter = self.lox.interpreter
+        self.output = io.StringIO()
+        self.interpreter.out = self.output
+
+        self.program = self.interpreter.link(self.interpreter.thaw(pickle.loads(program.payload)))
+        if self.lox.had_error:
+            raise CompileError(self.lox.errors)
+
+        self.initial = self.interpreter.save_globals()
+
+    def run(self, **inputs):
+        interpreter = self.interpreter
+        interpreter.restore_globals(self.initial)
+        for name, value in inputs.items():
+            interpreter.define_global(name, lox_value(value))
+
+        self.lox.had_runtime_error = False
+        self.lox.failure = None
+
+        self.output.seek(0)
+        self.output.truncate()
+        interpreter.execute_program(self.program)
+
+        if self.lox.had_runtime_error:
+            raise self.lox.failure
+
+        return self.output.getvalue()
+
+    def get(self, name):
+        return self.interpreter.global_value(name)
+
+
+def lox_value(value):
+    if type(value) is int:
+        return float(value)
+
+    return value
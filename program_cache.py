@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pickle
+import sys
+
+FORMAT_VERSION = 12
+
+class ProgramCache():
+    SUFFIX = '.loxc'
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, source: str, tag=''):
+        digest = hashlib.sha256()
+        digest.update(f'{FORMAT_VERSION}:{sys.version}:{tag}\0'.encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def load(self, source: str, tag=''):
+        path = self.path(self.key(source, tag))
+
+        try:
+            with open(path, 'rb') as f:
+                program = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return program
+
+    def store(self, source: str, program, tag=''):
+        try:
+            data = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return
+
+        if len(data) > self.max_bytes:
+            return
+
+        path = self.path(self.key(source, tag))
+        temporary = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            self.remove(temporary)
+            return
+
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            self.remove(path)
+            total -= size
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
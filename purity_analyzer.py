@@ -0,0 +1,151 @@
+from collections import Counter
+
+from expression import Variable
+from statement import VarStatement, FunctionStatement, ClassStatement
+from expression_visitor import ExpressionVisitor
+from statement_visitor import StatementVisitor
+
+class PurityAnalyzer(ExpressionVisitor, StatementVisitor):
+    def __init__(self):
+        self.function = None
+        self.impure = set()
+        self.dependencies = {}
+        self.assigned = set()
+
+    def analyze(self, statements):
+        declarations = Counter()
+        functions = {}
+
+        for statement in statements:
+            if isinstance(statement, (VarStatement, FunctionStatement, ClassStatement)):
+                declarations[statement.slot] += 1
+
+            if isinstance(statement, FunctionStatement):
+                functions[statement.slot] = statement
+                self.function = statement
+                self.dependencies[statement] = set()
+                self.walk_statements(statement.body)
+                self.function = None
+            else:
+                self.walk_statement(statement)
+
+        pure = set()
+        for slot, function in functions.items():
+            function.pure = False
+            if declarations[slot] == 1 and slot not in self.assigned and function not in self.impure:
+                pure.add(slot)
+
+        changed = True
+        while changed:
+            changed = False
+            for slot in list(pure):
+                if not self.dependencies[functions[slot]] <= pure:
+                    pure.discard(slot)
+                    changed = True
+
+        for slot in pure:
+            functions[slot].pure = True
+
+    def walk_statements(self, statements):
+        for statement in statements:
+            self.walk_statement(statement)
+
+    def walk_statement(self, stmt):
+        stmt.accept(self)
+
+    def walk_expression(self, expr):
+        expr.accept(self)
+
+    def impurity(self):
+        if self.function is not None:
+            self.impure.add(self.function)
+
+    def visit_binary(self, expr):
+        self.walk_expression(expr.left)
+        self.walk_expression(expr.right)
+
+    def visit_grouping(self, expr):
+        self.walk_expression(expr.expression)
+
+    def visit_literal(self, expr):
+        pass
+
+    def visit_unary(self, expr):
+        self.walk_expression(expr.right)
+
+    def visit_variable(self, expr):
+        if expr.depth is None and self.function is not None:
+            self.dependencies[self.function].add(expr.slot)
+
+    def visit_assign(self, expr):
+        self.walk_expression(expr.value)
+
+        if expr.depth is None:
+            self.assigned.add(expr.slot)
+            self.impurity()
+
+    def visit_logical(self, expr):
+        self.walk_expression(expr.left)
+        self.walk_expression(expr.right)
+
+    def visit_call(self, expr):
+        if not isinstance(expr.callee, Variable) or expr.callee.depth is not None:
+            self.impurity()
+
+        self.walk_expression(expr.callee)
+        for argument in expr.arguments:
+            self.walk_expression(argument)
+
+    def visit_get(self, expr):
+        self.impurity()
+        self.walk_expression(expr.obj)
+
+    def visit_set(self, expr):
+        self.impurity()
+        self.walk_expression(expr.obj)
+        self.walk_expression(expr.value)
+
+    def visit_this(self, expr):
+        self.impurity()
+
+    def visit_super(self, expr):
+        self.impurity()
+
+    def visit_expression_statement(self, stmt):
+        self.walk_expression(stmt.expression)
+
+    def visit_print_statement(self, stmt):
+        self.impurity()
+        self.walk_expression(stmt.expression)
+
+    def visit_var_statement(self, stmt):
+        if stmt.initializer is not None:
+            self.walk_expression(stmt.initializer)
+
+    def visit_block_statement(self, stmt):
+        self.walk_statements(stmt.statements)
+
+    def visit_if_statement(self, stmt):
+        self.walk_expression(stmt.condition)
+        self.walk_statement(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self.walk_statement(stmt.else_branch)
+
+    def visit_while_statement(self, stmt):
+        self.walk_expression(stmt.condition)
+        self.walk_statement(stmt.body)
+
+    def visit_function_statement(self, stmt):
+        self.impurity()
+        self.walk_statements(stmt.body)
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is not None:
+            self.walk_expression(stmt.value)
+
+    def visit_class_statement(self, stmt):
+        self.impurity()
+        if stmt.superclass is not None:
+            self.walk_expression(stmt.superclass)
+        for method in stmt.methods:
+            self.walk_statements(method.body)
@@ -0,0 +1,164 @@
+import hashlib
+import marshal
+import warnings
+
+from interpreter import Interpreter
+from transpiler import Transpiler
+from run_time_error import RunTimeError
+from lox_callable import LoxCallable
+from python_runtime import *
+
+class TranspiledProgram():
+    def __init__(self, code, spans, assumed):
+        self.code = code
+        self.spans = spans
+        self.assumed = assumed
+
+
+class PythonInterpreter(Interpreter):
+    def __init__(self, lox):
+        super().__init__(lox)
+
+        self.spans = {}
+        self.namespace = {
+            '__builtins__': __builtins__,
+            '_G': None,
+            '_I': self,
+            '_stringify': self.stringify,
+            '_error': error,
+            '_call_error': call_error,
+            '_superclass': superclass,
+            '_instance': instance,
+            '_set_field': set_field,
+            '_set_global': set_global,
+            '_store': store,
+            'LoxObject': LoxObject,
+        }
+        self.namespace['_G'] = self.namespace
+
+        for name, value in zip(self.globals.names, self.globals.values):
+            if isinstance(value, LoxCallable):
+                self.namespace[f'g_{name}'] = NativeFunction(value, self)
+
+    def defined(self):
+        return [name for name in self.namespace if name.startswith('g_')]
+
+    def prepare(self, statements):
+        assumed = self.defined()
+        source, spans = Transpiler(assumed).transpile(statements)
+        filename = f"<lox {hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]}>"
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                code = compile(source, filename, 'exec')
+        except (SyntaxError, MemoryError) as e:
+            line = 0
+            for span in spans.get(getattr(e, 'lineno', None), ()):
+                line = span[3]
+                break
+            self.lox.error(line, f"Cannot compile program for the python engine: {e}")
+            return None
+
+        self.spans[filename] = spans
+
+        return TranspiledProgram(code, spans, assumed)
+
+    def freeze(self, program):
+        return (marshal.dumps(program.code), program.spans, program.assumed)
+
+    def thaw(self, payload):
+        code, spans, assumed = payload
+        if any(name not in self.namespace for name in assumed):
+            return None
+
+        code = marshal.loads(code)
+        self.spans[code.co_filename] = spans
+
+        return TranspiledProgram(code, spans, assumed)
+
+    def save_globals(self):
+        return dict(self.namespace)
+
+    def restore_globals(self, namespace):
+        self.namespace.clear()
+        self.namespace.update(namespace)
+        self.namespace['_G'] = self.namespace
+
+    def define_global(self, name, value):
+        self.namespace[f'g_{name}'] = value
+
+    def global_value(self, name):
+        try:
+            return self.namespace[f'g_{name}']
+        except KeyError:
+            raise RunTimeError(None, f"Undefined variable '{name}'")
+
+    def execute_program(self, program):
+        try:
+            exec(program.code, self.namespace)
+            self.namespace['_script']()
+        except RunTimeError as e:
+            if e.line is None:
+                e = self.translate(e)
+            self.lox.runtime_error(e)
+        except (NameError, AttributeError) as e:
+            error = self.translate(e)
+            if error is None:
+                raise
+            self.lox.runtime_error(error)
+
+    def translate(self, e):
+        span = self.span(e.__traceback__)
+        if span is None:
+            return None
+
+        kind, line, payload = span
+
+        if isinstance(e, RunTimeError):
+            e.line = line
+            return e
+
+        if isinstance(e, NameError) and kind == 'variable':
+            return RunTimeError(line, f"Undefined variable '{payload}'")
+
+        if isinstance(e, AttributeError) and kind == 'get':
+            if isinstance(e.obj, LoxObject):
+                return RunTimeError(line, f"Undefined property '{payload}'")
+            return RunTimeError(line, "Only instances have properties")
+
+        if isinstance(e, AttributeError) and kind == 'super':
+            return RunTimeError(line, f"Undefined property '{payload}'")
+
+        return None
+
+    def span(self, traceback):
+        frame = None
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename in self.spans:
+                frame = traceback
+            traceback = traceback.tb_next
+
+        if frame is None:
+            return None
+
+        code = frame.tb_frame.f_code
+        lineno, _, start, end = list(code.co_positions())[frame.tb_lasti // 2]
+
+        best = None
+        for span in self.spans[code.co_filename].get(lineno, ()):
+            if span[0] <= start and end <= span[1]:
+                if best is None or span[1] - span[0] < best[1] - best[0]:
+                    best = span
+
+        if best is None:
+            return None
+
+        return best[2:]
+
+    def stringify(self, obj):
+        name = function_name(obj)
+        if name is not None:
+            return f"<fn {name}>"
+
+        return super().stringify(obj)
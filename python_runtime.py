@@ -0,0 +1,87 @@
+from types import FunctionType, MethodType
+
+from run_time_error import RunTimeError
+
+class LoxClassType(type):
+    @property
+    def lox_arity(cls):
+        initializer = getattr(cls, 'l_init', None)
+        if initializer is None:
+            return 0
+
+        return initializer.lox_arity
+
+    def __str__(cls):
+        return f"<Class {cls.lox_name}>"
+
+
+class LoxObject(metaclass=LoxClassType):
+    lox_name = 'Object'
+
+    def __str__(self):
+        return f"<{type(self).lox_name} instance>"
+
+
+class NativeFunction():
+    __slots__ = ('native', 'interpreter', 'lox_arity')
+
+    def __init__(self, native, interpreter):
+        self.native = native
+        self.interpreter = interpreter
+        self.lox_arity = native.arity()
+
+    def __call__(self, *arguments):
+        return self.native.call(self.interpreter, list(arguments))
+
+    def __str__(self):
+        return str(self.native)
+
+
+def function_name(obj):
+    if type(obj) is MethodType:
+        obj = obj.__func__
+
+    if type(obj) is FunctionType:
+        return obj.__code__.co_name.split('_', 2)[2]
+
+    return None
+
+def error(line, message):
+    raise RunTimeError(line, message)
+
+def call_error(callee, count, line):
+    arity = getattr(callee, 'lox_arity', None)
+    if arity is None:
+        raise RunTimeError(line, "can only call functions and methods")
+
+    raise RunTimeError(line, f"Expected {arity} arguments but got {count}")
+
+def superclass(value, line):
+    if not isinstance(value, LoxClassType):
+        raise RunTimeError(line, "Superclass must be a class")
+
+    return value
+
+def instance(value, line):
+    if not isinstance(value, LoxObject):
+        raise RunTimeError(line, "Only instances have fields")
+
+    return value
+
+def set_field(obj, name, value):
+    setattr(obj, name, value)
+
+    return value
+
+def store(box, value):
+    box[0] = value
+
+    return value
+
+def set_global(namespace, name, value, line):
+    if name not in namespace:
+        raise RunTimeError(line, f"Undefined variable '{name[2:]}'")
+
+    namespace[name] = value
+
+    return value
@@ -9,6 +9,7 @@ class Resolver(ExpressionVisitor, StatementVisitor):
         self.interpreter = interpreter
 
         self.scopes = []
+        self.slots = []
         self.current_function = FunctionType.NONE
         self.current_class = ClassType.NONE
 
@@ -24,8 +25,12 @@ class Resolver(ExpressionVisitor, StatementVisitor):
 
     def resolve_local(self, expr, name):
         for i in range(len(self.scopes), 0, -1):
-            if name.lexeme in self.scopes[i-1]:
-                self.interpreter.resolve(expr, len(self.scopes) - i)
+            if name in self.scopes[i-1]:
+                expr.depth = len(self.scopes) - i
+                return self.slots[i-1][name]
+
+        expr.depth = None
+        return self.interpreter.globals.index(name)
 
     def resolve_function(self, function, function_type):
         enclosing_function = self.current_function
@@ -34,46 +39,60 @@ class Resolver(ExpressionVisitor, StatementVisitor):
         self.begin_scope()
 
         for parameter in function.parameters:
-            self.declare(parameter)
+            self.declare(parameter, function.line)
             self.define(parameter)
 
         self.resolve_statements(function.body)
 
-        self.end_scope()
+        function.slot_count = self.end_scope()
 
         self.current_function = enclosing_function
 
-    def declare(self, name):
+    def declare(self, name, line, declaration=None):
         if len(self.scopes) == 0:
+            if declaration is not None:
+                declaration.slot = self.interpreter.globals.index(name)
             return
 
         scope = self.scopes[-1]
+        slots = self.slots[-1]
+
+        if name in scope:
+            self.error(line, name, "variable with this name already declared in this scope")
+        else:
+            slots[name] = len(slots)
 
-        if name.lexeme in scope:
-            self.lox.error(name, "variable with this name already declared in this scope")
+        scope[name] = False
 
-        scope[name.lexeme] = False
+        if declaration is not None:
+            declaration.slot = slots[name]
     
     def define(self, name):
         if len(self.scopes) == 0:
             return
 
         scope = self.scopes[-1]
-        scope[name.lexeme] = True
+        scope[name] = True
+
+    def error(self, line, lexeme, message):
+        self.lox.report(line, f" at '{lexeme}'", message)
 
     def begin_scope(self):
         self.scopes.append({})
+        self.slots.append({})
 
     def end_scope(self):
         self.scopes.pop()
 
+        return len(self.slots.pop())
+
     def visit_block_statement(self, stmt):
         self.begin_scope()
         self.resolve_statements(stmt.statements)
-        self.endScope()
+        stmt.slot_count = self.end_scope()
 
     def visit_var_statement(self, stmt):
-        self.declare(stmt.name)
+        self.declare(stmt.name, stmt.line, stmt)
         
         if stmt.initializer is not None:
             self.resolve_statement(stmt.initializer)
@@ -83,17 +102,17 @@ class Resolver(ExpressionVisitor, StatementVisitor):
     def visit_variable(self, expr):
         if len(self.scopes) > 0:
             scope = self.scopes[-1]
-            if scope.get(expr.name.lexeme, None) == False:
-                self.lox.error(expr.name, "Cannot read local variable in its own initializer")
+            if scope.get(expr.name, None) == False:
+                self.error(expr.line, expr.name, "Cannot read local variable in its own initializer")
     
-        self.resolve_local(expr, expr.name)
+        expr.slot = self.resolve_local(expr, expr.name)
 
     def visit_assign(self, expr):
         self.resolve_expression(expr.value)
-        self.resolve_local(expr, expr.name)
+        expr.slot = self.resolve_local(expr, expr.name)
 
     def visit_function_statement(self, stmt):
-        self.declare(stmt.name)
+        self.declare(stmt.name, stmt.line, stmt)
         self.define(stmt.name)
 
         self.resolve_function(stmt, FunctionType.FUNCTION)
@@ -113,11 +132,11 @@ class Resolver(ExpressionVisitor, StatementVisitor):
 
     def visit_return_statement(self, stmt):
         if self.current_function == FunctionType.NONE:
-            self.lox.error(stmt.keyword, "Cannot return from top-level code")
+            self.error(stmt.line, 'return', "Cannot return from top-level code")
 
         if stmt.value is not None:
             if self.current_function == FunctionType.INITIALIZER:
-                self.lox.error(stmt.keyword, "Cannot return a value from initializer")
+                self.error(stmt.line, 'return', "Cannot return a value from initializer")
 
             self.resolve_expression(stmt.value)
 
@@ -129,9 +148,12 @@ class Resolver(ExpressionVisitor, StatementVisitor):
         enclosing_class = self.current_class
         self.current_class = ClassType.CLASS
 
-        self.declare(stmt.name)
+        self.declare(stmt.name, stmt.line, stmt)
 
         if stmt.superclass is not None:
+            if stmt.superclass.name == stmt.name:
+                self.error(stmt.superclass.line, stmt.name, "A class cannot inherit from itself")
+
             self.current_class = ClassType.SUBCLASS
             self.resolve_statement(stmt.superclass)
 
@@ -139,14 +161,16 @@ class Resolver(ExpressionVisitor, StatementVisitor):
 
         if stmt.superclass is not None:
             self.begin_scope()
-            self.scopes[-1]['super'] = True
+            self.declare('super', stmt.line)
+            self.define('super')
 
         self.begin_scope()
-        self.scopes[-1]['this'] = True
+        self.declare('this', stmt.line)
+        self.define('this')
 
         for method in stmt.methods:
             declaration = FunctionType.METHOD
-            if method.name.lexeme == 'init':
+            if method.name == 'init':
                 declaration = FunctionType.INITIALIZER
             self.resolve_function(method, declaration)
 
@@ -189,18 +213,18 @@ class Resolver(ExpressionVisitor, StatementVisitor):
 
     def visit_this(self, expr):
         if self.current_class == ClassType.NONE:
-            self.lox.syntax_error(expr.keyword, "Cannot use 'this' outside a class")
+            self.error(expr.line, 'this', "Cannot use 'this' outside a class")
             return
 
-        self.resolve_local(expr, expr.keyword)
+        self.resolve_local(expr, 'this')
 
     def visit_super(self, expr):
         if self.current_class == ClassType.NONE:
-            self.lox.syntax_error(expr.keyword, "Cannot use 'super' outside a class")
+            self.error(expr.line, 'super', "Cannot use 'super' outside a class")
         elif not self.current_class == ClassType.SUBCLASS:
-            self.lox.syntax_error(expr.keyword, "Cannot use 'super' in a class with no superclass")
+            self.error(expr.line, 'super', "Cannot use 'super' in a class with no superclass")
 
-        self.resolve_local(expr, expr.keyword)
+        self.resolve_local(expr, 'super')
 
     
 
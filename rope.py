@@ -0,0 +1,62 @@
+ROPE_MIN = 64
+
+class Rope():
+    __slots__ = ('left', 'right', 'length', 'flat')
+
+    def __init__(self, left, right, length):
+        self.left = left
+        self.right = right
+        self.length = length
+
+        self.flat = None
+
+    def flatten(self):
+        if self.flat is not None:
+            return self.flat
+
+        pieces = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if type(node) is not Rope:
+                pieces.append(node)
+            elif node.flat is not None:
+                pieces.append(node.flat)
+            else:
+                pending.append(node.right)
+                pending.append(node.left)
+
+        self.flat = ''.join(pieces)
+        self.left = None
+        self.right = None
+
+        return self.flat
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return self.flatten()
+
+    def __eq__(self, other):
+        if type(other) is Rope:
+            return self.length == other.length and self.flatten() == other.flatten()
+
+        if type(other) is str:
+            return self.length == len(other) and self.flatten() == other
+
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.flatten())
+
+
+def is_string(value):
+    return type(value) is str or type(value) is Rope
+
+def concatenate(left, right):
+    length = len(left) + len(right)
+    if length < ROPE_MIN:
+        return left + right
+
+    return Rope(left, right, length)
@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from lox import Lox, ENGINES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+HEADER = f'{"benchmark":>16} {"engine":>8} {"runs":>5} {"median s":>10} {"p95 s":>10} {"rss MB":>8}'
+
+def measure(engine, path, repeat):
+    with open(path, 'r') as f:
+        source = f.read()
+
+    times = []
+    output = None
+    for _ in range(repeat):
+        lox = Lox(engine=engine)
+        buffer = io.StringIO()
+
+        with contextlib.redirect_stdout(buffer):
+            start = time.perf_counter()
+            lox.run(source)
+            elapsed = time.perf_counter() - start
+
+        if lox.had_error or lox.had_runtime_error:
+            raise SystemExit(f'{os.path.basename(path)} [{engine}] failed:\n{buffer.getvalue()}')
+
+        times.append(elapsed)
+        output = buffer.getvalue()
+
+    return {
+        'times': times,
+        'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'output': output,
+    }
+
+def run(engine, path, repeat):
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--engine', engine, '--repeat', str(repeat), path]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise SystemExit(result.stderr or result.stdout)
+
+    return json.loads(result.stdout)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def summarize(name, engine, measurement):
+    times = measurement['times']
+
+    return {
+        'benchmark': name,
+        'engine': engine,
+        'runs': len(times),
+        'median': statistics.median(times),
+        'p95': percentile(times, 0.95),
+        'rss_kb': measurement['rss_kb'],
+        'times': times,
+    }
+
+def row(result):
+    return (f'{result["benchmark"]:>16} {result["engine"]:>8} {result["runs"]:>5} '
+            f'{result["median"]:>10.3f} {result["p95"]:>10.3f} {result["rss_kb"] / 1024:>8.1f}')
+
+def compare(baseline, current, threshold):
+    before = {(result['benchmark'], result['engine']): result for result in baseline['results']}
+
+    lines = [f'{"benchmark":>16} {"engine":>8} {"base s":>10} {"new s":>10} {"change":>8} {"rss":>8}']
+    regressions = 0
+    for result in current['results']:
+        key = (result['benchmark'], result['engine'])
+        if key not in before:
+            continue
+
+        old = before[key]
+        change = result['median'] / old['median'] - 1
+        rss_change = result['rss_kb'] / old['rss_kb'] - 1
+
+        flag = ''
+        if change > threshold or rss_change > threshold:
+            flag = 'REGRESSION'
+            regressions += 1
+        elif change < -threshold:
+            flag = 'improved'
+
+        lines.append(f'{result["benchmark"]:>16} {result["engine"]:>8} {old["median"]:>10.3f} {result["median"]:>10.3f} '
+                     f'{100 * change:>+7.1f}% {100 * rss_change:>+7.1f}%  {flag}')
+
+    return '\n'.join(lines) + '\n', regressions
+
+def load(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Lox benchmark suite and compare result files')
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--engine', action='append', choices=ENGINES.keys())
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', metavar='PATH')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'))
+    parser.add_argument('--threshold', type=float, default=0.05)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(measure(args.engine[0], args.paths[0], args.repeat), sys.stdout)
+        return
+
+    if args.compare:
+        text, regressions = compare(load(args.compare[0]), load(args.compare[1]), args.threshold)
+        print(text, end='')
+        print(f'{regressions} regressions over {100 * args.threshold:g}%')
+        if regressions:
+            sys.exit(1)
+        return
+
+    paths = args.paths or sorted(glob.glob(os.path.join(HERE, 'benchmarks', '*.lox')))
+    engines = args.engine or list(ENGINES)
+
+    print(HEADER)
+
+    results = []
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        expected = None
+        for engine in engines:
+            measurement = run(engine, path, args.repeat)
+
+            if expected is None:
+                expected = measurement['output']
+            elif measurement['output'] != expected:
+                print(f'{name}: {engine} output differs: {measurement["output"]!r} != {expected!r}')
+
+            result = summarize(name, engine, measurement)
+            results.append(result)
+            print(row(result), flush=True)
+
+    if args.json:
+        document = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(document, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+from lox import ENGINES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def run(engine, path):
+    command = [sys.executable, os.path.join(HERE, 'run_lox.py'), '--engine', engine, path]
+    result = subprocess.run(command, capture_output=True, text=True)
+
+    return result.returncode, result.stdout, result.stderr
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that every engine matches the tree walker')
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--reference', choices=ENGINES.keys(), default='tree')
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(HERE, 'conformance', '*.lox')))
+    engines = [engine for engine in ENGINES if engine != args.reference]
+
+    failures = 0
+    for path in paths:
+        expected = run(args.reference, path)
+        for engine in engines:
+            actual = run(engine, path)
+            if actual == expected:
+                continue
+
+            failures += 1
+            print(f'FAIL {os.path.basename(path)} [{engine}]')
+            print(f'  expected: {expected}')
+            print(f'  actual:   {actual}')
+
+    print(f'{len(paths)} programs, {len(engines)} engines, {failures} failures')
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,117 @@
 import argparse
+import signal
+import sys
 
-from lox import Lox
+from lox import Lox, SCANNERS, PARSERS, ENGINES, PROFILING_ENGINES
+from instrumented_lox import InstrumentedLox
+from program_cache import ProgramCache
+from sampling_profiler import SamplingProfiler
+from heap_stats import HeapStats
 
 parser = argparse.ArgumentParser()
 parser.add_argument('path', nargs='?', default=None)
+parser.add_argument('--scanner', choices=SCANNERS.keys(), default='classic')
+parser.add_argument('--parser', choices=PARSERS.keys(), default='recursive')
+parser.add_argument('--engine', choices=ENGINES.keys(), default='tree')
+parser.add_argument('--stream', action='store_true', help="execute statements as they are parsed, use '-' for stdin")
+parser.add_argument('--cache-dir', default=None, help='directory for compiled program cache')
+parser.add_argument('--cache-size', type=int, default=64, help='cache size limit in MB')
+parser.add_argument('--binary-stats', action='store_true', help='report per-site binary operator specialisation counters (tree engine)')
+parser.add_argument('--memoize', type=int, default=0, metavar='SIZE', help='cache results of pure functions in LRU caches of SIZE entries (tree engine)')
+parser.add_argument('--memo-stats', action='store_true', help='report hit/miss counters of memoised functions')
+parser.add_argument('--profile', action='store_true', help='report per-function call counts and times on stderr')
+parser.add_argument('--profile-stacks', default=None, metavar='PATH', help='write collapsed stacks for flame graph tools to PATH (implies --profile)')
+parser.add_argument('--metrics', default=None, metavar='PATH', help="write phase timings and runtime counters as JSON to PATH at exit, use '-' for stderr")
+parser.add_argument('--sample', action='store_true', help='sample the running Lox line on a CPU timer and print a source heatmap (tree, closure and vm engines)')
+parser.add_argument('--sample-interval', type=float, default=2.0, metavar='MS', help='sampling interval in milliseconds')
+parser.add_argument('--sample-output', default=None, metavar='PATH', help='write the heatmap to PATH instead of stderr')
+parser.add_argument('--heap-stats', action='store_true', help='trace allocations and report live runtime objects on stderr at exit or on SIGUSR1')
 args = parser.parse_args()
 
-lox = Lox()
+if args.memoize and (args.path is None or args.stream):
+    parser.error('--memoize needs a whole program file, not the prompt or --stream')
 
-if args.path is not None:
-    lox.run_file(args.path)
-else:
-    lox.run_prompt()
\ No newline at end of file
+if args.sample and (args.path is None or args.path == '-' or args.engine == 'python'):
+    parser.error('--sample needs a source file and the tree, closure or vm engine')
+
+profile = args.profile or args.profile_stacks is not None
+if profile and args.engine not in PROFILING_ENGINES:
+    parser.error(f"--profile is not supported by the '{args.engine}' engine")
+
+cache = None
+if args.cache_dir is not None:
+    cache = ProgramCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+lox_class = Lox
+if args.metrics is not None:
+    lox_class = InstrumentedLox
+
+lox = lox_class(scanner=args.scanner, parser=args.parser, cache=cache, engine=args.engine, memoize=args.memoize, profile=profile)
+
+def report_binary_stats():
+    for line, operator, state, hits, misses in lox.interpreter.binary_site_stats():
+        print(f'[line {line}] {operator} {state} hits={hits} misses={misses}', file=sys.stderr)
+
+def report_memo_stats():
+    for name, hits, misses, size in lox.interpreter.memo_stats():
+        print(f'{name}: hits={hits} misses={misses} entries={size}', file=sys.stderr)
+
+def report_profile():
+    profiler = lox.interpreter.profiler
+    if args.profile:
+        sys.stderr.write(profiler.report())
+    if args.profile_stacks is not None:
+        with open(args.profile_stacks, 'w') as f:
+            f.write(profiler.collapsed())
+
+def report_metrics():
+    if args.metrics == '-':
+        lox.dump_metrics(sys.stderr)
+    else:
+        with open(args.metrics, 'w') as f:
+            lox.dump_metrics(f)
+
+def report_samples():
+    with open(args.path, 'r') as f:
+        heatmap = sampler.heatmap(f.read())
+
+    if args.sample_output is None:
+        sys.stderr.write(heatmap)
+    else:
+        with open(args.sample_output, 'w') as f:
+            f.write(heatmap)
+
+def report_heap(signum=None, frame=None):
+    sys.stderr.write(heap.report())
+
+heap = None
+if args.heap_stats:
+    heap = HeapStats()
+    heap.start()
+    signal.signal(signal.SIGUSR1, report_heap)
+
+sampler = None
+if args.sample:
+    sampler = SamplingProfiler(args.sample_interval / 1000)
+    sampler.start()
+
+try:
+    if args.path is not None:
+        lox.run_file(args.path, stream=args.stream)
+    else:
+        lox.run_prompt()
+finally:
+    if sampler is not None:
+        sampler.stop()
+        report_samples()
+    if args.binary_stats:
+        report_binary_stats()
+    if args.memo_stats:
+        report_memo_stats()
+    if profile:
+        report_profile()
+    if args.metrics is not None:
+        report_metrics()
+    if heap is not None:
+        report_heap()
+        heap.stop()
\ No newline at end of file
@@ -1,5 +1,5 @@
 class RunTimeError(Exception):
-    def __init__(self, token, message):
+    def __init__(self, line, message):
         super().__init__(message)
 
-        self.token = token
\ No newline at end of file
+        self.line = line
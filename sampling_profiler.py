@@ -0,0 +1,102 @@
+import signal
+from collections import Counter
+
+from expression import Expression
+from statement import Statement
+from lox_function import LoxFunction
+from compiled_function import CompiledFunction
+from closure_compiler import ClosureCompiler
+from vm import VM
+
+ROOT = '<script>'
+
+BAR_WIDTH = 20
+
+LOX_FUNCTION_CODE = LoxFunction.run.__code__
+COMPILED_FUNCTION_CODES = (CompiledFunction.call.__code__, CompiledFunction.invoke.__code__)
+VM_CODE = VM.run.__code__
+CLOSURE_FILE = ClosureCompiler.visit_binary.__code__.co_filename
+
+class SamplingProfiler():
+    def __init__(self, interval=0.002):
+        self.interval = interval
+
+        self.samples = 0
+        self.lines = Counter()
+        self.functions = Counter()
+
+        self.previous = None
+
+    def start(self):
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous or signal.SIG_DFL)
+
+    def sample(self, signum, frame):
+        line, function = self.locate(frame)
+
+        self.samples += 1
+        self.functions[function] += 1
+        if line is not None:
+            self.lines[line] += 1
+
+    def locate(self, frame):
+        line = None
+
+        while frame is not None:
+            code = frame.f_code
+
+            if code is LOX_FUNCTION_CODE:
+                variables = frame.f_locals
+                declaration = variables.get('function', variables['self']).declaration
+                return line, f'{declaration.name}:{declaration.line}'
+
+            if code in COMPILED_FUNCTION_CODES:
+                declaration = frame.f_locals['self'].declaration
+                return line, f'{declaration.name}:{declaration.line}'
+
+            if code is VM_CODE and 'ip' in frame.f_locals:
+                variables = frame.f_locals
+                function = variables['closure'].function
+                if line is None:
+                    line = function.chunk.line_at(variables['ip'] - 1)
+                if function.name == 'script':
+                    return line, ROOT
+                return line, function.name
+
+            if line is None:
+                variables = frame.f_locals
+                node = variables.get('expr') or variables.get('stmt')
+                if isinstance(node, (Expression, Statement)):
+                    line = getattr(node, 'line', None)
+                elif code.co_filename == CLOSURE_FILE:
+                    line = variables.get('line')
+
+            frame = frame.f_back
+
+        return line, ROOT
+
+    def heatmap(self, source):
+        total = self.samples or 1
+        peak = max(self.lines.values(), default=1)
+
+        located = sum(self.lines.values())
+        lines = [f'{self.samples} samples every {self.interval * 1000:g} ms, '
+                 f'{self.samples - located} without a source line', '']
+        for number, text in enumerate(source.splitlines(), 1):
+            count = self.lines.get(number, 0)
+            if count:
+                bar = '#' * max(1, round(BAR_WIDTH * count / peak))
+                lines.append(f'{count:>7} {100 * count / total:5.1f}% {bar:<{BAR_WIDTH}} {number:>5}  {text}')
+            else:
+                lines.append(f'{"":>7} {"":>6} {"":<{BAR_WIDTH}} {number:>5}  {text}')
+
+        lines.append('')
+        lines.append(f'{"samples":>7} {"share":>6}  function')
+        for function, count in self.functions.most_common():
+            lines.append(f'{count:>7} {100 * count / total:5.1f}%  {function}')
+
+        return '\n'.join(lines) + '\n'
@@ -1,5 +1,7 @@
+import sys
+
 from token_type import TokenType
-from token import Token
+from lox_token import Token
 
 class Scanner():
     KEYWORDS = {
@@ -129,7 +131,7 @@ class Scanner():
         self.advance()
 
         value = self.source[self.start+1:self.current-1]
-        self.add_token(TokenType.STRING, value)
+        self.add_token(TokenType.STRING, sys.intern(value))
 
     def is_digit(self, c: str):
         return (c in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9'])
@@ -168,7 +170,8 @@ class Scanner():
         try:
             token_type = self.KEYWORDS[text]
         except KeyError:
-            token_type = TokenType.IDENTIFIER
+            self.tokens.append(Token(TokenType.IDENTIFIER, sys.intern(text), None, self.line))
+            return
         
         self.add_token(token_type)
     
\ No newline at end of file
@@ -0,0 +1,24 @@
+class Shape():
+    __slots__ = ('indices', 'transitions')
+
+    def __init__(self, indices):
+        self.indices = indices
+
+        self.transitions = {}
+
+    def add(self, name):
+        try:
+            return self.transitions[name]
+        except KeyError:
+            pass
+
+        indices = dict(self.indices)
+        indices[name] = len(indices)
+
+        shape = Shape(indices)
+        self.transitions[name] = shape
+
+        return shape
+
+
+EMPTY_SHAPE = Shape({})
@@ -0,0 +1,23 @@
+class SlotEnvironment():
+    __slots__ = ('enclosing', 'values')
+
+    def __init__(self, enclosing, values):
+        self.enclosing = enclosing
+
+        self.values = values
+
+    def get_at(self, distance, slot):
+        environment = self
+        while distance:
+            environment = environment.enclosing
+            distance -= 1
+
+        return environment.values[slot]
+
+    def assign_at(self, distance, slot, value):
+        environment = self
+        while distance:
+            environment = environment.enclosing
+            distance -= 1
+
+        environment.values[slot] = value
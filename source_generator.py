@@ -0,0 +1,108 @@
+def nested_unit(index, depth):
+    lines = [f'fun nested{index}(n) {{', '  var v0 = n;']
+
+    indent = '  '
+    for level in range(1, depth + 1):
+        if level % 3 == 0:
+            lines.append(f'{indent}while (v{level - 1} > {level}) {{')
+        elif level % 3 == 1:
+            lines.append(f'{indent}if (v{level - 1} != {level}) {{')
+        else:
+            lines.append(f'{indent}{{')
+        indent += '  '
+        lines.append(f'{indent}var v{level} = v{level - 1} - 1;')
+
+    lines.append(f'{indent}n = n + v{depth} + v0;')
+    for level in range(depth, 0, -1):
+        indent = indent[2:]
+        if level % 3 == 0:
+            lines.append(f'{indent}  v{level - 1} = 0;')
+        lines.append(f'{indent}}}')
+
+    lines.append('  return n;')
+    lines.append('}')
+    lines.append(f'print nested{index}({depth});')
+
+    return '\n'.join(lines) + '\n'
+
+def functions_unit(index, count):
+    lines = []
+
+    for offset in range(count):
+        name = f'f{index}_{offset}'
+        lines.append(f'fun {name}(a, b) {{ var c = a + b; return c * 2 - a; }}')
+
+    calls = ' + '.join(f'f{index}_{offset}({offset}, {index})' for offset in range(count))
+    lines.append(f'var total{index} = {calls};')
+    lines.append(f'print total{index};')
+
+    return '\n'.join(lines) + '\n'
+
+def expressions_unit(index, width):
+    arithmetic = []
+    logical = []
+
+    for offset in range(width):
+        if offset % 3 == 0:
+            arithmetic.append(f'(x{index} + {offset})')
+            logical.append(f'x{index} > {offset}')
+        elif offset % 3 == 1:
+            arithmetic.append(f'{offset}.5 * y{index}')
+            logical.append(f'!(y{index} <= {offset})')
+        else:
+            arithmetic.append(f'-(y{index} / {offset + 1})')
+            logical.append(f'"e{offset}" == "e" + "{offset}"')
+
+    lines = [
+        f'var x{index} = {index};',
+        f'var y{index} = {index + 1};',
+        f'var e{index} = ' + ' - '.join(arithmetic) + ';',
+        f'var l{index} = ' + ' and '.join(logical) + ' or nil == false;',
+        f'print l{index} == (e{index} > 0);',
+    ]
+
+    return '\n'.join(lines) + '\n'
+
+def classes_unit(index, depth):
+    lines = [
+        f'class C{index}_0 {{',
+        '  init(value) { this.value = value; }',
+        '  get() { return this.value; }',
+        '}',
+    ]
+
+    for level in range(1, depth + 1):
+        name = f'C{index}_{level}'
+        lines.append(f'class {name} < C{index}_{level - 1} {{')
+        lines.append(f'  init(value) {{ super.init(value + 1); this.f{level} = value; }}')
+        lines.append(f'  get() {{ return super.get() + this.f{level}; }}')
+        lines.append(f'  m{level}(other) {{ return this.get() + other.get(); }}')
+        lines.append('}')
+
+    lines.append(f'var o{index} = C{index}_{depth}(1);')
+    lines.append(f'print o{index}.m{depth}(o{index});')
+
+    return '\n'.join(lines) + '\n'
+
+SHAPES = {
+    'nested': (nested_unit, 40),
+    'functions': (functions_unit, 50),
+    'expressions': (expressions_unit, 200),
+    'classes': (classes_unit, 20),
+}
+
+def generate(shape, size, parameter=None):
+    unit, default = SHAPES[shape]
+    if parameter is None:
+        parameter = default
+
+    chunks = []
+    length = 0
+    index = 0
+    while length < size:
+        chunk = unit(index, parameter)
+        chunks.append(chunk)
+        length += len(chunk)
+        index += 1
+
+    return ''.join(chunks)
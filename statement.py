@@ -1,8 +1,12 @@
 class Statement():
+    __slots__ = ()
+
     def accept(self, visitor):
         raise NotImplemented
 
 class ExpressionStatement(Statement):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -10,6 +14,8 @@ class ExpressionStatement(Statement):
         return visitor.visit_expression_statement(self)
 
 class PrintStatement(Statement):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -17,61 +23,86 @@ class PrintStatement(Statement):
         return visitor.visit_print_statement(self)
 
 class VarStatement(Statement):
-    def __init__(self, name, initializer):
+    __slots__ = ('name', 'initializer', 'line', 'slot')
+
+    def __init__(self, name, initializer, line):
         self.name = name
         self.initializer = initializer
+        self.line = line
+
+        self.slot = None
 
     def accept(self, visitor):
-        visitor.visit_var_statement(self)
+        return visitor.visit_var_statement(self)
 
 class BlockStatement(Statement):
+    __slots__ = ('statements', 'slot_count')
+
     def __init__(self, statements):
         self.statements = statements
 
+        self.slot_count = 0
+
     def accept(self, visitor):
-        visitor.visit_block_statement(self)
+        return visitor.visit_block_statement(self)
 
 class IfStatement(Statement):
+    __slots__ = ('condition', 'then_branch', 'else_branch')
+
     def __init__(self, condition, then_branch, else_branch):
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
 
     def accept(self, visitor):
-        visitor.visit_if_statement(self)
+        return visitor.visit_if_statement(self)
 
 class WhileStatement(Statement):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
 
     def accept(self, visitor):
-        visitor.visit_while_statement(self)
+        return visitor.visit_while_statement(self)
 
 class FunctionStatement(Statement):
-    def __init__(self, name, parameters, body):
+    __slots__ = ('name', 'parameters', 'body', 'line', 'slot', 'slot_count', 'pure')
+
+    def __init__(self, name, parameters, body, line):
         self.name = name
         self.parameters = parameters
         self.body = body
+        self.line = line
+
+        self.slot = None
+        self.slot_count = len(parameters)
+        self.pure = False
 
     def accept(self, visitor):
-        visitor.visit_function_statement(self)
+        return visitor.visit_function_statement(self)
 
 class ReturnStatement(Statement):
-    def __init__(self, keyword, value):
-        self.keyword = keyword
+    __slots__ = ('value', 'line')
+
+    def __init__(self, value, line):
         self.value = value
+        self.line = line
 
     def accept(self, visitor):
-        visitor.visit_return_statement(self) 
+        return visitor.visit_return_statement(self)
 
 class ClassStatement(Statement):
-    def __init__(self, name, superclass, methods):
+    __slots__ = ('name', 'superclass', 'methods', 'line', 'slot')
+
+    def __init__(self, name, superclass, methods, line):
         self.name = name
         self.superclass = superclass
         self.methods = methods
+        self.line = line
 
-    def accept(self, visitor):
-        visitor.visit_class_statement(self) 
-
+        self.slot = None
 
+    def accept(self, visitor):
+        return visitor.visit_class_statement(self)
@@ -0,0 +1,39 @@
+from token_type import TokenType
+from lox_token import Token
+from fast_scanner import FastScanner
+from token_buffer import TokenBuffer
+
+class StreamScanner(FastScanner):
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, lox, file, chunk_size=CHUNK_SIZE):
+        super().__init__(lox, '')
+
+        self.file = file
+        self.chunk_size = chunk_size
+
+    def scan_tokens(self):
+        pending = ''
+        at_end = False
+
+        while not at_end:
+            chunk = self.file.read(self.chunk_size)
+            at_end = (chunk == '')
+
+            text = pending + chunk
+            if at_end:
+                cut = len(text)
+            else:
+                cut = text.rfind('\n') + 1
+                if cut == 0:
+                    pending = text
+                    continue
+
+            piece = text[:cut]
+            buffer = TokenBuffer(piece)
+            stop, self.line = self.scan_into(buffer, piece, 0, self.line, at_end)
+            pending = piece[stop:] + text[cut:]
+
+            yield from buffer
+
+        yield Token(TokenType.EOF, '', None, self.line)
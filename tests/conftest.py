@@ -0,0 +1,22 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lox import Lox
+
+@pytest.fixture
+def run_lox():
+    def run(source, engine='tree', **options):
+        lox = Lox(engine=engine, **options)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            lox.run(source)
+
+        return output.getvalue()
+
+    return run
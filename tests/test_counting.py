@@ -0,0 +1,60 @@
+import contextlib
+import io
+
+from instrumented_lox import InstrumentedLox
+
+def counters(source, **options):
+    lox = InstrumentedLox(**options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        lox.run(source)
+
+    return lox.metrics()['counters']
+
+def test_tail_calls_are_counted_as_calls():
+    tail = counters('''
+fun count(n) { if (n == 0) return 0; return count(n - 1); }
+count(30);
+''')
+    plain = counters('''
+fun count(n) { if (n == 0) return 0; var r = count(n - 1); return r; }
+count(30);
+''')
+
+    assert tail['calls'] == plain['calls'] == 31
+    assert tail['tail_calls'] == 30
+
+def test_tail_method_calls_are_counted():
+    result = counters('''
+class Walker {
+  walk(n) { if (n == 0) return 0; return this.walk(n - 1); }
+}
+Walker().walk(50);
+''')
+
+    assert result['calls'] == 52
+
+def test_memoised_tail_calls_are_counted():
+    result = counters('''
+fun count(n) { if (n == 0) return 0; return count(n - 1); }
+count(20);
+count(20);
+''', memoize=64)
+
+    assert result['calls'] == 21 + 1
+
+def test_memo_hits_are_counted_on_every_call_path():
+    result = counters('''
+fun square(n) { return n * n; }
+fun count(n) { if (n == 0) return 0; return count(n - 1); }
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) total = total + square(3);
+count(5);
+count(5);
+''', memoize=64)
+
+    assert result['memo_hits'] == 9 + 1
+
+def test_every_visited_node_is_counted():
+    result = counters('var a = 1; print a + 2;')
+
+    assert result['nodes'] == 6
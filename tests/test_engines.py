@@ -0,0 +1,66 @@
+import glob
+import os
+
+import pytest
+
+from lox import ENGINES
+from source_generator import generate
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CONFORMANCE = sorted(glob.glob(os.path.join(os.path.dirname(HERE), 'conformance', '*.lox')))
+
+OTHER_ENGINES = [engine for engine in ENGINES if engine != 'tree']
+
+def read(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+def long_sum(terms):
+    return 'var x = 1;\nprint ' + ' + '.join(['x'] * terms) + ';\n'
+
+def long_chain(terms):
+    operands = ' - '.join(f'{i} * x' for i in range(terms))
+    return f'var x = 2;\nprint {operands};\nprint {" or ".join(["nil"] * terms)} or "last";\n'
+
+def long_nesting(depth):
+    return 'var x = 3;\nprint ' + '(' * depth + 'x' + ' + 1)' * depth + ';\n'
+
+EDGE_CASES = {
+    'signed_zero': '''
+print -0;
+print 0 * -1;
+print -0 == 0;
+var zero = 0;
+var negative = -0;
+print negative;
+print -zero;
+fun id(x) { return x; }
+print id(-0);
+print id(0);
+print id(-0);
+''',
+    'long_sum': long_sum(200),
+    'long_chain': long_chain(200),
+    'long_nesting': long_nesting(60),
+    'wide_call': 'fun f(' + ', '.join(f'p{i}' for i in range(255)) + ') { return p0 + p254; }\n'
+                 'print f(' + ', '.join(str(i) for i in range(255)) + ');\n',
+    'too_many_arguments': 'fun f() {}\nf(' + ', '.join('1' for _ in range(256)) + ');\n',
+    'expressions_shape': generate('expressions', 4096),
+}
+
+@pytest.mark.parametrize('name', EDGE_CASES)
+@pytest.mark.parametrize('engine', OTHER_ENGINES)
+def test_edge_case_matches_tree(run_lox, engine, name):
+    source = EDGE_CASES[name]
+
+    assert run_lox(source, engine=engine) == run_lox(source)
+
+def test_signed_zero_is_preserved(run_lox):
+    assert run_lox('print -0; print 0; print 0 * -1;') == '-0\n0\n-0\n'
+
+@pytest.mark.parametrize('path', CONFORMANCE, ids=os.path.basename)
+@pytest.mark.parametrize('engine', OTHER_ENGINES)
+def test_conformance_program_matches_tree(run_lox, engine, path):
+    source = read(path)
+
+    assert run_lox(source, engine=engine) == run_lox(source)
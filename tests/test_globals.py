@@ -0,0 +1,82 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from scanner import Scanner
+from parser import Parser
+from resolver import Resolver
+from global_table import GlobalTable, UNDEFINED
+from run_time_error import RunTimeError
+
+def resolve(lox, source):
+    statements = Parser(lox, Scanner(lox, source).scan_tokens()).parse()
+    Resolver(lox, lox.interpreter).resolve_statements(statements)
+
+    return statements
+
+def test_resolution_is_stored_on_the_nodes():
+    lox = Lox()
+    [_, block] = resolve(lox, 'var a = 1; { var b = a; print b; }')
+    declaration, stmt = block.statements
+
+    assert (declaration.initializer.depth, declaration.initializer.slot) == (None, lox.interpreter.globals.index('a'))
+    assert (stmt.expression.depth, stmt.expression.slot) == (0, 0)
+    assert not hasattr(lox.interpreter, 'locals')
+
+def test_repeated_runs_reuse_global_indices():
+    lox = Lox()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(100):
+            lox.run('var a = 1; { var b = a; print b; }')
+
+    assert lox.interpreter.globals.names == ['clock', 'a']
+
+def test_global_table_indices_are_stable():
+    table = GlobalTable()
+
+    assert table.index('a') == 0
+    assert table.index('b') == 1
+    assert table.index('a') == 0
+    assert table.values == [UNDEFINED, UNDEFINED]
+    assert table.adopt(['a', 'b', 'c'])
+    assert not table.adopt(['b'])
+
+def test_undefined_globals_raise_with_their_name():
+    table = GlobalTable()
+    index = table.index('missing')
+
+    with pytest.raises(RunTimeError, match="Undefined variable 'missing'"):
+        table.get(index, 3)
+    with pytest.raises(RunTimeError, match="Undefined variable 'missing'"):
+        table.assign(index, 1.0, 3)
+
+    table.define('missing', 1.0)
+    table.assign(index, 2.0, 3)
+
+    assert table.get(index, 3) == 2.0
+
+GLOBALS = '''
+fun first() { return second(); }
+fun second() { return "second"; }
+print first();
+var a = 1;
+var a = a + 1;
+print a;
+a = a * 10;
+print a;
+fun shadow() { var a = "local"; return a; }
+print shadow();
+print a;
+print late;
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_globals_bind_late_and_report_undefined_names(run_lox, engine):
+    assert run_lox(GLOBALS, engine=engine) == (
+        "second\n2\n20\nlocal\n20\n[13] RunTimeError: Undefined variable 'late'\n")
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_assigning_an_undefined_global_is_an_error(run_lox, engine):
+    assert run_lox('print 1;\nnope = 2;', engine=engine) == "1\n[2] RunTimeError: Undefined variable 'nope'\n"
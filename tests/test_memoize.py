@@ -0,0 +1,34 @@
+import pytest
+
+PROGRAMS = [
+    '''
+fun id(x) { return x; }
+print id(0);
+print id(-0);
+print id(-0);
+print id(0);
+''',
+    '''
+fun same(a, b) { return a == b; }
+print same(1, 1);
+print same(true, 1);
+print same(1, true);
+print same(nil, false);
+print same("a", "a");
+''',
+    '''
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+print fib(20);
+print fib(-0);
+''',
+    '''
+fun count(n, acc) { if (n == 0) return acc; return count(n - 1, acc + 1); }
+print count(500, 0);
+print count(500, -0);
+''',
+]
+
+@pytest.mark.parametrize('source', PROGRAMS)
+@pytest.mark.parametrize('size', [1, 2, 64])
+def test_memoized_output_matches_plain_run(run_lox, source, size):
+    assert run_lox(source, memoize=size) == run_lox(source)
@@ -0,0 +1,106 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from lox_class import LoxClass
+from interpreter import POLYMORPHIC_LIMIT
+from expression import Call, Get
+from bench_parser import children
+
+def compile_and_run(source):
+    lox = Lox()
+    program = lox.compile(source)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lox.execute(program)
+
+    return program, output.getvalue()
+
+def method_calls(statements):
+    found = []
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (list, tuple)):
+            pending.extend(node)
+        elif hasattr(node, '__slots__'):
+            if type(node) is Call and type(node.callee) is Get:
+                found.append(node)
+            pending.extend(children(node))
+
+    return found
+
+def classes(count):
+    return ''.join(f'class C{i} {{ name() {{ return "C{i}"; }} }}\n' for i in range(count))
+
+def test_method_table_is_flattened():
+    base = LoxClass('Base', None, {'init': 'base init', 'a': 'base a', 'b': 'base b'})
+    derived = LoxClass('Derived', base, {'b': 'derived b', 'c': 'derived c'})
+
+    assert derived.method_table == {'init': 'base init', 'a': 'base a', 'b': 'derived b', 'c': 'derived c'}
+    assert derived.initializer == 'base init'
+    assert derived.lookup_method('a') == 'base a'
+    assert derived.lookup_method('missing') is None
+
+def test_monomorphic_site_caches_one_class():
+    program, output = compile_and_run(classes(1) + 'for (var i = 0; i < 3; i = i + 1) print C0().name();')
+    [call] = method_calls(program)
+
+    assert output == 'C0\n' * 3
+    assert call.cached_class.name == 'C0'
+    assert call.method_cache is None
+
+def test_polymorphic_site_is_bounded():
+    count = POLYMORPHIC_LIMIT + 3
+    source = classes(count) + 'fun name(o) { return o.name(); }\n'
+    source += ''.join(f'print name(C{i}());\n' for i in range(count)) * 2
+    program, output = compile_and_run(source)
+    [call] = method_calls(program)
+
+    assert output == ''.join(f'C{i}\n' for i in range(count)) * 2
+    assert call.cached_class.name == 'C0'
+    assert len(call.method_cache) == POLYMORPHIC_LIMIT
+
+DISPATCH = '''
+class Shape {
+  init(size) { this.size = size; }
+  area() { return 0; }
+  describe() { return this.kind(); }
+  kind() { return "shape"; }
+}
+class Square < Shape {
+  area() { return this.size * this.size; }
+  kind() { return "square"; }
+}
+class Circle < Shape {
+  area() { return 3 * this.size * this.size; }
+  kind() { return "circle"; }
+}
+class Dot < Shape {
+  describe() { return "dot and " + super.describe(); }
+}
+fun show(shape) { print shape.describe(); print shape.area(); }
+for (var i = 0; i < 8; i = i + 1) {
+  if (i / 4 < 1) show(Square(i)); else show(Circle(i));
+  show(Dot(i));
+}
+var s = Square(2);
+fun replacement() { return "field"; }
+s.kind = replacement;
+print s.kind();
+show(s);
+s.area = nil;
+print s.area;
+s.area();
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_dispatch_matches_tree(run_lox, engine):
+    assert run_lox(DISPATCH, engine=engine) == run_lox(DISPATCH)
+
+def test_fields_shadow_cached_methods(run_lox):
+    output = run_lox(DISPATCH).splitlines()
+
+    assert output[-5:] == ['field', 'field', '4', 'nil', '[31] RunTimeError: can only call functions and methods']
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from lox import ENGINES, PARSERS
+
+RUN_LOX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'run_lox.py')
+
+def run_file(tmp_path, source, *options):
+    path = tmp_path / 'program.lox'
+    path.write_text(source)
+    result = subprocess.run([sys.executable, RUN_LOX, *options, str(path)], capture_output=True, text=True)
+
+    return result.returncode, result.stdout, result.stderr
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('parser', PARSERS)
+def test_deep_chain_is_reported_as_a_compile_error(tmp_path, parser, engine):
+    source = 'var x = 1;\nprint ' + ' + '.join(['x'] * 3000) + ';\n'
+
+    assert run_file(tmp_path, source, '--parser', parser, '--engine', engine) == (
+        65, '[0] Error: Cannot compile program: expression nesting is too deep\n', '')
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_deep_chain_is_reported_in_stream_mode(tmp_path, parser):
+    source = 'var x = 1;\nprint x;\nprint ' + ' + '.join(['x'] * 3000) + ';\n'
+
+    assert run_file(tmp_path, source, '--parser', parser, '--stream') == (
+        65, '1\n[0] Error: Cannot compile program: expression nesting is too deep\n', '')
+
+@pytest.mark.parametrize('engine', ['tree', 'closure', 'python'])
+def test_deep_recursion_is_reported_as_a_stack_overflow(tmp_path, engine):
+    source = 'fun f(n) { if (n == 0) return 0; return 1 + f(n - 1); }\nprint f(100000);\n'
+
+    assert run_file(tmp_path, source, '--engine', engine) == (70, '[0] RunTimeError: Stack overflow\n', '')
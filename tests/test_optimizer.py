@@ -0,0 +1,131 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from scanner import Scanner
+from parser import Parser
+from resolver import Resolver
+from optimizer import Optimizer
+from purity_analyzer import PurityAnalyzer
+from expression import Binary, Literal
+from statement import FunctionStatement, PrintStatement, ReturnStatement
+
+PROGRAMS = [
+    '''
+print 1 + 2 * 3 - 4 / 8;
+print (1 + 2) * (3 - 4) / -(5 - 7);
+print "con" + "cat" + "enated";
+print 1 < 2 == !(3 >= 4);
+print 1 == "1";
+print nil == nil;
+print !nil;
+print -0 * 1;
+print 0 * -1;
+''',
+    '''
+fun side(value) { print "side " + value; return value; }
+print false and side("and");
+print true or side("or");
+print nil or side("nil");
+print true and side("true");
+print 1 and 2 or side("never");
+''',
+    '''
+fun early(n) {
+  if (n > 0) return "positive";
+  return "other";
+  print "unreachable";
+}
+print early(1);
+print early(-1);
+if (false) print "dead"; else print "else";
+if (true) print "live"; else print "dead";
+if (nil) { var hidden = 1; print hidden; }
+while (false) print "never";
+{
+  var x = 1;
+  if (1 == 1) { var x = 2; print x; }
+  print x;
+}
+''',
+    '''
+fun loop() {
+  for (var i = 0; i < 3; i = i + 1) {
+    if (i == 1) return i * (2 + 3);
+  }
+  return -1;
+}
+print loop();
+class A {
+  value() {
+    return 2 * 21;
+    print "unreachable";
+  }
+}
+print A().value();
+''',
+    '''
+print 1 + "a";
+''',
+]
+
+class UnoptimizedLox(Lox):
+    def optimize(self, statements):
+        PurityAnalyzer().analyze(statements)
+
+        return statements
+
+def run(lox, source):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lox.run(source)
+
+    return output.getvalue(), lox.had_error, lox.had_runtime_error
+
+def optimize(source):
+    lox = Lox()
+    statements = Parser(lox, Scanner(lox, source).scan_tokens()).parse()
+    Resolver(lox, lox.interpreter).resolve_statements(statements)
+
+    return Optimizer(lox.interpreter).optimize_statements(statements)
+
+@pytest.mark.parametrize('source', PROGRAMS)
+@pytest.mark.parametrize('engine', ENGINES)
+def test_optimized_program_behaves_like_the_original(engine, source):
+    assert run(Lox(engine=engine), source) == run(UnoptimizedLox(engine=engine), source)
+
+def test_constant_expressions_are_folded():
+    statements = optimize('print (1 + 2) * 3 - -1; print "a" + "b"; print !(1 < 2);')
+
+    assert [stmt.expression.value for stmt in statements] == [10.0, 'ab', False]
+    assert all(isinstance(stmt.expression, Literal) for stmt in statements)
+
+def test_division_by_zero_is_not_folded():
+    [stmt] = optimize('print 1 / 0;')
+
+    assert isinstance(stmt.expression, Binary)
+
+def test_mixed_operands_are_not_folded():
+    [stmt] = optimize('print 1 + "a";')
+
+    assert isinstance(stmt.expression, Binary)
+
+def test_unreachable_statements_are_removed():
+    [function, stmt] = optimize('''
+fun f() { return 1; print "dead"; }
+print "live";
+if (false) print "dead";
+while (false) print "dead";
+nil;
+''')
+
+    assert isinstance(function, FunctionStatement)
+    assert [type(body) for body in function.body] == [ReturnStatement]
+    assert isinstance(stmt, PrintStatement)
+
+def test_statements_after_a_top_level_return_branch_are_kept():
+    statements = optimize('fun f(n) { if (n) return 1; return 2; }')
+
+    assert len(statements[0].body) == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from lox import Lox, PARSERS
+from scanner import Scanner
+from token_stream import TokenStream
+from bench_scanner import SAMPLE
+from bench_parser import same_tree, count_nodes
+from source_generator import SHAPES, generate
+
+SOURCES = [
+    SAMPLE,
+    'print 1 + 2 * 3 - 4 / 5 < 6 == !(7 >= -8);',
+    'print a or b and c or !d;',
+    'a = b = c.d = e;',
+    'print f(1)(2, g(3))(h.i(j).k);',
+    'print ((((1))));',
+    'print -(-(--1));',
+    'class A < B { m(a, b) { return super.m(this.x, b); } }',
+    'for (var i = 0; i < 3; i = i + 1) { if (i == 1) print i; else print -i; }',
+    'for (;;) { while (true) { return; } }',
+    'fun outer() { fun inner(x) { return x; } return inner; }',
+] + [generate(shape, 4096) for shape in SHAPES]
+
+ERRORS = [
+    'print 1 +;',
+    'a + b = c;',
+    'print f(1, 2;',
+    'var = 1;',
+    'class { }',
+    'print (1;',
+]
+
+def parse(name, source, stream=False):
+    lox = Lox()
+    tokens = Scanner(lox, source).scan_tokens()
+    if stream:
+        tokens = TokenStream(tokens)
+    statements = PARSERS[name](lox, tokens).parse()
+
+    return statements, lox.had_error
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('stream', [False, True])
+def test_pratt_parser_builds_the_same_tree(source, stream):
+    expected, expected_error = parse('recursive', source)
+    statements, had_error = parse('pratt', source, stream)
+
+    assert not expected_error and not had_error
+    assert count_nodes(statements) == count_nodes(expected)
+    assert same_tree(statements, expected)
+
+@pytest.mark.parametrize('source', ERRORS)
+def test_pratt_parser_reports_the_same_errors(capsys, source):
+    parse('recursive', source)
+    expected = capsys.readouterr().out
+    parse('pratt', source)
+
+    assert expected != ''
+    assert capsys.readouterr().out == expected
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_long_expressions_evaluate_under_both_parsers(run_lox, parser):
+    chain = 'var x = 1;\nprint ' + ' + '.join(['x'] * 200) + ';\n'
+    nesting = 'var x = 3;\nprint ' + '(' * 60 + 'x' + ' + 1)' * 60 + ';\n'
+
+    assert run_lox(chain, parser=parser) == '200\n'
+    assert run_lox(nesting, parser=parser) == '63\n'
+
+def test_pratt_parser_does_not_recurse_on_long_chains():
+    source = 'print ' + ' + '.join(['1'] * 5000) + ';'
+    statements, had_error = parse('pratt', source)
+
+    assert not had_error
+    assert count_nodes(statements) == 2 * 5000
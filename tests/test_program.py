@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from program import Program
+from expression import Expression, NumberBinary, StringBinary, GenericBinary
+from statement import Statement
+from bench_parser import children
+
+SOURCE = '''
+for (var i = 0; i < count; i = i + 1) {
+  print label + "-" + "item";
+}
+'''
+
+@pytest.mark.parametrize('engine', ['tree', 'closure', 'vm', 'python'])
+def test_contexts_run_concurrently(engine):
+    program = Program(SOURCE, engine=engine)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def evaluate(label):
+        context = program.context()
+        barrier.wait()
+        results[label] = [context.run(label=label, count=200) for _ in range(20)]
+
+    threads = [threading.Thread(target=evaluate, args=(label,)) for label in ('left', 'right')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for label in ('left', 'right'):
+        assert results[label] == [f'{label}-item\n' * 200] * 20
+
+@pytest.mark.parametrize('engine', ['tree', 'closure', 'vm', 'python'])
+def test_context_output_does_not_reach_stdout(engine, capsys):
+    context = Program('print greeting;', engine=engine).context()
+
+    assert context.run(greeting='hello') == 'hello\n'
+    assert context.run(greeting='again') == 'again\n'
+    assert capsys.readouterr().out == ''
+
+SPECIALISING = '''
+class Point {
+  init(x, y) { this.x = x; this.y = y; }
+  sum() { return this.x + this.y; }
+}
+var p = Point(x, 1);
+print p.sum();
+'''
+
+def specialised(statements):
+    found = []
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (list, tuple)):
+            pending.extend(node)
+        elif isinstance(node, (Expression, Statement)):
+            if type(node) in (NumberBinary, StringBinary, GenericBinary):
+                found.append(node)
+            for name in ('cached_class', 'cached_shape'):
+                if getattr(node, name, None) is not None:
+                    found.append(node)
+            pending.extend(children(node))
+
+    return found
+
+def test_contexts_do_not_share_specialised_nodes():
+    program = Program(SPECIALISING)
+    first = program.context()
+
+    assert first.run(x=2) == '3\n'
+    assert specialised(first.program)
+
+    second = program.context()
+
+    assert second.program is not first.program
+    assert specialised(second.program) == []
+    assert second.run(x=4) == '5\n'
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+import program_cache
+from lox import Lox, ENGINES
+from program_cache import ProgramCache
+
+SOURCE = '''
+class Counter {
+  init() { this.count = 0; }
+  add(n) { this.count = this.count + n; return this; }
+}
+fun twice(f, x) { return f(f(x)); }
+fun inc(x) { return x + 1; }
+var c = Counter().add(2).add(twice(inc, 3));
+print c.count;
+print "done" + "!";
+'''
+
+def run(source, engine, cache):
+    lox = Lox(engine=engine, cache=cache)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lox.run(source)
+
+    return output.getvalue()
+
+def cached_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(ProgramCache.SUFFIX)]
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_cached_program_runs_like_a_fresh_compile(tmp_path, engine):
+    cache = ProgramCache(str(tmp_path))
+    expected = run(SOURCE, engine, None)
+
+    assert cache.load(SOURCE, engine) is None
+    assert run(SOURCE, engine, cache) == expected
+    assert cache.load(SOURCE, engine) is not None
+    assert run(SOURCE, engine, cache) == expected
+    assert len(cached_files(tmp_path)) == 1
+
+def test_entries_are_keyed_by_source_and_engine(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    run(SOURCE, 'tree', cache)
+
+    assert cache.load(SOURCE, 'vm') is None
+    assert cache.load(SOURCE + '\n', 'tree') is None
+    assert cache.load(SOURCE, 'tree') is not None
+
+def test_format_version_change_invalidates_entries(tmp_path, monkeypatch):
+    cache = ProgramCache(str(tmp_path))
+    run(SOURCE, 'tree', cache)
+
+    monkeypatch.setattr(program_cache, 'FORMAT_VERSION', program_cache.FORMAT_VERSION + 1)
+
+    assert cache.load(SOURCE, 'tree') is None
+
+def test_corrupt_entry_is_removed(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    expected = run(SOURCE, 'tree', cache)
+    path = cache.path(cache.key(SOURCE, 'tree'))
+    with open(path, 'wb') as f:
+        f.write(b'not a pickle')
+
+    assert cache.load(SOURCE, 'tree') is None
+    assert not os.path.exists(path)
+    assert run(SOURCE, 'tree', cache) == expected
+
+def test_failed_compile_is_not_cached(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    run('print 1 +;', 'tree', cache)
+
+    assert cached_files(tmp_path) == []
+
+def test_eviction_keeps_the_cache_under_its_limit(tmp_path):
+    cache = ProgramCache(str(tmp_path))
+    sources = [SOURCE + f'print {i};' for i in range(4)]
+    for source in sources:
+        run(source, 'tree', cache)
+    size = max(os.path.getsize(os.path.join(tmp_path, name)) for name in cached_files(tmp_path))
+
+    cache = ProgramCache(str(tmp_path), max_bytes=2 * size)
+    cache.evict()
+
+    assert len(cached_files(tmp_path)) <= 2
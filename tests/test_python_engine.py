@@ -0,0 +1,51 @@
+import pytest
+
+CALLS = [
+    '''
+fun side(x) { print "side " + x; return x; }
+fun two(a, b) { return a + b; }
+two(side("one"));
+''',
+    '''
+class A { init(x) { this.x = x; } m(a) { return a; } }
+class B < A {}
+print B(1).x;
+var m = A(2).m;
+print m(3);
+B();
+''',
+    '''
+class C {}
+print C();
+C(1);
+''',
+    '''
+class A { m(a, b) { return a; } }
+A().m(1);
+''',
+    'print clock(1);',
+    'var x = "str";\nx(1, 2);',
+    'var x = nil;\nx();',
+    '''
+class A {}
+A().field = 1;
+var a = A();
+a.field = a;
+a.field(1);
+''',
+]
+
+@pytest.mark.parametrize('source', CALLS)
+def test_call_errors_match_tree(run_lox, source):
+    assert run_lox(source, engine='python') == run_lox(source)
+
+def test_arity_error_reports_the_call_line(run_lox):
+    source = 'fun f(a) { return a; }\nprint f(1);\nprint f(\n  1,\n  2);\n'
+
+    assert run_lox(source, engine='python') == '1\n[5] RunTimeError: Expected 1 arguments but got 2\n'
+
+def test_long_chain_is_hoisted_into_helpers(run_lox):
+    operands = ' - '.join(f'{i} * x' for i in range(200))
+    source = f'var x = 2;\nprint {operands};\n'
+
+    assert run_lox(source, engine='python') == '-39800\n'
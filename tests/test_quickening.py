@@ -0,0 +1,78 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from interpreter import QUICKEN_LIMIT
+from expression import Binary
+
+def run(source):
+    lox = Lox()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lox.run(source)
+
+    return lox.interpreter.binary_site_stats(), output.getvalue()
+
+def test_number_site_is_specialised():
+    stats, output = run('var t = 0; for (var i = 0; i < 10; i = i + 1) t = t + i; print t;')
+
+    assert output == '45\n'
+    assert (1, 'PLUS', 'NumberBinary', 9, 0) in stats
+    assert (1, 'LESS', 'NumberBinary', 10, 0) in stats
+
+def test_string_site_is_specialised():
+    stats, output = run('var s = ""; for (var i = 0; i < 3; i = i + 1) s = s + "ab"; print s;')
+
+    assert output == 'ababab\n'
+    assert (1, 'PLUS', 'StringBinary', 2, 0) in stats
+
+def test_site_that_changes_type_is_requickened():
+    stats, output = run('''
+fun add(a, b) { return a + b; }
+print add(1, 2);
+print add(3, 4);
+print add("a", "b");
+print add("c", "d");
+''')
+
+    assert output == '3\n7\nab\ncd\n'
+    assert stats == [(2, 'PLUS', 'StringBinary', 1, 1)]
+
+def test_megamorphic_site_gives_up():
+    values = ['1, 2', '"a", "b"'] * QUICKEN_LIMIT + ['5, 6']
+    source = 'fun add(a, b) { return a + b; }\n' + ''.join(f'print add({pair});\n' for pair in values)
+    stats, output = run(source)
+
+    assert output.split()[-1] == '11'
+    assert stats == [(1, 'PLUS', 'GenericBinary', 0, QUICKEN_LIMIT)]
+
+def test_unspecialisable_operator_skips_quickening():
+    stats, output = run('var n = 0; for (var i = 0; i < 3; i = i + 1) if (i == 1) n = n + 1; print n;')
+
+    assert output == '1\n'
+    assert all(operator != 'EQUAL_EQUAL' for _, operator, _, _, _ in stats)
+
+def test_quickened_site_still_reports_type_errors():
+    _, output = run('fun neg(a, b) { return a - b; }\nprint neg(3, 1);\nprint neg(3, "x");\n')
+
+    assert output == '2\n[1] RunTimeError: Operands must be numbers\n'
+
+def test_binary_nodes_do_not_carry_counters():
+    assert Binary.__slots__ == ('left', 'operator', 'right', 'line', 'site')
+
+POLYMORPHIC = '''
+fun combine(a, b) { return a + b; }
+fun less(a, b) { return a < b; }
+var values = 0;
+for (var i = 0; i < 20; i = i + 1) {
+  if (i / 2 == (i - i / 2)) print combine("x", "y");
+  else print combine(i, 1);
+  print less(i, 10);
+}
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_polymorphic_program_matches_other_engines(run_lox, engine):
+    assert run_lox(POLYMORPHIC, engine=engine) == run_lox(POLYMORPHIC)
@@ -0,0 +1,94 @@
+import pytest
+
+from lox import Lox, ENGINES
+from scanner import Scanner
+from parser import Parser
+from resolver import Resolver
+
+def resolve(source):
+    lox = Lox()
+    statements = Parser(lox, Scanner(lox, source).scan_tokens()).parse()
+    Resolver(lox, lox.interpreter).resolve_statements(statements)
+
+    return statements, lox
+
+def test_locals_are_numbered_in_declaration_order():
+    [block], _ = resolve('{ var a = 1; var b = 2; var c = a + b; print c; }')
+    a, b, c, print_c = block.statements
+
+    assert [a.slot, b.slot, c.slot] == [0, 1, 2]
+    assert block.slot_count == 3
+    assert (c.initializer.left.depth, c.initializer.left.slot) == (0, 0)
+    assert (c.initializer.right.depth, c.initializer.right.slot) == (0, 1)
+    assert (print_c.expression.depth, print_c.expression.slot) == (0, 2)
+
+def test_enclosing_references_record_their_depth():
+    [function], _ = resolve('fun f(a, b) { var c = 1; { var d = b; { print a + d; } } }')
+    [inner] = function.body[1].statements[1].statements
+    add = inner.expression
+
+    assert function.slot_count == 3
+    assert (add.left.depth, add.left.slot) == (2, 0)
+    assert (add.right.depth, add.right.slot) == (1, 0)
+    assert function.body[1].statements[0].initializer.depth == 1
+
+def test_this_and_super_scopes_enclose_the_methods():
+    [_, klass], _ = resolve('class A { m() {} } class B < A { m() { return super.m() or this; } }')
+    value = klass.methods[0].body[0].value
+
+    assert value.right.depth == 1
+    assert value.left.callee.depth == 2
+
+@pytest.mark.parametrize('source, message', [
+    ('{ var a = 1; var a = 2; }', "[1] Error at 'a': variable with this name already declared in this scope\n"),
+    ('{ var a = a; }', "[1] Error at 'a': Cannot read local variable in its own initializer\n"),
+])
+def test_scope_errors_are_reported(capsys, source, message):
+    _, lox = resolve(source)
+
+    assert lox.had_error
+    assert capsys.readouterr().out == message
+
+SCOPING = '''
+var a = "global";
+{
+  fun show() { print a; }
+  show();
+  var a = "block";
+  show();
+  print a;
+}
+fun counter() {
+  var count = 0;
+  fun increment() { count = count + 1; return count; }
+  return increment;
+}
+var first = counter();
+var second = counter();
+first();
+print first();
+print second();
+{
+  var x = 1;
+  {
+    var x = x + 1;
+  }
+}
+fun outer(n) {
+  var local = n * 2;
+  fun inner(m) { return local + m + n; }
+  return inner(1);
+}
+print outer(5);
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_slot_resolution_keeps_lexical_scoping(run_lox, engine):
+    assert run_lox(SCOPING, engine=engine) == (
+        "[23] Error at 'x': Cannot read local variable in its own initializer\n")
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_closures_capture_their_own_slots(run_lox, engine):
+    source = SCOPING.replace('var x = x + 1;', 'var y = x + 1;')
+
+    assert run_lox(source, engine=engine) == 'global\nglobal\nblock\n2\n1\n16\n'
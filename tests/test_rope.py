@@ -0,0 +1,80 @@
+import pytest
+
+from lox import Lox, ENGINES
+from scanner import Scanner
+from token_type import TokenType
+from rope import Rope, ROPE_MIN, concatenate, is_string
+
+def test_short_concatenation_stays_a_string():
+    assert concatenate('ab', 'cd') == 'abcd'
+    assert type(concatenate('ab', 'cd')) is str
+
+def test_long_concatenation_builds_a_rope():
+    left = 'a' * ROPE_MIN
+    rope = concatenate(left, 'b')
+
+    assert type(rope) is Rope
+    assert len(rope) == ROPE_MIN + 1
+    assert str(rope) == left + 'b'
+    assert is_string(rope) and is_string('') and not is_string(1.0)
+
+def test_deep_rope_flattens_without_recursion():
+    text = 'x' * ROPE_MIN
+    for _ in range(100000):
+        text = concatenate(text, 'y')
+
+    assert str(text) == 'x' * ROPE_MIN + 'y' * 100000
+    assert text.flat is not None and text.left is None and text.right is None
+
+def test_ropes_compare_and_hash_like_strings():
+    text = 'z' * ROPE_MIN
+    first = concatenate(concatenate(text, 'a'), 'b')
+    second = concatenate(text, concatenate('a', 'b'))
+
+    assert first == second
+    assert first == text + 'ab'
+    assert first != text + 'ba'
+    assert first != 1.0
+    assert hash(first) == hash(text + 'ab')
+    assert {text + 'ab': 'found'}[first] == 'found'
+
+def test_scanner_interns_strings_and_identifiers():
+    tokens = Scanner(Lox(), 'var name = "text"; print name + "text";').scan_tokens()
+    strings = [token.literal for token in tokens if token.token_type == TokenType.STRING]
+    names = [token.lexeme for token in tokens if token.token_type == TokenType.IDENTIFIER]
+
+    assert strings[0] is strings[1]
+    assert names[0] is names[1]
+
+STRINGS = '''
+var s = "";
+for (var i = 0; i < 500; i = i + 1) s = s + "ab";
+var t = "";
+for (var i = 0; i < 250; i = i + 1) t = t + "abab";
+print s == t;
+print s == t + "x";
+print s != "ab";
+var short = "ab" + "cd";
+print short == "abcd";
+fun same(a, b) { return a == b; }
+print same(s, t);
+var long = s + s;
+print long == t + t;
+print "prefix " + "x" + "y";
+print s + 1;
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_string_programs_match_tree(run_lox, engine):
+    assert run_lox(STRINGS, engine=engine) == run_lox(STRINGS)
+
+def test_string_program_output(run_lox):
+    assert run_lox(STRINGS) == (
+        'True\nFalse\nTrue\nTrue\nTrue\nTrue\nprefix xy\n'
+        '[16] RunTimeError: Operands must be two numbers or two strings\n')
+
+@pytest.mark.parametrize('size', [1, 64])
+def test_ropes_as_memo_keys(run_lox, size):
+    source = STRINGS.replace('print s + 1;\n', 'fun matches(x) { return x == s; }\nprint matches(t);\nprint matches(t);\n')
+
+    assert run_lox(source, memoize=size) == run_lox(source)
@@ -0,0 +1,38 @@
+import pytest
+
+from lox import Lox
+from scanner import Scanner
+from fast_scanner import FastScanner
+from bench_scanner import SAMPLE, make_source, token_key
+
+SOURCES = [
+    SAMPLE,
+    make_source(16 * 1024),
+    '',
+    'print 1;',
+    '// trailing comment without newline',
+    'var s = "spans\nseveral\n\nlines";\nprint s;\n',
+    'print 1.5 + 12.25 - 3. / .5;',
+    'print 007 + 1.000;',
+    'a <= b >= c != d == e ! f = g;',
+    'var _under_score1 = nil and true or false;',
+    'var andy = orchid; var classy = fun_ny; var nil1 = this_;',
+    '\t\r\n  \n\nclass A < B { init() { super.init(); this.x = 1; } }\n',
+    'print "unterminated',
+    'var a = @;',
+    'var a = 1; # var b = 2;\n$',
+]
+
+def scan(scanner_class, source):
+    lox = Lox()
+    tokens = [token_key(token) for token in scanner_class(lox, source).scan_tokens()]
+
+    return tokens, lox.had_error
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_fast_scanner_matches_classic(capsys, source):
+    expected = scan(Scanner, source)
+    expected_output = capsys.readouterr().out
+
+    assert scan(FastScanner, source) == expected
+    assert capsys.readouterr().out == expected_output
@@ -0,0 +1,75 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from shape import EMPTY_SHAPE
+from lox_class import LoxClass
+from lox_instance import LoxInstance
+
+def test_transitions_are_shared():
+    xy = EMPTY_SHAPE.add('x').add('y')
+
+    assert EMPTY_SHAPE.add('x').add('y') is xy
+    assert xy.indices == {'x': 0, 'y': 1}
+    assert EMPTY_SHAPE.add('y').add('x') is not xy
+    assert EMPTY_SHAPE.indices == {}
+
+def test_instances_store_values_by_shape_index():
+    klass = LoxClass('Point', None, {})
+    first = LoxInstance(klass)
+    second = LoxInstance(klass)
+    for instance, (x, y) in ((first, (1.0, 2.0)), (second, (3.0, 4.0))):
+        instance.set_field('x', x)
+        instance.set_field('y', y)
+    shape = first.shape
+    first.set_field('x', 5.0)
+
+    assert second.shape is shape
+    assert first.shape is shape
+    assert first.values == [5.0, 2.0]
+    assert second.get('y', 1) == 4.0
+
+def test_instances_built_alike_share_a_shape():
+    lox = Lox()
+    source = '''
+class Point { init(x, y) { this.x = x; this.y = y; } }
+var a = Point(1, 2);
+var b = Point(3, 4);
+var c = Point(5, 6);
+c.z = 7;
+'''
+    with contextlib.redirect_stdout(io.StringIO()):
+        lox.run(source)
+    a, b, c = (lox.interpreter.globals.get(lox.interpreter.globals.index(name), 0) for name in 'abc')
+
+    assert a.shape is b.shape
+    assert c.shape is a.shape.transitions['z']
+    assert c.values == [5.0, 6.0, 7.0]
+
+FIELDS = '''
+class Bag {}
+fun fill(bag, first) {
+  if (first) { bag.a = 1; bag.b = 2; } else { bag.b = 20; bag.a = 10; }
+  return bag;
+}
+fun total(bag) { return bag.a + bag.b; }
+for (var i = 0; i < 10; i = i + 1) {
+  var bag = fill(Bag(), i / 3 < 2);
+  bag.a = bag.a + i;
+  if (i == 7) bag.extra = "x";
+  print total(bag);
+}
+var bag = Bag();
+bag.a = 1;
+print bag.a;
+print bag.b;
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_fields_match_tree(run_lox, engine):
+    assert run_lox(FIELDS, engine=engine) == run_lox(FIELDS)
+
+def test_fields_added_in_any_order(run_lox):
+    assert run_lox(FIELDS) == '3\n4\n5\n6\n7\n8\n36\n37\n38\n39\n1\n[17] RunTimeError: Undefined property \'b\'\n'
@@ -0,0 +1,97 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import Lox, ENGINES
+from scanner import Scanner
+from stream_scanner import StreamScanner
+from bench_scanner import SAMPLE, make_source, token_key
+
+SOURCES = [
+    SAMPLE,
+    make_source(16 * 1024),
+    '',
+    'print 1;',
+    '// trailing comment without newline',
+    'var s = "spans\nseveral\n\nlines";\nprint s;\n',
+    'var a = 1;\n\n\n\nprint a;',
+    'print "unterminated',
+    'var a = @;',
+]
+
+PROGRAM = '''
+fun f() { return g(); }
+fun g() { return "late"; }
+print f();
+class A { init(x) { this.x = x; } get() { return this.x; } }
+var total = 0;
+for (var i = 0; i < 10; i = i + 1) total = total + A(i).get();
+print total;
+{ var b = total + 1; print b; }
+'''
+
+def scan(source):
+    lox = Lox()
+    tokens = [token_key(token) for token in Scanner(lox, source).scan_tokens()]
+
+    return tokens, lox.had_error
+
+def scan_stream(source, chunk_size):
+    lox = Lox()
+    scanner = StreamScanner(lox, io.StringIO(source), chunk_size=chunk_size)
+    tokens = [token_key(token) for token in scanner.scan_tokens()]
+
+    return tokens, lox.had_error
+
+def run_stream(source, **options):
+    lox = Lox(**options)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lox.run_stream(io.StringIO(source))
+
+    return output.getvalue(), lox.had_error, lox.had_runtime_error
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, StreamScanner.CHUNK_SIZE])
+def test_stream_scanner_matches_classic(capsys, chunk_size, source):
+    expected = scan(source)
+    expected_output = capsys.readouterr().out
+
+    assert scan_stream(source, chunk_size) == expected
+    assert capsys.readouterr().out == expected_output
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_stream_run_matches_whole_program_run(run_lox, engine):
+    assert run_stream(PROGRAM, engine=engine) == (run_lox(PROGRAM, engine=engine), False, False)
+
+def test_statements_run_before_a_later_syntax_error():
+    output, had_error, _ = run_stream('print 1;\nprint 2 +;\nprint 3;\n')
+
+    assert output == "1\n[2] Error at ';': Expect expression\n"
+    assert had_error
+
+def test_runtime_error_stops_the_stream():
+    output, _, had_runtime_error = run_stream('print 1;\nprint nope;\nprint 3;\n')
+
+    assert output == "1\n[2] RunTimeError: Undefined variable 'nope'\n"
+    assert had_runtime_error
+
+def test_statements_are_executed_as_they_are_read():
+    class Source(io.StringIO):
+        def __init__(self, text, lox):
+            super().__init__(text)
+            self.lox = lox
+            self.printed = []
+
+        def read(self, size=-1):
+            self.printed.append(self.lox.interpreter.out.getvalue())
+            return super().read(size)
+
+    lox = Lox()
+    lox.interpreter.out = io.StringIO()
+    source = Source('print "first";\n' + '// padding\n' * 8000 + 'print "second";\n', lox)
+    lox.run_stream(source)
+
+    assert 'first\n' in source.printed
+    assert lox.interpreter.out.getvalue() == 'first\nsecond\n'
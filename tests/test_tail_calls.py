@@ -0,0 +1,87 @@
+import pytest
+
+from lox import ENGINES
+from lox_function import Return, TailCall
+
+DEEP = 100000
+
+def test_tail_recursion_runs_in_constant_stack(run_lox):
+    source = f'fun count(n, acc) {{ if (n == 0) return acc; return count(n - 1, acc + 1); }}\nprint count({DEEP}, 0);'
+
+    assert run_lox(source) == f'{DEEP}\n'
+
+def test_mutual_tail_recursion_runs_in_constant_stack(run_lox):
+    source = f'''
+fun even(n) {{ if (n == 0) return true; return odd(n - 1); }}
+fun odd(n) {{ if (n == 0) return false; return even(n - 1); }}
+print even({DEEP});
+print odd({DEEP + 1});
+'''
+
+    assert run_lox(source) == 'True\nTrue\n'
+
+def test_tail_method_calls_run_in_constant_stack(run_lox):
+    source = f'''
+class Walker {{
+  init() {{ this.steps = 0; }}
+  walk(n) {{ if (n == 0) return this.steps; this.steps = this.steps + 1; return this.walk(n - 1); }}
+}}
+print Walker().walk({DEEP});
+'''
+
+    assert run_lox(source) == f'{DEEP}\n'
+
+def test_tail_call_through_a_closure(run_lox):
+    source = f'''
+fun make() {{
+  fun loop(n) {{ if (n == 0) return "done"; return loop(n - 1); }}
+  return loop;
+}}
+print make()({DEEP});
+'''
+
+    assert run_lox(source) == 'done\n'
+
+def test_signals_are_not_exceptions():
+    assert not issubclass(Return, BaseException)
+    assert not issubclass(TailCall, BaseException)
+
+RETURNS = '''
+fun find(limit) {
+  for (var i = 0; i < 10; i = i + 1) {
+    while (true) {
+      if (i == limit) { return i * 10; }
+      break_out();
+    }
+  }
+  return -1;
+}
+fun break_out() { return nil; }
+fun nested(n) {
+  { { if (n > 0) return "positive"; } }
+  return "other";
+}
+fun nothing() { return; }
+class Box {
+  init(value) { this.value = value; return; }
+  twice() { return this.value * 2; }
+}
+fun tail_native() { return clock() > 0; }
+fun arity(a) { return a; }
+fun tail_arity() { return arity(1, 2); }
+print nested(1);
+print nested(0);
+print nothing();
+print Box(21).twice();
+print Box(1).init(5).value;
+print tail_native();
+print tail_arity();
+'''
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_returns_match_other_engines(run_lox, engine):
+    assert run_lox(RETURNS, engine=engine) == run_lox(RETURNS)
+
+def test_returns_unwind_blocks(run_lox):
+    assert run_lox(RETURNS) == (
+        'positive\nother\nnil\n42\n5\nTrue\n[23] RunTimeError: Expected 1 arguments but got 2\n')
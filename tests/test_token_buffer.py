@@ -0,0 +1,61 @@
+import pytest
+
+from lox import Lox
+from scanner import Scanner
+from fast_scanner import CompactScanner
+from parser import Parser
+from token_buffer import TokenBuffer
+from bench_scanner import SAMPLE, make_source, token_key
+from bench_parser import same_tree
+
+SOURCES = [
+    SAMPLE,
+    make_source(16 * 1024),
+    '',
+    'var s = "spans\nseveral\n\nlines";\nprint s;\n',
+    'print 1.5 + 12.25 - 3 / 0.5 * -4;',
+    'class A < B { init() { super.init(); this.x = 1; } }',
+]
+
+def classic_tokens(source):
+    return Scanner(Lox(), source).scan_tokens()
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_buffer_yields_the_classic_tokens(source):
+    buffer = CompactScanner(Lox(), source).scan_tokens()
+    expected = [token_key(token) for token in classic_tokens(source)]
+
+    assert isinstance(buffer, TokenBuffer)
+    assert len(buffer) == len(expected)
+    assert [token_key(token) for token in buffer] == expected
+    assert [token_key(buffer[index]) for index in range(len(buffer))] == expected
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_buffer_columns_agree_with_tokens(source):
+    buffer = CompactScanner(Lox(), source).scan_tokens()
+
+    for index, token in enumerate(classic_tokens(source)):
+        assert buffer.token_type_at(index) == token.token_type
+        assert buffer.lexeme_at(index) == token.lexeme
+        assert buffer.line_at(index) == token.line
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_parser_reads_the_buffer_directly(source):
+    lox = Lox()
+    statements = Parser(lox, CompactScanner(lox, source).scan_tokens()).parse()
+    expected = Parser(lox, classic_tokens(source)).parse()
+
+    assert not lox.had_error
+    assert same_tree(statements, expected)
+
+def test_identifiers_and_strings_are_interned():
+    buffer = CompactScanner(Lox(), 'var name = "text"; print name + "text";').scan_tokens()
+    tokens = list(buffer)
+
+    assert tokens[1].lexeme is tokens[6].lexeme
+    assert tokens[3].literal is tokens[8].literal
+
+def test_buffer_is_smaller_than_token_objects():
+    buffer = CompactScanner(Lox(), make_source(64 * 1024)).scan_tokens()
+
+    assert buffer.nbytes() <= 13 * len(buffer)
@@ -0,0 +1,72 @@
+from array import array
+from sys import intern
+
+from token_type import TokenType
+from lox_token import Token
+
+TOKEN_TYPES = tuple(TokenType)
+
+class TokenBuffer():
+    def __init__(self, source: str):
+        self.source = source
+
+        self.types = array('B')
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.lines = array('I')
+
+    def append(self, token_type:TokenType, start:int, length:int, line:int):
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.lines.append(line)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        token_type = TOKEN_TYPES[self.types[index]]
+        lexeme = self.lexeme_at(index)
+        if token_type is TokenType.IDENTIFIER:
+            lexeme = intern(lexeme)
+
+        return Token(token_type, lexeme, self.literal(token_type, lexeme), self.lines[index])
+
+    def __iter__(self):
+        source = self.source
+        literal = self.literal
+
+        for type_value, start, length, line in zip(self.types, self.starts, self.lengths, self.lines):
+            token_type = TOKEN_TYPES[type_value]
+            lexeme = source[start:start + length]
+            if token_type is TokenType.IDENTIFIER:
+                lexeme = intern(lexeme)
+            yield Token(token_type, lexeme, literal(token_type, lexeme), line)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def token_type_at(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def lexeme_at(self, index):
+        start = self.starts[index]
+
+        return self.source[start:start + self.lengths[index]]
+
+    def line_at(self, index):
+        return self.lines[index]
+
+    def literal(self, token_type, lexeme):
+        if token_type is TokenType.NUMBER:
+            return float(lexeme)
+
+        if token_type is TokenType.STRING:
+            return intern(lexeme[1:-1])
+
+        return None
+
+    def nbytes(self):
+        columns = [self.types, self.starts, self.lengths, self.lines]
+
+        return sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,22 @@
+class TokenStream():
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+
+        self.window = []
+        self.offset = 0
+
+    def __getitem__(self, index):
+        position = index - self.offset
+
+        if position > 1:
+            del self.window[:position - 1]
+            self.offset += position - 1
+            position = 1
+
+        while position >= len(self.window):
+            self.window.append(next(self.tokens))
+
+        return self.window[position]
+
+    def token_type_at(self, index):
+        return self[index].token_type
@@ -0,0 +1,702 @@
+import re
+
+from expression import Assign, Binary, Grouping, Literal, This, Unary
+from expression import Set as SetExpression
+from expression_visitor import ExpressionVisitor
+from statement_visitor import StatementVisitor
+from token_type import TokenType
+from function_type import FunctionType
+
+NUMBER_OPERATORS = {
+    TokenType.MINUS: '-',
+    TokenType.STAR: '*',
+    TokenType.SLASH: '/',
+    TokenType.LESS: '<',
+    TokenType.LESS_EQUAL: '<=',
+    TokenType.GREATER: '>',
+    TokenType.GREATER_EQUAL: '>=',
+}
+
+BOOLEAN_OPERATORS = {
+    TokenType.LESS,
+    TokenType.LESS_EQUAL,
+    TokenType.GREATER,
+    TokenType.GREATER_EQUAL,
+    TokenType.EQUAL_EQUAL,
+    TokenType.BANG_EQUAL,
+}
+
+MARK = re.compile('(\x01\\d+\x02|\x03)')
+
+INDENT = '    '
+
+HOIST_HEIGHT = 16
+
+class Scope():
+    __slots__ = ('context', 'names', 'boxed')
+
+    def __init__(self, context, names, boxed):
+        self.context = context
+        self.names = names
+        self.boxed = boxed
+
+
+class FunctionContext():
+    def __init__(self, enclosing, function_type):
+        self.enclosing = enclosing
+        self.function_type = function_type
+
+        self.lines = []
+        self.globals = set()
+        self.nonlocals = set()
+        self.boxes = set()
+
+
+class CaptureFinder(ExpressionVisitor, StatementVisitor):
+    def __init__(self):
+        self.scopes = []
+        self.function = None
+
+        self.captured = set()
+
+    def find(self, statements):
+        for statement in statements:
+            statement.accept(self)
+
+        return self.captured
+
+    def declare(self, node):
+        if self.scopes:
+            self.scopes[-1][2].append(node)
+
+    def reference(self, depth, slot):
+        if depth is None:
+            return
+
+        function, is_block, declarations = self.scopes[-1 - depth]
+        if is_block and function is not self.function:
+            self.captured.add(declarations[slot])
+
+    def in_block(self):
+        return bool(self.scopes) and self.scopes[-1][1]
+
+    def function_body(self, stmt, is_method):
+        enclosing = self.function
+        self.function = stmt
+
+        if is_method:
+            self.scopes.append([stmt, False, ['this']])
+        self.scopes.append([stmt, False, list(stmt.parameters)])
+
+        for statement in stmt.body:
+            statement.accept(self)
+
+        self.scopes.pop()
+        if is_method:
+            self.scopes.pop()
+
+        self.function = enclosing
+
+    def visit_binary(self, expr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_grouping(self, expr):
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr):
+        pass
+
+    def visit_unary(self, expr):
+        expr.right.accept(self)
+
+    def visit_variable(self, expr):
+        self.reference(expr.depth, expr.slot)
+
+    def visit_assign(self, expr):
+        expr.value.accept(self)
+        self.reference(expr.depth, expr.slot)
+
+    def visit_logical(self, expr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_call(self, expr):
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    def visit_get(self, expr):
+        expr.obj.accept(self)
+
+    def visit_set(self, expr):
+        expr.obj.accept(self)
+        expr.value.accept(self)
+
+    def visit_this(self, expr):
+        self.reference(expr.depth, 0)
+
+    def visit_super(self, expr):
+        self.reference(expr.depth, 0)
+        self.reference(expr.depth - 1, 0)
+
+    def visit_expression_statement(self, stmt):
+        stmt.expression.accept(self)
+
+    def visit_print_statement(self, stmt):
+        stmt.expression.accept(self)
+
+    def visit_var_statement(self, stmt):
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+
+        self.declare(stmt)
+
+    def visit_block_statement(self, stmt):
+        self.scopes.append([self.function, True, []])
+
+        for statement in stmt.statements:
+            statement.accept(self)
+
+        self.scopes.pop()
+
+    def visit_if_statement(self, stmt):
+        stmt.condition.accept(self)
+        stmt.then_branch.accept(self)
+
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_statement(self, stmt):
+        stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    def visit_function_statement(self, stmt):
+        self.declare(stmt)
+        self.function_body(stmt, False)
+
+    def visit_class_statement(self, stmt):
+        self.declare(stmt)
+
+        if stmt.superclass is not None:
+            stmt.superclass.accept(self)
+            self.scopes.append([self.function, self.in_block(), [stmt.superclass]])
+
+        for method in stmt.methods:
+            self.function_body(method, True)
+
+        if stmt.superclass is not None:
+            self.scopes.pop()
+
+
+class Transpiler(ExpressionVisitor, StatementVisitor):
+    def __init__(self, defined):
+        self.defined = set(defined)
+
+        self.scopes = []
+        self.context = None
+        self.indent = 0
+        self.counter = 0
+        self.marks = []
+        self.boxed = set()
+        self.heights = []
+        self.assigned = []
+
+    def transpile(self, statements):
+        self.boxed = CaptureFinder().find(statements)
+        self.context = FunctionContext(None, FunctionType.NONE)
+        self.indent = 1
+
+        for statement in statements:
+            statement.accept(self)
+
+        lines = ['def _script():'] + self.declarations(self.context, 1) + self.context.lines
+        if len(lines) == 1:
+            lines.append(INDENT + 'pass')
+
+        return self.finish(lines)
+
+    def finish(self, lines):
+        source = []
+        spans = {}
+
+        for lineno, line in enumerate(lines, 1):
+            if '\x01' not in line:
+                source.append(line)
+                continue
+
+            text = []
+            column = 0
+            starts = []
+            line_spans = []
+            for piece in MARK.split(line):
+                if piece.startswith('\x01'):
+                    starts.append((int(piece[1:-1]), column))
+                elif piece == '\x03':
+                    index, start = starts.pop()
+                    line_spans.append((start, column) + self.marks[index])
+                else:
+                    text.append(piece)
+                    column += len(piece.encode('utf-8'))
+
+            source.append(''.join(text))
+            spans[lineno] = line_spans
+
+        return '\n'.join(source) + '\n', spans
+
+    def declarations(self, context, indent):
+        lines = []
+        if context.globals:
+            lines.append(INDENT * indent + 'global ' + ', '.join(sorted(context.globals)))
+        if context.nonlocals:
+            lines.append(INDENT * indent + 'nonlocal ' + ', '.join(sorted(context.nonlocals)))
+
+        return lines
+
+    def emit(self, text):
+        self.context.lines.append(INDENT * self.indent + text)
+
+    def mark(self, kind, line, payload, text):
+        self.marks.append((kind, line, payload))
+
+        return f'\x01{len(self.marks) - 1}\x02{text}\x03'
+
+    def temporary(self, prefix='_t'):
+        self.counter += 1
+
+        return f'{prefix}{self.counter}'
+
+    def expression(self, expr):
+        heights = self.heights
+        start = len(self.assigned)
+
+        heights.append(0)
+        text = expr.accept(self)
+        height = heights.pop() + 1
+
+        if height >= HOIST_HEIGHT:
+            text = self.hoist(text, self.assigned[start:])
+            del self.assigned[start:]
+            height = 1
+
+        if heights:
+            heights[-1] = max(heights[-1], height)
+
+        return text
+
+    def hoist(self, text, assigned):
+        name = self.temporary('_e')
+        global_names = sorted({name for name in assigned if name.startswith('g_')})
+        nonlocal_names = sorted({name for name in assigned if not name.startswith('g_')})
+
+        self.emit(f'def {name}():')
+        if global_names:
+            self.emit(INDENT + 'global ' + ', '.join(global_names))
+        if nonlocal_names:
+            self.emit(INDENT + 'nonlocal ' + ', '.join(nonlocal_names))
+        self.emit(INDENT + f'return {text}')
+
+        return f'{name}()'
+
+    def body(self, stmt):
+        self.indent += 1
+        count = len(self.context.lines)
+
+        stmt.accept(self)
+
+        if len(self.context.lines) == count:
+            self.emit('pass')
+        self.indent -= 1
+
+    def declare(self, stmt):
+        if not self.scopes:
+            name = f'g_{stmt.name}'
+            self.context.globals.add(name)
+            return name, False
+
+        boxed = stmt in self.boxed
+        name = self.temporary(f'v_{stmt.name}_')
+
+        scope = self.scopes[-1]
+        scope.names.append(name)
+        scope.boxed.append(boxed)
+
+        return name, boxed
+
+    def local(self, depth, slot):
+        scope = self.scopes[-1 - depth]
+        name = scope.names[slot]
+
+        if scope.context is not self.context:
+            if scope.boxed[slot]:
+                self.context.boxes.add((name, scope.context))
+            else:
+                return name, False, True
+
+        return name, scope.boxed[slot], False
+
+    def is_boolean(self, expr):
+        if isinstance(expr, Grouping):
+            return self.is_boolean(expr.expression)
+
+        if isinstance(expr, Binary):
+            return expr.operator in BOOLEAN_OPERATORS
+
+        if isinstance(expr, Unary):
+            return expr.operator == TokenType.BANG
+
+        return isinstance(expr, Literal) and isinstance(expr.value, bool)
+
+    def condition(self, expr):
+        if self.is_boolean(expr):
+            return self.expression(expr)
+
+        value = self.temporary()
+
+        return f'({value} := {self.expression(expr)}) is not None and {value} is not False'
+
+    def checked(self, expr, kind):
+        if isinstance(expr, Literal) and type(expr.value) is kind:
+            return repr(expr.value), None
+
+        value = self.temporary()
+
+        return value, f'type({value} := {self.expression(expr)})'
+
+    def visit_binary(self, expr):
+        operator_type = expr.operator
+        line = expr.line
+
+        if operator_type == TokenType.EQUAL_EQUAL:
+            return f'({self.expression(expr.left)} == {self.expression(expr.right)})'
+
+        if operator_type == TokenType.BANG_EQUAL:
+            return f'({self.expression(expr.left)} != {self.expression(expr.right)})'
+
+        if operator_type == TokenType.PLUS:
+            message = repr("Operands must be two numbers or two strings")
+            for kind in (float, str):
+                if isinstance(expr.left, Literal) and type(expr.left.value) is kind:
+                    left = repr(expr.left.value)
+                    right, check = self.checked(expr.right, kind)
+                elif isinstance(expr.right, Literal) and type(expr.right.value) is kind:
+                    left, check = self.checked(expr.left, kind)
+                    right = repr(expr.right.value)
+                else:
+                    continue
+
+                if check is None:
+                    return f'({left} + {right})'
+
+                return f'({left} + {right} if {check} is {kind.__name__} else _error({line}, {message}))'
+
+            left = self.temporary()
+            right = self.temporary()
+            kind = self.temporary()
+            check = (f'({kind} := type({left} := {self.expression(expr.left)})) is type({right} := {self.expression(expr.right)}) '
+                     f'and ({kind} is float or {kind} is str)')
+            return f'({left} + {right} if {check} else _error({line}, {message}))'
+
+        operator = NUMBER_OPERATORS[operator_type]
+        message = repr("Operands must be numbers")
+
+        left, left_check = self.checked(expr.left, float)
+        right, right_check = self.checked(expr.right, float)
+
+        if left_check is None and right_check is None:
+            return f'({left} {operator} {right})'
+
+        if left_check is None:
+            check = f'{right_check} is float'
+        elif right_check is None:
+            check = f'{left_check} is float'
+        else:
+            check = f'{left_check} is {right_check} is float'
+
+        return f'({left} {operator} {right} if {check} else _error({line}, {message}))'
+
+    def visit_grouping(self, expr):
+        return f'({self.expression(expr.expression)})'
+
+    def visit_literal(self, expr):
+        return repr(expr.value)
+
+    def visit_unary(self, expr):
+        if expr.operator == TokenType.BANG:
+            if self.is_boolean(expr.right):
+                return f'(not {self.expression(expr.right)})'
+
+            value = self.temporary()
+            return f'(({value} := {self.expression(expr.right)}) is None or {value} is False)'
+
+        value, check = self.checked(expr.right, float)
+        if check is None:
+            return f'(-{value})'
+
+        return f'(-{value} if {check} is float else _error({expr.line}, {repr("Operand must be a number")}))'
+
+    def visit_variable(self, expr):
+        if expr.depth is None:
+            return self.mark('variable', expr.line, expr.name, f'g_{expr.name}')
+
+        name, boxed, _ = self.local(expr.depth, expr.slot)
+        if boxed:
+            return f'{name}[0]'
+
+        return name
+
+    def assignment(self, expr, statement):
+        value = self.expression(expr.value)
+
+        if expr.depth is None:
+            name = f'g_{expr.name}'
+            if name not in self.defined:
+                return f'_set_global(_G, {repr(name)}, {value}, {expr.line})'
+
+            self.context.globals.add(name)
+        else:
+            name, boxed, free = self.local(expr.depth, expr.slot)
+            if boxed:
+                if statement:
+                    return f'{name}[0] = {value}'
+                return f'_store({name}, {value})'
+
+            if free:
+                self.context.nonlocals.add(name)
+
+        if statement:
+            return f'{name} = {value}'
+
+        self.assigned.append(name)
+        return f'({name} := {value})'
+
+    def visit_assign(self, expr):
+        return self.assignment(expr, False)
+
+    def visit_logical(self, expr):
+        value = self.temporary()
+        left = self.expression(expr.left)
+        right = self.expression(expr.right)
+
+        if expr.operator == TokenType.OR:
+            return f'({value} if ({value} := {left}) is not None and {value} is not False else {right})'
+
+        return f'({value} if ({value} := {left}) is None or {value} is False else {right})'
+
+    def visit_call(self, expr):
+        function = self.temporary()
+        count = len(expr.arguments)
+        evaluated = [f'{function} := {self.expression(expr.callee)}']
+        arguments = []
+        for argument in expr.arguments:
+            value = self.temporary()
+            evaluated.append(f'{value} := {self.expression(argument)}')
+            arguments.append(value)
+
+        check = f"getattr({function}, 'lox_arity', None) == {count}"
+        if arguments:
+            check = f"({', '.join(evaluated)}) and {check}"
+        else:
+            check = f"getattr({evaluated[0]}, 'lox_arity', None) == {count}"
+        call = f"{function}({', '.join(arguments)})"
+
+        return self.mark('call', expr.line, count,
+                         f'({call} if {check} else _call_error({function}, {count}, {expr.line}))')
+
+    def visit_get(self, expr):
+        obj = self.expression(expr.obj)
+
+        return self.mark('get', expr.line, expr.name, f'{obj}.l_{expr.name}')
+
+    def visit_set(self, expr):
+        obj = self.expression(expr.obj)
+        if not isinstance(expr.obj, This):
+            obj = f'_instance({obj}, {expr.line})'
+
+        return f'_set_field({obj}, {repr("l_" + expr.name)}, {self.expression(expr.value)})'
+
+    def visit_this(self, expr):
+        name, _, _ = self.local(expr.depth, 0)
+
+        return name
+
+    def visit_super(self, expr):
+        superclass, boxed, _ = self.local(expr.depth, 0)
+        if boxed:
+            superclass = f'{superclass}[0]'
+        this, _, _ = self.local(expr.depth - 1, 0)
+
+        return self.mark('super', expr.line, expr.method, f'{superclass}.l_{expr.method}.__get__({this})')
+
+    def visit_expression_statement(self, stmt):
+        expr = stmt.expression
+
+        if isinstance(expr, Assign):
+            self.emit(self.assignment(expr, True))
+        elif isinstance(expr, SetExpression):
+            obj = self.expression(expr.obj)
+            if not isinstance(expr.obj, This):
+                value = self.temporary()
+                self.emit(f'if not isinstance({value} := {obj}, LoxObject): _error({expr.line}, {repr("Only instances have fields")})')
+                obj = value
+
+            self.emit(f'{obj}.l_{expr.name} = {self.expression(expr.value)}')
+        else:
+            self.emit(self.expression(expr))
+
+    def visit_print_statement(self, stmt):
+        self.emit(f'print(_stringify({self.expression(stmt.expression)}), file=_I.out)')
+
+    def visit_var_statement(self, stmt):
+        value = 'None'
+        if stmt.initializer is not None:
+            value = self.expression(stmt.initializer)
+
+        name, boxed = self.declare(stmt)
+        if boxed:
+            self.emit(f'{name} = [{value}]')
+        else:
+            self.emit(f'{name} = {value}')
+
+        if not self.scopes:
+            self.defined.add(name)
+
+    def visit_block_statement(self, stmt):
+        self.scopes.append(Scope(self.context, [], []))
+
+        for statement in stmt.statements:
+            statement.accept(self)
+
+        self.scopes.pop()
+
+    def visit_if_statement(self, stmt):
+        self.emit(f'if {self.condition(stmt.condition)}:')
+        self.body(stmt.then_branch)
+
+        if stmt.else_branch is not None:
+            self.emit('else:')
+            self.body(stmt.else_branch)
+
+    def visit_while_statement(self, stmt):
+        self.emit(f'while {self.condition(stmt.condition)}:')
+        self.body(stmt.body)
+
+    def visit_return_statement(self, stmt):
+        if stmt.value is None or self.context.function_type == FunctionType.INITIALIZER:
+            self.emit('return')
+        else:
+            self.emit(f'return {self.expression(stmt.value)}')
+
+    def function(self, stmt, function_type, is_method):
+        enclosing = self.context
+        context = FunctionContext(enclosing, function_type)
+        self.context = context
+
+        parameters = [self.temporary(f'v_{parameter}_') for parameter in stmt.parameters]
+        if is_method:
+            self.scopes.append(Scope(context, ['self'], [False]))
+        self.scopes.append(Scope(context, list(parameters), [False] * len(parameters)))
+
+        indent = self.indent
+        self.indent += 1
+        for statement in stmt.body:
+            statement.accept(self)
+        self.indent = indent
+
+        self.scopes.pop()
+        if is_method:
+            self.scopes.pop()
+            parameters = ['self'] + parameters
+
+        self.context = enclosing
+
+        snapshot = sorted(name for name, owner in context.boxes if owner is enclosing)
+        enclosing.boxes.update((name, owner) for name, owner in context.boxes if owner is not enclosing)
+
+        arguments = list(parameters)
+        if snapshot:
+            arguments.append('*')
+            arguments.extend(f'{name}={name}' for name in snapshot)
+
+        name = self.temporary('_') + '_' + stmt.name
+        self.emit(f'def {name}({", ".join(arguments)}):')
+        enclosing.lines.extend(self.declarations(context, indent + 1))
+        enclosing.lines.extend(context.lines)
+        if not context.lines:
+            enclosing.lines.append(INDENT * (indent + 1) + 'pass')
+        self.emit(f'{name}.lox_arity = {len(stmt.parameters)}')
+
+        if function_type == FunctionType.INITIALIZER:
+            initializer = name
+            name = self.temporary('_') + '_' + stmt.name
+            self.emit(f'def {name}({", ".join(parameters)}):')
+            self.indent += 1
+            self.emit(f'{initializer}({", ".join(parameters)})')
+            self.emit('return self')
+            self.indent -= 1
+            self.emit(f'{name}.lox_arity = {len(stmt.parameters)}')
+
+            return initializer, name
+
+        return name
+
+    def define(self, stmt, name, boxed, value):
+        if boxed:
+            self.emit(f'{name}[0] = {value}')
+        elif name != value:
+            self.emit(f'{name} = {value}')
+
+        if not self.scopes:
+            self.defined.add(name)
+
+    def visit_function_statement(self, stmt):
+        name, boxed = self.declare(stmt)
+        if boxed:
+            self.emit(f'{name} = [None]')
+
+        function = self.function(stmt, FunctionType.FUNCTION, False)
+        self.define(stmt, name, boxed, function)
+
+    def visit_class_statement(self, stmt):
+        name, boxed = self.declare(stmt)
+        if boxed:
+            self.emit(f'{name} = [None]')
+
+        base = 'LoxObject'
+        if stmt.superclass is not None:
+            value = f'_superclass({self.expression(stmt.superclass)}, {stmt.superclass.line})'
+            base = self.temporary('v_super_')
+            super_boxed = stmt.superclass in self.boxed
+
+            if super_boxed:
+                self.emit(f'{base} = [{value}]')
+            else:
+                self.emit(f'{base} = {value}')
+            self.scopes.append(Scope(self.context, [base], [super_boxed]))
+
+            if super_boxed:
+                base = f'{base}[0]'
+
+        attributes = [f'lox_name = {repr(stmt.name)}']
+        for method in stmt.methods:
+            if method.name == 'init':
+                initializer, wrapper = self.function(method, FunctionType.INITIALIZER, True)
+                attributes.append(f'__init__ = {initializer}')
+                attributes.append(f'l_init = {wrapper}')
+            else:
+                function = self.function(method, FunctionType.METHOD, True)
+                attributes.append(f'l_{method.name} = {function}')
+
+        if stmt.superclass is not None:
+            self.scopes.pop()
+
+        klass = self.temporary('_') + '_' + stmt.name
+        self.emit(f'class {klass}({base}):')
+        for attribute in attributes:
+            self.emit(INDENT + attribute)
+
+        self.define(stmt, name, boxed, klass)
@@ -0,0 +1,383 @@
+from interpreter import Interpreter
+from bytecode_compiler import BytecodeCompiler
+from global_table import UNDEFINED
+from run_time_error import RunTimeError
+from lox_callable import LoxCallable
+from rope import is_string, concatenate
+from vm_objects import *
+from op_code import *
+
+FRAMES_MAX = 4096
+
+EMPTY = object()
+
+class VM(Interpreter):
+    def __init__(self, lox):
+        super().__init__(lox)
+
+        self.stack = []
+        self.frames = []
+        self.open_upvalues = {}
+
+    def link(self, statements):
+        return BytecodeCompiler(self.lox).compile(statements)
+
+    def execute_program(self, function):
+        if function is None:
+            return
+
+        try:
+            self.run(ObjClosure(function, []))
+        except RunTimeError as e:
+            self.reset()
+            self.lox.runtime_error(e)
+
+    def reset(self):
+        self.stack.clear()
+        self.frames.clear()
+        self.open_upvalues.clear()
+
+    def restore_globals(self, values):
+        self.reset()
+        super().restore_globals(values)
+
+    def capture_upvalue(self, index):
+        try:
+            return self.open_upvalues[index]
+        except KeyError:
+            pass
+
+        upvalue = Upvalue(self.stack, index)
+        self.open_upvalues[index] = upvalue
+
+        return upvalue
+
+    def close_upvalues(self, last):
+        open_upvalues = self.open_upvalues
+        for index in [index for index in open_upvalues if index >= last]:
+            open_upvalues.pop(index).close()
+
+    def prepare_call(self, callee, slot, argc):
+        stack = self.stack
+
+        if type(callee) is ObjBoundMethod:
+            stack[slot] = callee.receiver
+            callee = callee.method
+
+        if type(callee) is ObjClosure:
+            if argc != callee.function.arity:
+                raise RunTimeError(None, f"Expected {callee.function.arity} arguments but got {argc}")
+            return callee
+
+        if type(callee) is ObjClass:
+            stack[slot] = ObjInstance(callee)
+
+            initializer = callee.initializer
+            if initializer is not None:
+                return self.prepare_call(initializer, slot, argc)
+
+            if argc != 0:
+                raise RunTimeError(None, f"Expected 0 arguments but got {argc}")
+            return None
+
+        if isinstance(callee, LoxCallable):
+            if argc != callee.arity():
+                raise RunTimeError(None, f"Expected {callee.arity()} arguments but got {argc}")
+
+            result = callee.call(self, stack[slot + 1:])
+            del stack[slot + 1:]
+            stack[slot] = result
+            return None
+
+        raise RunTimeError(None, "can only call functions and methods")
+
+    def run(self, closure):
+        stack = self.stack
+        frames = self.frames
+        global_values = self.globals.values
+        global_names = self.globals.names
+        stringify = self.stringify
+        out = self.out
+
+        stack.append(closure)
+        base = len(stack) - 1
+        return_slot = base
+        code = closure.function.chunk.code
+        constants = closure.function.chunk.constants
+        upvalues = closure.upvalues
+        ip = 0
+
+        try:
+            while True:
+                op = code[ip]
+                ip += 1
+
+                if op == GET_LOCAL:
+                    stack.append(stack[base + code[ip]])
+                    ip += 1
+                elif op == CONSTANT:
+                    stack.append(constants[code[ip]])
+                    ip += 1
+                elif op == GET_GLOBAL:
+                    value = global_values[code[ip]]
+                    if value is UNDEFINED:
+                        raise RunTimeError(None, f"Undefined variable '{global_names[code[ip]]}'")
+                    stack.append(value)
+                    ip += 1
+                elif op == POP_JUMP_IF_FALSE:
+                    value = stack.pop()
+                    if value is None or value is False:
+                        ip += code[ip]
+                    ip += 1
+                elif op == ADD:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is float and type(b) is float:
+                        stack[-1] = a + b
+                    elif is_string(a) and is_string(b):
+                        stack[-1] = concatenate(a, b)
+                    else:
+                        raise RunTimeError(None, "Operands must be two numbers or two strings")
+                elif op == SUBTRACT:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a - b
+                elif op == LESS:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a < b
+                elif op == CALL or op == CALL_METHOD:
+                    argc = code[ip]
+                    ip += 1
+                    slot = len(stack) - argc - 1
+                    callee = stack[slot]
+
+                    if op == CALL:
+                        result_slot = slot
+                    else:
+                        result_slot = slot - 1
+                        if callee is EMPTY:
+                            callee = stack[result_slot]
+                            stack[slot] = callee
+                        else:
+                            callee = stack[result_slot]
+
+                    if type(callee) is not ObjClosure or callee.function.arity != argc:
+                        callee = self.prepare_call(callee, slot, argc)
+                        if callee is None:
+                            if result_slot != slot:
+                                stack[result_slot] = stack.pop()
+                            continue
+
+                    if len(frames) >= FRAMES_MAX:
+                        raise RunTimeError(None, "Stack overflow")
+
+                    frames.append((closure, ip, base, return_slot))
+                    closure = callee
+                    code = closure.function.chunk.code
+                    constants = closure.function.chunk.constants
+                    upvalues = closure.upvalues
+                    ip = 0
+                    base = slot
+                    return_slot = result_slot
+                elif op == RETURN:
+                    result = stack.pop()
+                    if self.open_upvalues:
+                        self.close_upvalues(base)
+
+                    del stack[return_slot:]
+                    if not frames:
+                        return result
+
+                    stack.append(result)
+                    closure, ip, base, return_slot = frames.pop()
+                    code = closure.function.chunk.code
+                    constants = closure.function.chunk.constants
+                    upvalues = closure.upvalues
+                elif op == SET_LOCAL:
+                    stack[base + code[ip]] = stack[-1]
+                    ip += 1
+                elif op == POP:
+                    stack.pop()
+                elif op == LOOP:
+                    ip -= code[ip]
+                elif op == JUMP:
+                    ip += code[ip] + 1
+                elif op == GET_UPVALUE:
+                    upvalue = upvalues[code[ip]]
+                    stack.append(upvalue.values[upvalue.index])
+                    ip += 1
+                elif op == SET_UPVALUE:
+                    upvalue = upvalues[code[ip]]
+                    upvalue.values[upvalue.index] = stack[-1]
+                    ip += 1
+                elif op == SET_GLOBAL:
+                    index = code[ip]
+                    if global_values[index] is UNDEFINED:
+                        raise RunTimeError(None, f"Undefined variable '{global_names[index]}'")
+                    global_values[index] = stack[-1]
+                    ip += 1
+                elif op == DEFINE_GLOBAL:
+                    global_values[code[ip]] = stack.pop()
+                    ip += 1
+                elif op == NIL:
+                    stack.append(None)
+                elif op == TRUE:
+                    stack.append(True)
+                elif op == FALSE:
+                    stack.append(False)
+                elif op == MULTIPLY:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a * b
+                elif op == DIVIDE:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a / b
+                elif op == LESS_EQUAL:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a <= b
+                elif op == GREATER:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a > b
+                elif op == GREATER_EQUAL:
+                    b = stack.pop()
+                    a = stack[-1]
+                    if type(a) is not float or type(b) is not float:
+                        raise RunTimeError(None, "Operands must be numbers")
+                    stack[-1] = a >= b
+                elif op == EQUAL:
+                    b = stack.pop()
+                    stack[-1] = stack[-1] == b
+                elif op == NOT_EQUAL:
+                    b = stack.pop()
+                    stack[-1] = not stack[-1] == b
+                elif op == NOT:
+                    value = stack[-1]
+                    stack[-1] = value is None or value is False
+                elif op == NEGATE:
+                    value = stack[-1]
+                    if type(value) is not float:
+                        raise RunTimeError(None, "Operand must be a number")
+                    stack[-1] = -value
+                elif op == JUMP_IF_FALSE:
+                    value = stack[-1]
+                    if value is None or value is False:
+                        ip += code[ip]
+                    ip += 1
+                elif op == JUMP_IF_TRUE:
+                    value = stack[-1]
+                    if value is not None and value is not False:
+                        ip += code[ip]
+                    ip += 1
+                elif op == GET_PROPERTY:
+                    instance = stack[-1]
+                    if type(instance) is not ObjInstance:
+                        raise RunTimeError(None, "Only instances have properties")
+
+                    name = constants[code[ip]]
+                    ip += 1
+                    try:
+                        stack[-1] = instance.fields[name]
+                    except KeyError:
+                        method = instance.klass.methods.get(name)
+                        if method is None:
+                            raise RunTimeError(None, f"Undefined property '{name}'")
+                        stack[-1] = ObjBoundMethod(instance, method)
+                elif op == GET_METHOD:
+                    instance = stack[-1]
+                    if type(instance) is not ObjInstance:
+                        raise RunTimeError(None, "Only instances have properties")
+
+                    name = constants[code[ip]]
+                    ip += 1
+                    try:
+                        stack[-1] = instance.fields[name]
+                        stack.append(EMPTY)
+                    except KeyError:
+                        method = instance.klass.methods.get(name)
+                        if method is None:
+                            raise RunTimeError(None, f"Undefined property '{name}'")
+                        stack[-1] = method
+                        stack.append(instance)
+                elif op == SET_PROPERTY:
+                    value = stack.pop()
+                    instance = stack[-1]
+                    if type(instance) is not ObjInstance:
+                        raise RunTimeError(None, "Only instances have fields")
+
+                    instance.fields[constants[code[ip]]] = value
+                    stack[-1] = value
+                    ip += 1
+                elif op == CHECK_INSTANCE:
+                    if type(stack[-1]) is not ObjInstance:
+                        raise RunTimeError(None, "Only instances have fields")
+                elif op == GET_SUPER:
+                    superclass = stack.pop()
+                    name = constants[code[ip]]
+                    ip += 1
+
+                    method = superclass.methods.get(name)
+                    if method is None:
+                        raise RunTimeError(None, f"Undefined property '{name}'")
+                    stack[-1] = ObjBoundMethod(stack[-1], method)
+                elif op == CLOSURE:
+                    function = constants[code[ip]]
+                    ip += 1
+
+                    captured = []
+                    for _ in range(function.upvalue_count):
+                        if code[ip]:
+                            captured.append(self.capture_upvalue(base + code[ip + 1]))
+                        else:
+                            captured.append(upvalues[code[ip + 1]])
+                        ip += 2
+
+                    stack.append(ObjClosure(function, captured))
+                elif op == CLOSE_UPVALUE:
+                    upvalue = self.open_upvalues.pop(len(stack) - 1, None)
+                    if upvalue is not None:
+                        upvalue.close()
+                    stack.pop()
+                elif op == CLASS:
+                    stack.append(ObjClass(constants[code[ip]]))
+                    ip += 1
+                elif op == INHERIT:
+                    superclass = stack[-2]
+                    if type(superclass) is not ObjClass:
+                        raise RunTimeError(None, "Superclass must be a class")
+
+                    klass = stack.pop()
+                    klass.methods.update(superclass.methods)
+                    klass.initializer = superclass.initializer
+                elif op == METHOD:
+                    method = stack.pop()
+                    klass = stack[-1]
+                    name = constants[code[ip]]
+                    ip += 1
+
+                    klass.methods[name] = method
+                    if name == 'init':
+                        klass.initializer = method
+                elif op == PRINT:
+                    print(stringify(stack.pop()), file=out)
+                else:
+                    raise Exception(f"Bad opcode {op}")
+        except RunTimeError as e:
+            if e.line is None:
+                e.line = closure.function.chunk.line_at(ip - 1)
+            raise
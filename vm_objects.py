@@ -0,0 +1,70 @@
+from bytecode_chunk import Chunk
+
+class ObjFunction():
+    __slots__ = ('name', 'arity', 'chunk', 'upvalue_count')
+
+    def __init__(self, name, arity):
+        self.name = name
+        self.arity = arity
+        self.chunk = Chunk()
+        self.upvalue_count = 0
+
+    def __str__(self):
+        return f"<fn {self.name}>"
+
+
+class ObjClosure():
+    __slots__ = ('function', 'upvalues')
+
+    def __init__(self, function, upvalues):
+        self.function = function
+        self.upvalues = upvalues
+
+    def __str__(self):
+        return f"<fn {self.function.name}>"
+
+
+class Upvalue():
+    __slots__ = ('values', 'index')
+
+    def __init__(self, values, index):
+        self.values = values
+        self.index = index
+
+    def close(self):
+        self.values = [self.values[self.index]]
+        self.index = 0
+
+
+class ObjClass():
+    __slots__ = ('name', 'methods', 'initializer')
+
+    def __init__(self, name):
+        self.name = name
+        self.methods = {}
+        self.initializer = None
+
+    def __str__(self):
+        return f"<Class {self.name}>"
+
+
+class ObjInstance():
+    __slots__ = ('klass', 'fields')
+
+    def __init__(self, klass):
+        self.klass = klass
+        self.fields = {}
+
+    def __str__(self):
+        return f"<{self.klass.name} instance>"
+
+
+class ObjBoundMethod():
+    __slots__ = ('receiver', 'method')
+
+    def __init__(self, receiver, method):
+        self.receiver = receiver
+        self.method = method
+
+    def __str__(self):
+        return f"<fn {self.method.function.name}>"